@@ -0,0 +1,224 @@
+
+# Esecuzione headless dei calcolatori su file di job (JSONL o CSV).
+# Ogni job è un record con "type" e i parametri del calcolo; i risultati sono
+# scritti come JSONL o CSV nello stesso ordine dei job in ingresso.
+# Il modulo non importa tkinter né matplotlib: può girare su server senza display.
+import csv
+import json
+import sys
+from collections import deque
+from itertools import islice
+from resistor_lib import e_series, package_power
+from capacitor_lib import capacitor_e_series
+from logic import (
+    design_voltage_divider_logic,
+    design_rc_filter_logic,
+    calculate_led_resistor_logic,
+    calculate_regulator_logic,
+    find_color_code_logic,
+    decode_smd_code_logic,
+    run_monte_carlo_logic,
+    MC_CHUNK_SIZE
+)
+
+# Job raggruppati per ogni invio al pool (i calcoli singoli durano pochi ms)
+BATCH_SIZE = 64
+# Gruppi in volo per worker: oltre, la lettura dell'input si ferma (memoria limitata)
+MAX_PENDING_PER_WORKER = 4
+
+def _series(params, key="series", default="E24", table=e_series):
+    name = params.get(key, default)
+    if name not in table:
+        raise ValueError(f"Serie sconosciuta: {name}")
+    return table[name]
+
+def _job_divider(p):
+    return design_voltage_divider_logic(float(p["vin"]), float(p["vout"]), _series(p),
+                                        custom_values=p.get("custom_values"), backend=p.get("backend", "search"))
+
+def _job_rc_filter(p):
+    return design_rc_filter_logic(float(p["fc"]), _series(p), _series(p, "c_series", "E12", capacitor_e_series),
+                                  custom_values=p.get("custom_values"))
+
+def _job_led(p):
+    return calculate_led_resistor_logic(float(p["vsupply"]), float(p["vf"]), float(p["if_ma"]), _series(p),
+                                        package_power, custom_values=p.get("custom_values"))
+
+def _job_regulator(p):
+    return calculate_regulator_logic(float(p.get("vin", 0)), float(p["vout"]), p.get("regulator", "LM317"), _series(p),
+                                     custom_values=p.get("custom_values"), top_n=int(p.get("top_n", 10)))
+
+def _job_color_code(p):
+    return find_color_code_logic(float(p["value"]), e_series, custom_values=p.get("custom_values"))
+
+def _job_smd(p):
+    return decode_smd_code_logic(str(p["code"]), p.get("code_type", "standard"))
+
+def _job_monte_carlo(p):
+    # Tolleranze in %, come nella GUI; oltre un blocco si usa la modalità streaming
+    iterations = int(p.get("iterations", 5000))
+    tol = float(p.get("tolerance", 5))
+    chunk_size = MC_CHUNK_SIZE if iterations > MC_CHUNK_SIZE else None
+    return run_monte_carlo_logic(float(p["vin"]), iterations, float(p["r1"]), float(p.get("tol1", tol)) / 100,
+                                 float(p["r2"]), float(p.get("tol2", tol)) / 100, seed=p.get("seed"), chunk_size=chunk_size)
+
+JOB_TYPES = {
+    "divider": _job_divider,
+    "rc_filter": _job_rc_filter,
+    "led": _job_led,
+    "regulator": _job_regulator,
+    "color_code": _job_color_code,
+    "smd": _job_smd,
+    "monte_carlo": _job_monte_carlo,
+}
+
+def run_job(job):
+    """Esegue un job e restituisce il record di uscita {id, type, result, error}."""
+    out = {"id": job.get("id"), "type": job.get("type"), "result": None, "error": None}
+    if "_invalid" in job:
+        out["error"] = job["_invalid"]
+        return out
+    handler = JOB_TYPES.get(job.get("type"))
+    if handler is None:
+        out["error"] = f"Tipo di job sconosciuto: {job.get('type')!r} (ammessi: {', '.join(JOB_TYPES)})"
+        return out
+    try:
+        result, error = handler(job)
+    except KeyError as e:
+        out["error"] = f"Parametro mancante: {e.args[0]}"
+    except (TypeError, ValueError) as e:
+        out["error"] = f"Parametro non valido: {e}"
+    else:
+        out["error"] = error
+        out["result"] = result.to_dict() if result is not None else None
+    return out
+
+def _run_chunk(jobs):
+    return [run_job(job) for job in jobs]
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+def run_batch(jobs, workers=None, batch_size=BATCH_SIZE):
+    """
+    Esegue i job (iterabile, letto in modo pigro) e genera i record di uscita nell'ordine
+    d'ingresso. Con workers > 1 i job vanno a un pool di processi a gruppi di `batch_size`,
+    con al massimo MAX_PENDING_PER_WORKER gruppi in volo per worker: finché il gruppo più
+    vecchio non è stato consumato non si legge altro input (contropressione).
+    """
+    if not workers or workers <= 1:
+        for job in jobs:
+            yield run_job(job)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in _chunks(jobs, batch_size):
+            pending.append(executor.submit(_run_chunk, chunk))
+            if len(pending) >= workers * MAX_PENDING_PER_WORKER:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+# Campi testuali: restano stringhe (es. il codice SMD "047" non deve diventare 47)
+CSV_TEXT_FIELDS = {"type", "code", "code_type", "series", "c_series", "regulator", "backend"}
+
+def _parse_csv_field(key, text):
+    # Liste di valori (es. custom_values) separate da ';', numeri dove possibile
+    text = text.strip()
+    if key in CSV_TEXT_FIELDS:
+        return text
+    if ";" in text:
+        return [float(v) for v in text.split(";") if v.strip()]
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+def read_jobs(stream, fmt="jsonl"):
+    """
+    Legge i job uno alla volta da uno stream di testo. Senza "id" il job prende il
+    numero di riga. Le righe non valide diventano job con errore, senza fermare il batch.
+    """
+    if fmt == "csv":
+        for line_no, row in enumerate(csv.DictReader(stream), start=2):
+            job = {key: _parse_csv_field(key, value) for key, value in row.items() if key and value and value.strip()}
+            job.setdefault("id", line_no)
+            yield job
+        return
+
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            job = json.loads(line)
+            if not isinstance(job, dict):
+                raise ValueError("il record deve essere un oggetto JSON")
+        except ValueError as e:
+            yield {"id": line_no, "_invalid": f"Riga {line_no} non valida: {e}"}
+            continue
+        job.setdefault("id", line_no)
+        yield job
+
+class _CsvWriter:
+    # Colonne fisse: il risultato (di forma diversa per ogni tipo) è una colonna JSON
+    def __init__(self, stream):
+        self.writer = csv.writer(stream)
+        self.writer.writerow(["id", "type", "error", "result"])
+
+    def write(self, record):
+        result = json.dumps(record["result"], ensure_ascii=False) if record["result"] is not None else ""
+        self.writer.writerow([record["id"], record["type"], record["error"] or "", result])
+
+class _JsonlWriter:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, record):
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+def _format_for(path, explicit=None):
+    if explicit:
+        return explicit
+    return "csv" if path and path.lower().endswith(".csv") else "jsonl"
+
+def run_batch_file(input_path, output_path=None, workers=None, input_format=None, output_format=None):
+    """
+    Esegue un file di job e scrive i risultati su `output_path` (stdout se None o "-").
+    Restituisce (job eseguiti, job con errore).
+    """
+    in_fmt = _format_for(input_path, input_format)
+    out_fmt = _format_for(output_path, output_format)
+    source = sys.stdin if input_path == "-" else open(input_path, newline="", encoding="utf-8")
+    target = sys.stdout if output_path in (None, "-") else open(output_path, "w", newline="", encoding="utf-8")
+    total = failed = 0
+    try:
+        writer = _CsvWriter(target) if out_fmt == "csv" else _JsonlWriter(target)
+        for record in run_batch(read_jobs(source, in_fmt), workers=workers):
+            writer.write(record)
+            total += 1
+            failed += record["error"] is not None
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    return total, failed
+
+def add_batch_arguments(parser):
+    parser.add_argument("input", help="File dei job (.jsonl o .csv, '-' per stdin)")
+    parser.add_argument("-o", "--output", help="File dei risultati (.jsonl o .csv, stdout se omesso)")
+    parser.add_argument("--workers", type=int, default=1, help="Processi paralleli (default 1)")
+    parser.add_argument("--input-format", choices=("jsonl", "csv"), help="Formato dell'input (default dall'estensione)")
+    parser.add_argument("--output-format", choices=("jsonl", "csv"), help="Formato dell'output (default dall'estensione)")
+
+def batch_main(args):
+    total, failed = run_batch_file(args.input, args.output, workers=args.workers,
+                                   input_format=args.input_format, output_format=args.output_format)
+    print(f"{total} job eseguiti, {failed} con errore.", file=sys.stderr)
+    return 1 if failed else 0
@@ -0,0 +1,228 @@
+
+# Benchmark di scalabilità dei percorsi critici di logic.py e della lettura delle BOM.
+# Ogni caso varia una dimensione (serie E3→E192, dimensione della BOM, iterazioni
+# Monte Carlo) e riporta latenza (p50/p90/p99) e throughput. I risultati si salvano
+# in JSON; con --compare si confrontano con un baseline salvato e si segnalano le
+# regressioni (codice di uscita 1).
+#   python benchmarks.py -o bench.json
+#   python benchmarks.py --quick --compare bench.json
+# Le funzioni memoizzate (@memoize) sono chiamate tramite .uncached: si misura il calcolo, non la cache.
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import numpy as np
+from resistor_lib import e_series
+from capacitor_lib import capacitor_e_series
+from logic import (
+    design_voltage_divider_logic,
+    design_rc_filter_logic,
+    find_best_color_match,
+    run_monte_carlo_logic,
+)
+from units import normalize_resistor_value, normalize_resistor_values
+
+SERIES = ("E3", "E6", "E12", "E24", "E48", "E96", "E192")
+BOM_SIZES = (10, 100, 1000, 10000, 100000)
+PARSE_SIZES = (10, 100, 1000, 10000, 50000)
+MC_ITERATIONS = (1000, 10000, 100000, 1000000, 10000000)
+# Griglie ridotte per --quick (CI, controlli rapidi)
+QUICK_SERIES = ("E3", "E24", "E192")
+QUICK_BOM_SIZES = (10, 1000, 10000)
+QUICK_PARSE_SIZES = (10, 1000)
+QUICK_MC_ITERATIONS = (1000, 100000)
+
+# Ogni caso gira almeno MIN_RUNS volte e finché non accumula MIN_TIME secondi (max MAX_RUNS)
+MIN_RUNS = 5
+MAX_RUNS = 200
+MIN_TIME = 0.5
+# Regressione: p50 oltre il baseline di questa frazione e di almeno NOISE_FLOOR_MS
+REGRESSION_THRESHOLD = 0.25
+NOISE_FLOOR_MS = 0.05
+
+def _bom_strings(n, rng):
+    """Valori come compaiono nelle BOM reali: '4,7K', '1k2', '10ohm', '1M', '220'."""
+    values = rng.choice(series_values_ohm("E24"), size=n)
+    styles = rng.integers(0, 4, size=n)
+    out = []
+    for value, style in zip(values.tolist(), styles.tolist()):
+        if value >= 1e6:
+            out.append(f"{value / 1e6:g}M")
+        elif value >= 1e3 and style == 0:
+            out.append(f"{value / 1e3:g}K".replace(".", ","))
+        elif value >= 1e3 and style == 1 and value / 1e3 != int(value / 1e3):
+            whole, frac = f"{value / 1e3:g}".split(".")
+            out.append(f"{whole}k{frac}")
+        elif style == 2:
+            out.append(f"{value:g}ohm")
+        else:
+            out.append(f"{value:g}")
+    return out
+
+def _bom_index(values):
+    """BomIndex di una BOM sintetica con un resistore per riga (R1, R2, ...)."""
+    from bom import ParsedBom
+    from bom_index import BomIndex
+    n = len(values)
+    parsed = ParsedBom(sheets=("BOM",), sheet=np.zeros(n, np.int16), row=np.arange(2, n + 2, dtype=np.int32),
+                       refdes=np.array([f"R{i + 1}" for i in range(n)]), text=np.array([f"{v:g}" for v in values]),
+                       values=np.asarray(values, dtype=np.float64), qty=np.ones(n), unparsed=np.empty(0, np.intp))
+    return BomIndex.build([("bench", parsed)])
+
+def series_values_ohm(name, decades=range(0, 7)):
+    base = np.asarray(e_series[name], dtype=np.float64)
+    return np.round(np.concatenate([base * 10.0 ** d for d in decades]), 6)
+
+def write_bom_xlsx(path, n, rng):
+    """BOM di prova con `n` righe (circa 70% resistori), intestazione dopo alcune righe di titolo."""
+    from openpyxl import Workbook
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("BOM")
+    sheet.append(["Bill of Materials"])
+    sheet.append(["Progetto", "benchmark"])
+    sheet.append([])
+    sheet.append(["ITEM", "QTY", "REFDES", "VALUE", "DESCRIPTION"])
+    values = _bom_strings(n, rng)
+    resistor = rng.random(n) < 0.7
+    for i in range(n):
+        refdes = f"R{i + 1}" if resistor[i] else f"C{i + 1}"
+        value = values[i] if resistor[i] else "100n"
+        sheet.append([i + 1, 1, refdes, value, "Resistore SMD 0603" if resistor[i] else "Condensatore"])
+    workbook.save(path)
+
+def time_case(fn, min_runs=MIN_RUNS, max_runs=MAX_RUNS, min_time=MIN_TIME):
+    """Tempi (s) delle singole chiamate di `fn`, dopo una chiamata di riscaldamento."""
+    fn()
+    timings = []
+    start = time.perf_counter()
+    while len(timings) < min_runs or (time.perf_counter() - start < min_time and len(timings) < max_runs):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return timings
+
+def summarize(timings, items=1):
+    """Percentili di latenza in ms e throughput (elementi al secondo)."""
+    ms = np.asarray(timings) * 1000
+    p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+    return {
+        "runs": len(timings), "items": items,
+        "p50_ms": round(float(p50), 4), "p90_ms": round(float(p90), 4), "p99_ms": round(float(p99), 4),
+        "mean_ms": round(float(ms.mean()), 4),
+        "throughput_per_s": round(items / (float(ms.mean()) / 1000), 1) if ms.mean() > 0 else None,
+    }
+
+def build_cases(workdir, quick=False, only=None):
+    """Elenco di (gruppo, id del caso, funzione, elementi elaborati per chiamata)."""
+    rng = np.random.default_rng(0)
+    series = QUICK_SERIES if quick else SERIES
+    bom_sizes = QUICK_BOM_SIZES if quick else BOM_SIZES
+    parse_sizes = QUICK_PARSE_SIZES if quick else PARSE_SIZES
+    mc_iterations = QUICK_MC_ITERATIONS if quick else MC_ITERATIONS
+    cases = []
+
+    def add(group, case_id, fn, items=1):
+        if only is None or group in only:
+            cases.append((group, case_id, fn, items))
+
+    divider = design_voltage_divider_logic.uncached
+    rc_filter = design_rc_filter_logic.uncached
+    color_match = find_best_color_match
+    for name in series:
+        values = e_series[name]
+        add("divider", f"divider/search/{name}", lambda v=values: divider(12, 3.3, v))
+        add("divider", f"divider/table/{name}", lambda v=values: divider(12, 3.3, v, backend="table"))
+        add("rc_filter", f"rc_filter/{name}", lambda v=values: rc_filter(1000, v, capacitor_e_series["E12"]))
+    for n in bom_sizes:
+        bom = rng.choice(series_values_ohm("E96"), size=n).tolist()
+        add("divider", f"divider/bom/{n}", lambda b=bom: divider(12, 3.3, custom_values=b), n)
+        add("rc_filter", f"rc_filter/bom/{n}", lambda b=bom: rc_filter(1000, c_series_values=capacitor_e_series["E12"], custom_values=b), n)
+        add("color_match", f"color_match/bom/{n}", lambda b=bom: color_match(4321, e_series, custom_values=b), n)
+        strings = _bom_strings(n, rng)
+        add("normalize", f"normalize/{n}", lambda s=strings: [normalize_resistor_value(v) for v in s], n)
+        add("normalize", f"normalize/column/{n}", lambda s=strings: normalize_resistor_values(s), n)
+        if only is None or "bom_index" in only:
+            index = _bom_index(bom)
+            # Le tre ricerche dell'indice: designatori di un valore, valori entro ±2%, valori per decade
+            add("bom_index", f"bom_index/query/{n}",
+                lambda i=index, v=bom[0]: (i.refdes_for(v), i.within(v, 2), i.decade_counts()))
+    targets = rng.uniform(1, 1e6, size=1000).tolist()
+    add("color_match", "color_match/series/1000", lambda: [color_match(t, e_series) for t in targets], len(targets))
+    for iterations in mc_iterations:
+        add("monte_carlo", f"monte_carlo/{iterations}",
+            lambda it=iterations: run_monte_carlo_logic(10, it, 1000, 0.05, 2200, 0.05, seed=1), iterations)
+
+    if only is None or "parse_bom" in only:
+        from bom import parse_bom_excel
+        for n in parse_sizes:
+            path = os.path.join(workdir, f"bom_{n}.xlsx")
+            write_bom_xlsx(path, n, rng)
+            add("parse_bom", f"parse_bom/{n}", lambda p=path: parse_bom_excel(p), n)
+    return cases
+
+def run_benchmarks(quick=False, only=None, log=None):
+    results = {}
+    # Le BOM di prova per parse_bom vivono in una cartella temporanea
+    with tempfile.TemporaryDirectory(prefix="rt_bench_") as workdir:
+        for group, case_id, fn, items in build_cases(workdir, quick, only):
+            # I casi lenti (BOM grandi, 10M iterazioni) si fermano a MIN_RUNS chiamate
+            results[case_id] = dict(summarize(time_case(fn), items), group=group)
+            if log:
+                r = results[case_id]
+                log(f"{case_id:32s} p50 {r['p50_ms']:10.3f} ms  p99 {r['p99_ms']:10.3f} ms  {r['throughput_per_s']:>14} /s")
+    return {
+        "meta": {"python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform(),
+                 "cpu_count": os.cpu_count(), "quick": quick, "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+
+def compare_results(current, baseline, threshold=REGRESSION_THRESHOLD, noise_floor_ms=NOISE_FLOOR_MS):
+    """
+    Confronta i p50 dei casi presenti in entrambi i report. Restituisce una lista di
+    (caso, p50 baseline, p50 attuale, rapporto, regressione?) ordinata per rapporto decrescente.
+    """
+    rows = []
+    for case_id, result in current["results"].items():
+        base = baseline["results"].get(case_id)
+        if base is None:
+            continue
+        old, new = base["p50_ms"], result["p50_ms"]
+        ratio = new / old if old > 0 else float("inf")
+        regression = ratio > 1 + threshold and new - old > noise_floor_ms
+        rows.append((case_id, old, new, ratio, regression))
+    return sorted(rows, key=lambda row: row[3], reverse=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark di scalabilità dei calcolatori.")
+    parser.add_argument("-o", "--output", help="File JSON dei risultati")
+    parser.add_argument("--quick", action="store_true", help="Griglie ridotte (controlli rapidi)")
+    parser.add_argument("--only", nargs="+", choices=("divider", "rc_filter", "color_match", "monte_carlo", "normalize", "bom_index", "parse_bom"),
+                        help="Esegue solo i gruppi indicati")
+    parser.add_argument("--compare", metavar="BASELINE", help="Report JSON di riferimento con cui confrontare")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help=f"Aumento relativo del p50 considerato regressione (default {REGRESSION_THRESHOLD})")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.quick, set(args.only) if args.only else None, log=print)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Risultati in {args.output}")
+
+    if not args.compare:
+        return 0
+    with open(args.compare, encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare_results(report, baseline, args.threshold)
+    regressions = [row for row in rows if row[4]]
+    print(f"\n{'caso':32s} {'baseline':>12s} {'attuale':>12s} {'rapporto':>9s}")
+    for case_id, old, new, ratio, regression in rows:
+        print(f"{case_id:32s} {old:10.3f}ms {new:10.3f}ms {ratio:8.2f}x{'  REGRESSIONE' if regression else ''}")
+    print(f"\n{len(regressions)} regressioni su {len(rows)} casi confrontati.")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+
+# Lettura delle BOM Excel in un solo passaggio.
+# Un file .xlsx è un archivio zip di XML: i fogli si leggono in streaming
+# (iterparse), riga per riga e senza modello a oggetti. L'intestazione con VALUE e
+# REFDES si cerca tra le prime righe di ogni foglio e le righe seguenti dello
+# stesso flusso sono già i dati: il file non viene riletto e non si costruisce un
+# DataFrame. In memoria restano solo la tabella delle stringhe condivise, la riga
+# corrente e i risultati. I vecchi file .xls (binari) passano da pandas, importato
+# solo in quel caso.
+import os
+import posixpath
+import zipfile
+from collections import namedtuple
+from dataclasses import dataclass
+from itertools import islice
+from xml.etree.ElementTree import iterparse
+from units import normalize_resistor_values
+
+# Righe esaminate all'inizio di ogni foglio per trovare l'intestazione
+BOM_HEADER_SCAN_ROWS = 20
+# Nomi di colonna riconosciuti (confronto su testo minuscolo senza spazi ai lati)
+VALUE_COLUMN = "value"
+REFDES_COLUMN = "refdes"
+QTY_COLUMNS = ("qty", "quantity", "q.ty")
+# Righe normalizzate insieme da parse_bom
+BOM_CHUNK_ROWS = 8192
+
+BOM_FORMAT_ERROR = "Formato BOM non riconosciuto (colonne 'VALUE' e 'REFDES' non trovate)."
+
+# Una riga di resistore: foglio, numero di riga (da 1, come in Excel), designatori
+# (es. "R1,R2"), valore così come scritto nella BOM, quantità (None se manca la colonna)
+BomRow = namedtuple("BomRow", "sheet row refdes value qty")
+
+class BomFormatError(ValueError):
+    pass
+
+# --- Lettura diretta dell'xlsx ---
+
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+
+def _local(tag):
+    # Nome del tag senza namespace (i file "strict" usano un namespace diverso)
+    return tag.rsplit("}", 1)[-1]
+
+_column_cache = {}
+
+def _column_index(ref):
+    """'C12' -> 2 (colonne da 0)."""
+    letters = ref.rstrip("0123456789")
+    index = _column_cache.get(letters)
+    if index is None:
+        index = -1
+        for ch in letters.upper():
+            index = (index + 1) * 26 + ord(ch) - 65
+        _column_cache[letters] = index
+    return index
+
+def _xlsx_parts(archive):
+    """Nome dei fogli, percorso nel pacchetto e percorso delle stringhe condivise."""
+    rels = {}
+    shared = None
+    with archive.open("xl/_rels/workbook.xml.rels") as f:
+        for _, elem in iterparse(f):
+            if _local(elem.tag) == "Relationship":
+                target = elem.get("Target", "")
+                target = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+                rels[elem.get("Id")] = target
+                if elem.get("Type", "").endswith("/sharedStrings"):
+                    shared = target
+    sheets = []
+    with archive.open("xl/workbook.xml") as f:
+        for _, elem in iterparse(f):
+            if _local(elem.tag) == "sheet" and elem.get(_REL_NS) in rels:
+                sheets.append((elem.get("name"), rels[elem.get(_REL_NS)]))
+    return sheets, shared
+
+def _shared_strings(archive, path):
+    strings = []
+    if path is None or path not in archive.namelist():
+        return strings
+    with archive.open(path) as f:
+        for _, elem in iterparse(f):
+            if _local(elem.tag) == "si":
+                # Testo semplice o a più "run" formattati; la guida fonetica (rPh) non fa parte del valore
+                parts = []
+                for child in elem:
+                    tag = _local(child.tag)
+                    if tag == "t":
+                        parts.append(child.text or "")
+                    elif tag == "r":
+                        parts.extend(t.text or "" for t in child if _local(t.tag) == "t")
+                strings.append("".join(parts))
+                elem.clear()
+    return strings
+
+def _cell_value(kind, text, strings):
+    if text is None:
+        return None
+    if kind == "s":
+        return strings[int(text)]
+    if kind in ("str", "inlineStr", "e"):
+        return text
+    if kind == "b":
+        return text == "1"
+    try:
+        number = float(text)
+    except ValueError:
+        return text
+    return int(number) if number.is_integer() and "." not in text and "E" not in text.upper() else number
+
+def _xlsx_rows(archive, path, strings):
+    """Righe di un foglio come liste di valori (celle vuote = None), in streaming."""
+    row_tag = None  # noto all'apertura di sheetData
+    with archive.open(path) as f:
+        for event, elem in iterparse(f, events=("start", "end")):
+            if event == "start":
+                if row_tag is None and _local(elem.tag) == "sheetData":
+                    sheet_data = elem
+                    ns = elem.tag[:-len("sheetData")]
+                    row_tag, v_tag, is_tag = ns + "row", ns + "v", ns + "is"
+                continue
+            if elem.tag != row_tag:
+                continue
+            row = []
+            for cell in elem:
+                ref = cell.get("r")
+                if ref:
+                    column = _column_index(ref)
+                    if column > len(row):
+                        row.extend([None] * (column - len(row)))
+                kind = cell.get("t")
+                if kind == "inlineStr":
+                    inline = cell.find(is_tag)
+                    text = "".join(inline.itertext()) if inline is not None else None
+                else:
+                    v = cell.find(v_tag)
+                    text = v.text if v is not None else None
+                row.append(_cell_value(kind, text, strings))
+            yield int(elem.get("r", 0)) or None, row
+            # Le righe già lette si scartano: la memoria non cresce con il foglio
+            sheet_data.clear()
+
+def _xlsx_sheets(file_path):
+    with zipfile.ZipFile(file_path) as archive:
+        sheets, shared = _xlsx_parts(archive)
+        strings = _shared_strings(archive, shared)
+        for name, path in sheets:
+            yield name, _xlsx_rows(archive, path, strings)
+
+def _pandas_sheets(file_path):
+    try:
+        import pandas as pd
+    except ImportError:
+        raise BomFormatError("Libreria pandas non trovata (necessaria per i file .xls).")
+    for name, frame in pd.read_excel(file_path, sheet_name=None, header=None).items():
+        yield name, ((None, list(row)) for row in frame.itertuples(index=False, name=None))
+
+# --- Righe della BOM ---
+
+def _numbered(rows):
+    # Numera le righe quando il formato non lo fa (pandas) o salta le righe vuote (xlsx)
+    last = 0
+    for number, row in rows:
+        last = number if number else last + 1
+        yield last, row
+
+def _find_header(rows):
+    """Consuma le righe fino all'intestazione; restituisce (refdes, value, qty) come indici di colonna, o None."""
+    for scanned, (_, row) in enumerate(rows, start=1):
+        names = [str(cell).strip().lower() if cell is not None else "" for cell in row]
+        if VALUE_COLUMN in names and REFDES_COLUMN in names:
+            qty = next((names.index(name) for name in QTY_COLUMNS if name in names), None)
+            return names.index(REFDES_COLUMN), names.index(VALUE_COLUMN), qty
+        if scanned >= BOM_HEADER_SCAN_ROWS:
+            break
+    return None
+
+def _resistor_rows(sheet_name, rows, header):
+    """Righe dei resistori (REFDES che inizia con 'R') che seguono l'intestazione di un foglio."""
+    refdes_col, value_col, qty_col = header
+    for row_number, row in rows:
+        refdes = row[refdes_col] if refdes_col < len(row) else None
+        if refdes is None or refdes != refdes:  # cella vuota (None o NaN da pandas)
+            continue
+        refdes = str(refdes).strip()
+        if not refdes.upper().startswith("R"):
+            continue
+        value = row[value_col] if value_col < len(row) else None
+        qty = row[qty_col] if qty_col is not None and qty_col < len(row) else None
+        yield BomRow(sheet_name, row_number, refdes, value, qty)
+
+def iter_bom_rows(file_path):
+    """
+    Genera le righe dei resistori (BomRow) di tutti i fogli della BOM, in ordine.
+    I fogli senza intestazione VALUE/REFDES sono ignorati; se nessun foglio la
+    contiene solleva BomFormatError.
+    """
+    is_xls = os.path.splitext(file_path)[1].lower() == ".xls"
+    found = False
+    for sheet_name, rows in (_pandas_sheets(file_path) if is_xls else _xlsx_sheets(file_path)):
+        rows = _numbered(rows)
+        header = _find_header(rows)
+        if header is None:
+            continue
+        found = True
+        yield from _resistor_rows(sheet_name, rows, header)
+    if not found:
+        raise BomFormatError(BOM_FORMAT_ERROR)
+
+def _quantity(cell):
+    if isinstance(cell, (int, float)) and not isinstance(cell, bool):
+        return float(cell)
+    try:
+        return float(str(cell).strip().replace(",", "."))
+    except ValueError:
+        return float("nan")
+
+@dataclass(frozen=True, slots=True, eq=False)
+class ParsedBom:
+    """
+    Righe dei resistori di una BOM, per colonne (un elemento per riga della BOM).
+    `values` è NaN per le celle vuote o non interpretate, `qty` per le quantità
+    mancanti; `unparsed` sono gli indici delle righe con un valore non leggibile.
+    """
+    sheets: tuple                # nomi dei fogli con intestazione, in ordine
+    sheet: object                # ndarray int16: indice in `sheets`
+    row: object                  # ndarray int32: numero di riga nel foglio (da 1)
+    refdes: object               # ndarray str: designatori così come scritti ("R1,R2")
+    text: object                 # ndarray str: valore così come scritto
+    values: object               # ndarray float64: Ohm
+    qty: object                  # ndarray float64
+    unparsed: object             # ndarray intp
+
+    def __len__(self):
+        return len(self.values)
+
+    def distinct_values(self):
+        """Valori in Ohm distinti, ordinati (quelli usati dai progettisti in modalità BOM)."""
+        import numpy as np
+        return np.unique(self.values[~np.isnan(self.values)])
+
+    def pieces(self):
+        """Pezzi di ogni riga: la colonna QTY se c'è, altrimenti il numero di designatori ("R1,R2" = 2)."""
+        import numpy as np
+        missing = np.isnan(self.qty)
+        if not missing.any():
+            return self.qty
+        pieces = self.qty.copy()
+        pieces[missing] = [refdes.count(",") + 1 for refdes in self.refdes[missing]]
+        return pieces
+
+def parse_bom(file_path):
+    """
+    Legge tutte le righe dei resistori della BOM in un ParsedBom.
+    Restituisce (ParsedBom, errore) come le funzioni di logic.py.
+    """
+    import numpy as np  # locale: gui importa bom (tramite utils) prima che serva numpy
+    try:
+        sheets, columns = {}, {name: [] for name in ("sheet", "row", "refdes", "text", "values", "qty", "unparsed")}
+        rows = iter_bom_rows(file_path)
+        offset = 0
+        # I valori si normalizzano a blocchi di righe: colonne intere, ma memoria limitata
+        while chunk := list(islice(rows, BOM_CHUNK_ROWS)):
+            ohms, unparsed = normalize_resistor_values([row.value for row in chunk])
+            columns["values"].append(ohms)
+            columns["unparsed"].append(unparsed + offset)
+            columns["sheet"].append(np.array([sheets.setdefault(row.sheet, len(sheets)) for row in chunk], dtype=np.int16))
+            columns["row"].append(np.array([row.row for row in chunk], dtype=np.int32))
+            columns["refdes"].append(np.array([row.refdes for row in chunk], dtype=str))
+            columns["text"].append(np.array(["" if row.value is None else str(row.value) for row in chunk], dtype=str))
+            columns["qty"].append(np.array([_quantity(row.qty) for row in chunk], dtype=np.float64))
+            offset += len(chunk)
+    except zipfile.BadZipFile:
+        return None, "File Excel non valido o danneggiato."
+    except Exception as e:
+        return None, str(e)
+    empty = {"sheet": np.int16, "row": np.int32, "refdes": str, "text": str, "values": np.float64, "qty": np.float64, "unparsed": np.intp}
+    arrays = {name: np.concatenate(parts) if parts else np.empty(0, dtype=empty[name]) for name, parts in columns.items()}
+    return ParsedBom(sheets=tuple(sheets), **arrays), None
+
+def parse_bom_excel(file_path):
+    """Legge un file Excel e restituisce un set di valori Ohm unici per i resistori."""
+    parsed, error = parse_bom(file_path)
+    if error:
+        return None, error
+    return parsed.distinct_values().tolist(), None
@@ -0,0 +1,152 @@
+
+# Cache su disco delle BOM già lette.
+# Una BOM letta (ParsedBom) si salva come archivio .npz con le colonne (valori,
+# designatori, quantità, fogli e righe) più un piccolo header JSON con versione,
+# file di origine, dimensione, mtime e fogli. La chiave è l'hash SHA-1 del contenuto:
+# lo stesso file spostato o ricopiato resta in cache, un file modificato no.
+# Dimensione e mtime del file evitano di ricalcolare l'hash a ogni riapertura nella
+# stessa sessione. Le voci non usate da troppo tempo o oltre il limite di spazio
+# vengono eliminate (prima le meno usate di recente).
+import hashlib
+import json
+import os
+import tempfile
+import time
+import numpy as np
+from bom import ParsedBom, parse_bom
+from divider_tables import default_cache_dir
+
+BOM_CACHE_VERSION = 1
+BOM_CACHE_MAX_BYTES = 64 * 1024 * 1024
+BOM_CACHE_MAX_AGE = 30 * 24 * 3600  # secondi
+_ARRAY_FIELDS = ("sheet", "row", "refdes", "text", "values", "qty", "unparsed")
+
+# (percorso assoluto, dimensione, mtime_ns) -> hash del contenuto
+_known_digests = {}
+
+def bom_cache_dir(cache_dir=None):
+    """Sottocartella 'bom' della cartella di cache comune (vedi divider_tables.default_cache_dir)."""
+    return os.path.join(cache_dir or default_cache_dir(), "bom")
+
+def file_digest(file_path):
+    """Hash SHA-1 del contenuto del file e il suo os.stat; il file si rilegge solo se dimensione o mtime cambiano."""
+    stat = os.stat(file_path)
+    key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+    digest = _known_digests.get(key)
+    if digest is None:
+        sha = hashlib.sha1()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                sha.update(block)
+        digest = _known_digests[key] = sha.hexdigest()
+    return digest, stat
+
+def _entry_paths(cache_dir, digest):
+    base = os.path.join(cache_dir, f"bom_{digest[:24]}")
+    return base + ".npz", base + ".json"
+
+def _read_entry(npz_path, json_path, digest):
+    try:
+        with open(json_path, encoding="utf-8") as f:
+            header = json.load(f)
+        if header.get("version") != BOM_CACHE_VERSION or header.get("sha1") != digest:
+            return None
+        with np.load(npz_path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in _ARRAY_FIELDS}
+    except (OSError, ValueError, KeyError):
+        return None
+    if any(arrays[name].shape != (header["rows"],) for name in _ARRAY_FIELDS if name != "unparsed"):
+        return None
+    return ParsedBom(sheets=tuple(header["sheets"]), **arrays)
+
+def _replace_atomic(path, write):
+    # Scrittura atomica come in divider_tables: un altro processo non vede mai un file parziale
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _write_entry(npz_path, json_path, parsed, digest, file_path, stat):
+    header = {
+        "version": BOM_CACHE_VERSION, "sha1": digest, "source": os.path.abspath(file_path),
+        "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "rows": len(parsed),
+        "sheets": list(parsed.sheets), "created": time.time(),
+    }
+    arrays = {name: getattr(parsed, name) for name in _ARRAY_FIELDS}
+    _replace_atomic(npz_path, lambda f: np.savez_compressed(f, **arrays))
+    # L'header si scrive per ultimo: senza header la voce non esiste
+    _replace_atomic(json_path, lambda f: f.write(json.dumps(header, ensure_ascii=False).encode("utf-8")))
+
+def evict_bom_cache(cache_dir=None, max_bytes=BOM_CACHE_MAX_BYTES, max_age=BOM_CACHE_MAX_AGE, now=None):
+    """
+    Elimina le voci non usate da più di `max_age` secondi, poi le meno usate di recente
+    finché la cache non scende sotto `max_bytes`. Restituisce il numero di voci eliminate.
+    L'ultimo uso è il mtime del file .npz, aggiornato a ogni lettura dalla cache.
+    """
+    cache_dir = bom_cache_dir(cache_dir)
+    now = time.time() if now is None else now
+    entries = []
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return 0
+    for name in names:
+        if not (name.startswith("bom_") and name.endswith(".npz")):
+            continue
+        npz_path = os.path.join(cache_dir, name)
+        json_path = npz_path[:-len(".npz")] + ".json"
+        try:
+            stat = os.stat(npz_path)
+            size = stat.st_size + (os.path.getsize(json_path) if os.path.exists(json_path) else 0)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, size, npz_path, json_path))
+    entries.sort()  # dalla meno usata di recente
+    total = sum(size for _, size, _, _ in entries)
+    removed = 0
+    for last_used, size, npz_path, json_path in entries:
+        if now - last_used <= max_age and total <= max_bytes:
+            break
+        for path in (json_path, npz_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        total -= size
+        removed += 1
+    return removed
+
+def load_bom(file_path, cache_dir=None):
+    """
+    Come bom.parse_bom, ma passando dalla cache: restituisce (ParsedBom, errore).
+    Se la cartella di cache non è scrivibile la BOM viene semplicemente riletta.
+    """
+    try:
+        digest, stat = file_digest(file_path)
+    except OSError as e:
+        return None, str(e)
+    directory = bom_cache_dir(cache_dir)
+    npz_path, json_path = _entry_paths(directory, digest)
+    parsed = _read_entry(npz_path, json_path, digest)
+    if parsed is not None:
+        try:
+            os.utime(npz_path)  # ultimo uso, per l'eliminazione delle voci vecchie
+        except OSError:
+            pass
+        return parsed, None
+
+    parsed, error = parse_bom(file_path)
+    if error:
+        return None, error
+    try:
+        os.makedirs(directory, exist_ok=True)
+        _write_entry(npz_path, json_path, parsed, digest, file_path, stat)
+        evict_bom_cache(cache_dir)
+    except OSError:
+        pass
+    return parsed, None
@@ -0,0 +1,112 @@
+
+# Indice delle BOM per valore: valore -> righe (designatori, progetto, quantità).
+# Le righe di una o più BOM sono ordinate per valore in array paralleli; i valori
+# distinti puntano al loro blocco di righe (starts, come un CSR). Ogni ricerca è un
+# searchsorted su array ordinati: "quali designatori usano 4.7k", "valori entro ±2%
+# di X", "valori distinti per decade" restano sotto il millisecondo anche su
+# inventari di molti progetti.
+from dataclasses import dataclass
+import numpy as np
+
+# Valori che differiscono meno di questa frazione sono lo stesso valore ('4K7' e '4700')
+VALUE_RTOL = 1e-9
+
+def value_group_starts(sorted_values):
+    """Maschera degli elementi che aprono un nuovo valore in un array ordinato (tolleranza VALUE_RTOL)."""
+    new_value = np.ones(sorted_values.size, dtype=bool)
+    new_value[1:] = np.diff(sorted_values) > VALUE_RTOL * np.abs(sorted_values[1:])
+    return new_value
+
+@dataclass(frozen=True, slots=True, eq=False)
+class BomIndex:
+    """
+    Righe con un valore valido di una o più BOM, ordinate per valore.
+    Le righe del valore distinct[i] sono quelle da starts[i] a starts[i + 1].
+    """
+    values: object               # ndarray float64, Ohm (ordinato)
+    refdes: object               # ndarray str: designatori della riga ("R1,R2")
+    pieces: object               # ndarray float64: pezzi della riga
+    project: object              # ndarray int32: indice in `projects`
+    row: object                  # ndarray int32: riga nel foglio Excel
+    distinct: object             # ndarray float64: valori distinti, ordinati
+    starts: object               # ndarray intp, lunghezza len(distinct) + 1
+    projects: tuple              # nomi delle BOM indicizzate
+
+    @classmethod
+    def build(cls, boms):
+        """Indice di [(nome del progetto, ParsedBom), ...]."""
+        boms = list(boms)
+        parts = []
+        for number, (_, parsed) in enumerate(boms):
+            valid = ~np.isnan(parsed.values)
+            parts.append((parsed.values[valid], parsed.refdes[valid], parsed.pieces()[valid],
+                          np.full(int(valid.sum()), number, dtype=np.int32), parsed.row[valid]))
+        columns = [np.concatenate([part[k] for part in parts]) if parts else np.empty(0, dtype)
+                   for k, dtype in enumerate((np.float64, str, np.float64, np.int32, np.int32))]
+        order = np.argsort(columns[0], kind="stable")
+        values, refdes, pieces, project, row = (column[order] for column in columns)
+        first = np.flatnonzero(value_group_starts(values))
+        return cls(values=values, refdes=refdes, pieces=pieces, project=project, row=row,
+                   distinct=values[first], starts=np.append(first, values.size).astype(np.intp),
+                   projects=tuple(name for name, _ in boms))
+
+    def __len__(self):
+        return len(self.distinct)
+
+    def design_values(self):
+        """Valori distinti come lista (custom_values dei progettisti in modalità BOM)."""
+        return self.distinct.tolist()
+
+    def find(self, value):
+        """Posizione di `value` in `distinct` (a meno di VALUE_RTOL), -1 se non c'è."""
+        i = int(np.searchsorted(self.distinct, value * (1 - VALUE_RTOL)))
+        if i < len(self.distinct) and abs(self.distinct[i] - value) <= VALUE_RTOL * abs(value):
+            return i
+        return -1
+
+    def lines(self, value):
+        """Intervallo delle righe con `value` (vuoto se il valore non è nella BOM)."""
+        i = self.find(value)
+        return slice(0, 0) if i < 0 else slice(int(self.starts[i]), int(self.starts[i + 1]))
+
+    def refdes_for(self, value):
+        """Designatori che usano `value`, uno per elemento ("R1,R2" diventa R1 e R2)."""
+        return [name.strip() for line in self.refdes[self.lines(value)] for name in line.split(",") if name.strip()]
+
+    def usage(self, value):
+        """Righe con `value`: (progetto, designatori, pezzi, riga nel foglio)."""
+        lines = self.lines(value)
+        return [(self.projects[p], str(refdes), float(pieces), int(row))
+                for p, refdes, pieces, row in zip(self.project[lines], self.refdes[lines], self.pieces[lines], self.row[lines])]
+
+    def quantity(self, value):
+        """Pezzi totali di `value` in tutte le BOM indicizzate."""
+        return float(self.pieces[self.lines(value)].sum())
+
+    def within(self, value, percent):
+        """Valori distinti compresi tra value·(1 − percent/100) e value·(1 + percent/100)."""
+        low, high = sorted((value * (1 - percent / 100), value * (1 + percent / 100)))
+        lo = np.searchsorted(self.distinct, low, side="left")
+        hi = np.searchsorted(self.distinct, high, side="right")
+        return self.distinct[lo:hi]
+
+    def decade_counts(self):
+        """{esponente della decade: numero di valori distinti}, es. {3: 12} per 12 valori tra 1 kΩ e 10 kΩ esclusi.
+        I valori nulli (ponticelli da 0 Ω) non appartengono a nessuna decade e non sono contati."""
+        positive = self.distinct[self.distinct > 0]
+        # Il margine evita che un valore esatto di decade (log10 = -3.0000...1) finisca in quella sotto
+        decades, counts = np.unique(np.floor(np.log10(positive) + VALUE_RTOL).astype(int), return_counts=True)
+        return dict(zip(decades.tolist(), counts.tolist()))
+
+def index_from_files(paths, cache_dir=None):
+    """Indice delle BOM `paths` lette da bom_cache (i file illeggibili sono saltati): (BomIndex, errori)."""
+    from bom_cache import load_bom
+    from bom_inventory import project_name
+    boms, errors = [], []
+    for path in paths:
+        parsed, error = load_bom(path, cache_dir)
+        if error:
+            errors.append((path, error))
+        else:
+            boms.append((project_name(path), parsed))
+    return BomIndex.build(boms), errors
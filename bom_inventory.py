@@ -0,0 +1,174 @@
+
+# Inventario dei valori di resistenza su molte BOM (razionalizzazione tra progetti).
+# Le BOM di una cartella si leggono in parallelo in un pool di processi, una BOM per
+# task e sempre attraverso la cache di bom_cache. Ogni worker restituisce solo un
+# riassunto (valori distinti, righe e pezzi per valore), che il processo principale
+# unisce in un inventario deduplicato: per ogni valore quante righe e quanti pezzi lo
+# usano e in quali progetti. Un file illeggibile diventa un errore nell'elenco, senza
+# fermare gli altri.
+#   python main.py inventory BOM/ -o inventario.csv --workers 8
+import csv
+import multiprocessing
+import os
+import sys
+from dataclasses import dataclass
+import numpy as np
+from bom_cache import load_bom
+from bom_index import value_group_starts
+
+BOM_EXTENSIONS = (".xlsx", ".xlsm", ".xls")
+
+def find_bom_files(directory, recursive=True):
+    """File Excel della cartella (e delle sottocartelle), in ordine; esclusi i file di lock di Office ('~$...')."""
+    found = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        found.extend(os.path.join(root, name) for name in sorted(files)
+                     if name.lower().endswith(BOM_EXTENSIONS) and not name.startswith("~$"))
+        if not recursive:
+            break
+    return found
+
+def project_name(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+def summarize_bom(parsed):
+    """(valori distinti, righe per valore, pezzi per valore) di una ParsedBom."""
+    valid = ~np.isnan(parsed.values)
+    values, inverse = np.unique(parsed.values[valid], return_inverse=True)
+    lines = np.bincount(inverse, minlength=values.size)
+    return values, lines, np.bincount(inverse, weights=parsed.pieces()[valid], minlength=values.size)
+
+def _load_summary(path, cache_dir=None):
+    # Eseguita nei worker: al processo principale torna solo il riassunto, non le righe
+    parsed, error = load_bom(path, cache_dir)
+    if error:
+        return None, error
+    return summarize_bom(parsed), None
+
+@dataclass(frozen=True, slots=True, eq=False)
+class BomInventory:
+    """
+    Valori distinti di tutte le BOM lette, ordinati, con righe e pezzi totali per valore.
+    I progetti che usano il valore i sono projects[project_idx[project_ptr[i]:project_ptr[i + 1]]].
+    """
+    values: object               # ndarray float64, Ohm
+    lines: object                # ndarray int64: righe di BOM con il valore
+    pieces: object               # ndarray float64: pezzi montati
+    project_ptr: object          # ndarray intp, lunghezza len(values) + 1
+    project_idx: object          # ndarray intp: indici in `projects`
+    projects: tuple              # nome di ogni BOM letta (nome del file senza estensione)
+    files: tuple                 # percorso di ogni BOM letta, come `projects`
+    errors: tuple                # (percorso, messaggio) dei file non letti
+
+    def __len__(self):
+        return len(self.values)
+
+    def projects_of(self, index):
+        return [self.projects[p] for p in self.project_idx[self.project_ptr[index]:self.project_ptr[index + 1]]]
+
+    def rows(self):
+        """Righe dell'inventario: (valore, righe, pezzi, numero di progetti, progetti)."""
+        for i in range(len(self.values)):
+            projects = self.projects_of(i)
+            yield float(self.values[i]), int(self.lines[i]), float(self.pieces[i]), len(projects), projects
+
+def merge_summaries(summaries, files=(), errors=()):
+    """Unisce i riassunti per file (nell'ordine di `files`) in un BomInventory."""
+    values = np.concatenate([s[0] for s in summaries] + [np.empty(0)])
+    lines = np.concatenate([s[1] for s in summaries] + [np.empty(0, np.int64)])
+    pieces = np.concatenate([s[2] for s in summaries] + [np.empty(0)])
+    source = np.repeat(np.arange(len(summaries), dtype=np.intp), [s[0].size for s in summaries])
+    order = np.argsort(values, kind="stable")
+    values, lines, pieces, source = values[order], lines[order], pieces[order], source[order]
+    new_value = value_group_starts(values)
+    starts = np.flatnonzero(new_value)
+    group = np.cumsum(new_value) - 1
+    # Coppie (valore, progetto) distinte, ordinate per valore e poi per progetto
+    pairs = np.unique(np.column_stack((group, source)), axis=0).reshape(-1, 2)
+    counts = np.bincount(pairs[:, 0], minlength=starts.size)
+    return BomInventory(
+        values=values[starts],
+        lines=np.add.reduceat(lines, starts) if starts.size else lines,
+        pieces=np.add.reduceat(pieces, starts) if starts.size else pieces,
+        project_ptr=np.r_[0, np.cumsum(counts)].astype(np.intp),
+        project_idx=pairs[:, 1].astype(np.intp),
+        projects=tuple(project_name(path) for path in files),
+        files=tuple(files),
+        errors=tuple(errors),
+    )
+
+def build_inventory(paths, workers=None, cache_dir=None, progress=None):
+    """
+    Legge le BOM `paths` (in parallelo con workers > 1, default: numero di CPU) e
+    restituisce il BomInventory. `progress(completati, totale, percorso, errore)` è
+    chiamata a ogni file terminato, nell'ordine di completamento.
+    """
+    paths = list(paths)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    results = [None] * len(paths)
+
+    def done(i, outcome):
+        results[i] = outcome
+        if progress:
+            progress(sum(r is not None for r in results), len(paths), paths[i], outcome[1])
+
+    if workers <= 1 or len(paths) <= 1:
+        for i, path in enumerate(paths):
+            done(i, _load_summary(path, cache_dir))
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        # spawn: la GUI chiama questa funzione e un fork del processo Tk non è sicuro
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths)), mp_context=context) as executor:
+            futures = {executor.submit(_load_summary, path, cache_dir): i for i, path in enumerate(paths)}
+            for future in as_completed(futures):
+                try:
+                    outcome = future.result()
+                except Exception as e:  # worker terminato, risultato non trasferibile...
+                    outcome = (None, f"{type(e).__name__}: {e}")
+                done(futures[future], outcome)
+
+    loaded = [(path, summary) for path, (summary, error) in zip(paths, results) if error is None]
+    errors = [(path, error) for path, (summary, error) in zip(paths, results) if error is not None]
+    return merge_summaries([summary for _, summary in loaded], [path for path, _ in loaded], errors)
+
+def bulk_import_boms(directory, workers=None, cache_dir=None, progress=None, recursive=True):
+    """Inventario di tutte le BOM della cartella: (BomInventory, errore)."""
+    if not os.path.isdir(directory):
+        return None, f"Cartella non trovata: {directory}"
+    paths = find_bom_files(directory, recursive)
+    if not paths:
+        return None, f"Nessun file BOM ({', '.join(BOM_EXTENSIONS)}) in {directory}"
+    return build_inventory(paths, workers, cache_dir, progress), None
+
+def write_inventory_csv(inventory, stream):
+    writer = csv.writer(stream)
+    writer.writerow(["value_ohm", "lines", "pieces", "projects_count", "projects"])
+    for value, lines, pieces, count, projects in inventory.rows():
+        writer.writerow([f"{value:g}", lines, f"{pieces:g}", count, ";".join(projects)])
+
+def add_inventory_arguments(parser):
+    parser.add_argument("directory", help="Cartella con i file BOM (.xlsx, .xls)")
+    parser.add_argument("-o", "--output", help="File CSV dell'inventario (stdout se omesso)")
+    parser.add_argument("--workers", type=int, default=None, help="Processi paralleli (default: numero di CPU)")
+    parser.add_argument("--no-recursive", action="store_true", help="Non legge le sottocartelle")
+
+def inventory_main(args):
+    def progress(done, total, path, error):
+        status = f"ERRORE: {error}" if error else "ok"
+        print(f"[{done}/{total}] {os.path.basename(path)}: {status}", file=sys.stderr)
+
+    inventory, error = bulk_import_boms(args.directory, args.workers, progress=progress, recursive=not args.no_recursive)
+    if error:
+        print(error, file=sys.stderr)
+        return 1
+    target = sys.stdout if args.output in (None, "-") else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        write_inventory_csv(inventory, target)
+    finally:
+        if target is not sys.stdout:
+            target.close()
+    print(f"{len(inventory.files)} BOM lette, {len(inventory.errors)} con errore, {len(inventory)} valori distinti.", file=sys.stderr)
+    return 1 if inventory.errors else 0
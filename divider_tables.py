@@ -0,0 +1,112 @@
+
+# Tabelle persistenti dei rapporti di partizione R2/(R1+R2) per le serie E.
+# Ogni tabella contiene tutti i rapporti ottenibili con una lista di valori,
+# ordinati, insieme agli indici (R1, R2). Viene costruita una sola volta,
+# salvata come .npy nella cartella di cache e poi aperta in memory-map:
+# una ricerca è un searchsorted più la scansione di pochi vicini.
+# Rapporti e coppie di indici sono in file separati, così l'array dei rapporti
+# è contiguo e la ricerca binaria legge solo le poche pagine che tocca.
+import hashlib
+import os
+import tempfile
+import numpy as np
+from result_cache import LRUResultCache
+
+CACHE_DIR_ENV = "RESISTOR_TOOL_CACHE"
+
+# Tabelle aperte, (cartella, hash dei valori) -> (rapporti, coppie). Una voce per serie o
+# insieme di valori di BOM: in una sessione lunga le meno usate vengono chiuse. Il limite
+# in byte conta anche i memory-map, che pesano sulla RAM solo per le pagine lette.
+DIVIDER_TABLES_MAX_ENTRIES = 16
+DIVIDER_TABLES_MAX_BYTES = 512 * 1024 * 1024
+_tables = LRUResultCache(max_entries=DIVIDER_TABLES_MAX_ENTRIES, max_bytes=DIVIDER_TABLES_MAX_BYTES)
+
+def default_cache_dir():
+    """Cartella di cache: $RESISTOR_TOOL_CACHE oppure ~/.cache/resistor_tool."""
+    return os.environ.get(CACHE_DIR_ENV) or os.path.join(os.path.expanduser("~"), ".cache", "resistor_tool")
+
+def build_divider_table(values):
+    """
+    Costruisce in memoria la tabella (rapporti, coppie): i rapporti sono ordinati
+    (a parità per indice R1, poi R2) e `coppie` ha forma (n², 2) con gli indici (R1, R2).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = values.size
+    if n > np.iinfo(np.uint16).max:
+        raise ValueError("Troppi valori per una tabella dei rapporti.")
+    r1 = np.repeat(np.arange(n, dtype=np.uint16), n)
+    r2 = np.tile(np.arange(n, dtype=np.uint16), n)
+    ratio = values[r2] / (values[r1] + values[r2])
+    order = np.lexsort((r2, r1, ratio))
+    return ratio[order], np.column_stack((r1[order], r2[order]))
+
+def _save_atomic(path, array):
+    # Scrittura atomica: un altro processo non vede mai un file parziale
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".npy.tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _load_cached(ratio_path, pairs_path, size):
+    try:
+        ratios = np.load(ratio_path, mmap_mode='r')
+        pairs = np.load(pairs_path, mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+    if ratios.shape != (size,) or pairs.shape != (size, 2) or ratios.dtype != np.float64 or pairs.dtype != np.uint16:
+        return None
+    return ratios, pairs
+
+def load_divider_table(values, cache_dir=None):
+    """
+    Restituisce la tabella (rapporti, coppie) per `values` (array ordinato senza zeri),
+    aprendola in memory-map dalla cache o costruendola e salvandola al primo uso.
+    Se la cartella di cache non è scrivibile la tabella resta solo in memoria.
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    digest = hashlib.sha1(values.tobytes()).hexdigest()[:16]
+    cache_dir = cache_dir or default_cache_dir()
+    key = (cache_dir, digest)
+    table = _tables.get(key)
+    if table is not None:
+        return table
+
+    ratio_path = os.path.join(cache_dir, f"divider_{digest}_ratio.npy")
+    pairs_path = os.path.join(cache_dir, f"divider_{digest}_pairs.npy")
+    table = _load_cached(ratio_path, pairs_path, values.size ** 2)
+    if table is None:
+        table = build_divider_table(values)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            _save_atomic(pairs_path, table[1])
+            _save_atomic(ratio_path, table[0])
+            table = _load_cached(ratio_path, pairs_path, values.size ** 2) or table
+        except OSError:
+            pass
+    _tables.put(key, table)
+    return table
+
+def query_divider_table(table, target_ratio, top=10):
+    """
+    Indici (R1, R2) ed errori % delle `top` coppie con rapporto più vicino a `target_ratio`,
+    in ordine di errore (a parità, per indice R1 e poi R2).
+    """
+    ratios, pairs = table
+    size = ratios.shape[0]
+    if size == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), np.empty(0)
+    pos = int(np.searchsorted(ratios, target_ratio))
+    lo = max(pos - top, 0)
+    hi = min(pos + top, size)
+    # Estende la finestra ai rapporti identici a quelli di bordo (stesse coppie su decadi diverse)
+    lo = int(np.searchsorted(ratios, ratios[lo], side='left'))
+    hi = int(np.searchsorted(ratios, ratios[hi - 1], side='right'))
+    window_pairs = np.asarray(pairs[lo:hi], dtype=np.intp)
+    errors = np.abs((np.asarray(ratios[lo:hi]) - target_ratio) / target_ratio) * 100
+    order = np.lexsort((window_pairs[:, 1], window_pairs[:, 0], errors))[:top]
+    return window_pairs[order, 0], window_pairs[order, 1], errors[order]
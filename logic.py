@@ -1,5 +1,7 @@
 
-import random
+from collections import deque
+from functools import lru_cache, partial
+import re
 import numpy as np
 from resistor_lib import (
     e_series, get_color_from_digit, get_multiplier_color,
@@ -7,7 +9,16 @@ from resistor_lib import (
     derating_start_temp_c, derating_percent_per_c,
     regulator_specs, awg_table, glossary_data
 )
-from utils import format_value
+from units import format_value
+from capacitor_lib import capacitor_e_series
+from result_cache import memoize
+from results import (
+    SmdDecodeResult, PowerResult, ColorCodeResult, ColorMatchResult,
+    SeriesParallelResult, OptimizationResult, MonteCarloResult, CircuitMonteCarloResult,
+    DividerResult, SynthesisResult, LedResult, RcFilterResult, RegulatorResult,
+    CurrentDividerResult, AwgResult
+)
+from divider_tables import load_divider_table, query_divider_table
 
 def parse_value_to_mantissa_exp(val):
     """Semplifica un valore Ohm in mantissa (2 cifre) ed esponente per codice colori."""
@@ -19,6 +30,7 @@ def parse_value_to_mantissa_exp(val):
         exp += 1
     return mantissa, exp
 
+@memoize()
 def decode_smd_code_logic(code, code_type):
     try:
         code = code.strip().upper()
@@ -36,7 +48,6 @@ def decode_smd_code_logic(code, code_type):
         return None, f"Errore durante la decodifica: {str(e)}"
 
 def decode_standard_smd(code):
-    result = f"--- Decodifica Codice SMD Standard ---\n\nCodice Inserito: {code}\n"
     value = 0
 
     if 'R' in code:
@@ -44,22 +55,18 @@ def decode_standard_smd(code):
         if len(parts) != 2 or not parts[0] or not parts[1]:
             return None, "Formato 'R' non valido. Esempio valido: '4R7' per 4.7Ω."
         value = float(f"{parts[0]}.{parts[1]}")
-        result += f"Spiegazione: La 'R' rappresenta il punto decimale. Valore: {parts[0]}.{parts[1]}Ω.\n"
     elif len(code) == 3:
         mantissa = int(code[:2])
         exponent = int(code[2])
         value = mantissa * (10 ** exponent)
-        result += f"Spiegazione: Le prime due cifre ({code[:2]}) sono la mantissa, la terza ({code[2]}) è il moltiplicatore (10^{code[2]}).\n"
     elif len(code) == 4:
         mantissa = int(code[:3])
         exponent = int(code[3])
         value = mantissa * (10 ** exponent)
-        result += f"Spiegazione: Le prime tre cifre ({code[:3]}) sono la mantissa, la quarta ({code[3]}) è il moltiplicatore (10^{code[3]}).\n"
     else:
         return None, "Il codice standard deve avere 3 o 4 cifre, o usare la notazione 'R'."
 
-    result += f"\nValore Calcolato: {format_value(value)}"
-    return result, None
+    return SmdDecodeResult(code, "standard", value), None
 
 def decode_eia96_smd(code):
     if len(code) != 3:
@@ -77,14 +84,9 @@ def decode_eia96_smd(code):
     multiplier = eia96_multiplier_codes[multiplier_char]
     final_value = base_value * multiplier
 
-    result = f"--- Decodifica Codice EIA-96 ---\n\nCodice Inserito: {code}\n"
-    result += f"Spiegazione:\n"
-    result += f"- Le prime due cifre '{value_code}' corrispondono al valore base: {base_value}.\n"
-    result += f"- La lettera '{multiplier_char}' corrisponde a un moltiplicatore: x{multiplier}.\n\n"
-    result += f"Calcolo: {base_value} × {multiplier} = {final_value}\n"
-    result += f"Valore Calcolato: {format_value(final_value)}"
-    return result, None
+    return SmdDecodeResult(code, "eia96", final_value, base_value, multiplier), None
 
+@memoize()
 def calculate_power_logic(voltage, current, resistance, package_power_val, package_name, ambient_temp):
     try:
         # ... (calcolo potenza media, come prima) ...
@@ -103,37 +105,14 @@ def calculate_power_logic(voltage, current, resistance, package_power_val, packa
             derated_power = package_power_val * (1 - derating_factor)
             if derated_power < 0: derated_power = 0
 
-        # Costruzione della stringa di risultato
-        result = f"--- Analisi Potenza e Derating Termico ---\n\n"
-        result += f"Potenza dissipata calcolata: {avg_power:.4f} W\n\n"
-        result += f"--- Valutazione Package: {package_name} ---\n"
-        result += f"Potenza Nominale Package (a 25°C): {package_power_val} W\n"
-        result += f"Temperatura Ambiente Impostata: {ambient_temp}°C\n\n"
-        result += f"--- Analisi Derating ---\n"
-        result += f"La potenza massima di un resistore diminuisce con la temperatura. \n"
-        result += f"(Modello usato: derating lineare a partire da {derating_start_temp_c}°C)\n"
-        result += f"Potenza Massima Reale a {ambient_temp}°C: {derated_power:.4f} W\n\n"
-
-        result += f"--- Raccomandazioni ---\n"
-        if avg_power > derated_power:
-            result += f"✗ CRITICO: La potenza dissipata ({avg_power:.4f}W) supera la potenza massima del package alla temperatura di lavoro ({derated_power:.4f}W). Rischio di guasto imminente! Scegli un package più grande."
-        else:
-            safety_factor_derated = derated_power / avg_power if avg_power > 0 else float('inf')
-            result += f"Fattore di Sicurezza (reale, a {ambient_temp}°C): {safety_factor_derated:.1f}x\n"
-            if safety_factor_derated >= 2.0:
-                result += "✓ OTTIMO: Il componente lavora in un regime di sicurezza eccellente."
-            elif safety_factor_derated >= 1.5:
-                result += "✓ BUONO: Il componente ha un margine di sicurezza adeguato per la maggior parte delle applicazioni."
-            else:
-                result += "⚠ ATTENZIONE: Margine di sicurezza ridotto. Il componente potrebbe surriscaldarsi in condizioni di stress o scarsa ventilazione. Valuta un package superiore per una maggiore affidabilità."
-        
-        return result, None
+        return PowerResult(avg_power, package_name, package_power_val, ambient_temp, derated_power), None
 
     except Exception as e:
         return None, f"Errore nel calcolo: {str(e)}"
 
 # ... (le altre funzioni logiche rimangono invariate) ...
 
+@memoize()
 def calculate_color_code_logic(color_codes, tolerance_colors, band1, band2, multiplier, tolerance):
     try:
         band1_val = color_codes[band1][0]
@@ -143,18 +122,92 @@ def calculate_color_code_logic(color_codes, tolerance_colors, band1, band2, mult
         value = (band1_val * 10 + band2_val) * (10**multiplier_val)
         min_value = value * (1 - tolerance_val / 100)
         max_value = value * (1 + tolerance_val / 100)
-        result = f"--- Analisi del Codice Colori (IEC 60062) ---\n\nValore Nominale: {format_value(value)}\nTolleranza: ±{tolerance_val}%\nRange di funzionamento: da {format_value(min_value)} a {format_value(max_value)}\n\nSpiegazione:\nIl valore è calcolato combinando le prime due bande ({band1_val} e {band2_val}) e moltiplicando per 10^{multiplier_val}."
-        return result, None
+        return ColorCodeResult(value, tolerance_val, min_value, max_value, (band1_val, band2_val), multiplier_val), None
     except Exception as e:
         return None, f"Errore nel calcolo: {str(e)}"
 
+# --- Indice delle serie E ---
+# I valori espansi per decade vengono calcolati una sola volta e tenuti ordinati,
+# così la ricerca del valore più vicino è una ricerca binaria invece di una scansione.
+SERIES_DECADES = (-2, 8)  # da 0.01 Ω a 100 MΩ
+
+@lru_cache(maxsize=64)
+def _series_index(series_values, decades):
+    values = np.array([base * (10**decade) for decade in range(*decades) for base in series_values])
+    values.sort(kind='stable')
+    values.flags.writeable = False
+    return values
+
+def series_value_index(series_values, decades=SERIES_DECADES):
+    """Array ordinato (sola lettura) dei valori della serie espansi su `decades` = (prima, ultima+1)."""
+    return _series_index(tuple(series_values), tuple(decades))
+
+@lru_cache(maxsize=8)
+def _all_series_index(series_items, decades):
+    values, series_pos, bases, exps = [], [], [], []
+    for pos, (_, series_values) in enumerate(series_items):
+        for decade in range(*decades):
+            for base in series_values:
+                values.append(base * (10**decade))
+                series_pos.append(pos)
+                bases.append(base)
+                exps.append(decade)
+    # np.unique restituisce la prima occorrenza nell'ordine di iterazione
+    # (serie, decade, base): a parità di valore vince la serie più piccola.
+    unique_values, first = np.unique(np.array(values), return_index=True)
+    names = tuple(name for name, _ in series_items)
+    return (unique_values, first, np.array(series_pos)[first], np.array(bases)[first],
+            np.array(exps)[first], names)
+
+def all_series_index(e_series_data, decades=SERIES_DECADES):
+    """
+    Indice unificato di tutte le serie: (valori ordinati, ordine di iterazione,
+    indice della serie di provenienza, valore base, decade, nomi delle serie).
+    """
+    items = tuple((name, tuple(values)) for name, values in e_series_data.items())
+    return _all_series_index(items, tuple(decades))
+
+def nearest_index(sorted_values, target_value, order=None):
+    """
+    Posizione del valore con errore relativo minimo rispetto a `target_value`.
+    A parità di errore vince il valore più basso o, se fornito, quello con `order` minore.
+    """
+    pos = int(np.searchsorted(sorted_values, target_value))
+    candidates = [p for p in (pos - 1, pos) if 0 <= p < len(sorted_values)]
+    if len(candidates) == 1:
+        return candidates[0]
+    lo, hi = candidates
+    err_lo = abs((sorted_values[lo] - target_value) / target_value)
+    err_hi = abs((sorted_values[hi] - target_value) / target_value)
+    if err_lo == err_hi and order is not None:
+        return lo if order[lo] < order[hi] else hi
+    return lo if err_lo <= err_hi else hi
+
+def nearest_indices(sorted_values, targets, order=None):
+    """Versione vettorizzata di nearest_index: una posizione per ogni target, stesse regole di parità."""
+    targets = np.asarray(targets, dtype=np.float64)
+    n = len(sorted_values)
+    pos = np.searchsorted(sorted_values, targets)
+    lo = np.clip(pos - 1, 0, n - 1)
+    hi = np.clip(pos, 0, n - 1)
+    err_lo = np.abs((sorted_values[lo] - targets) / targets)
+    err_hi = np.abs((sorted_values[hi] - targets) / targets)
+    take_lo = err_lo <= err_hi
+    if order is not None:
+        take_lo = np.where(err_lo == err_hi, order[lo] < order[hi], take_lo)
+    take_lo = np.where(pos == 0, False, np.where(pos == n, True, take_lo))
+    return np.where(take_lo, lo, hi)
+
+@memoize()
 def find_color_code_logic(value, e_series_data, custom_values=None):
     try:
         best_match = find_best_color_match(value, e_series_data, custom_values=custom_values)
         if best_match:
-            source = "BOM Personalizzata" if custom_values else f"Serie {best_match['series_name']}"
-            result = f"--- Ricerca Valore Commerciale ---\n\nValore richiesto: {format_value(value)}\nSorgente: {source}\n\nCodice colori suggerito per il valore più vicino:\n- Banda 1: {best_match['band1']}\n- Banda 2: {best_match['band2']}\n- Moltiplicatore: {best_match['multiplier']}\n- Tolleranza: {best_match['tolerance']} (±{best_match['tolerance_value']}%)\n\nValore trovato: {format_value(best_match['actual_value'])}\nErrore rispetto al valore richiesto: {best_match['error']:.2f}%\n\nSpiegazione:\nÈ stato cercato il valore più vicino tra quelli disponibili per minimizzare l'errore percentuale."
-            return result, None
+            return ColorMatchResult(
+                value, best_match['series_name'], bool(custom_values),
+                best_match['band1'], best_match['band2'], best_match['multiplier'],
+                best_match['tolerance'], best_match['tolerance_value'],
+                best_match['actual_value'], best_match['error']), None
         else:
             return None, "Nessun valore trovato"
     except ValueError:
@@ -186,64 +239,73 @@ def find_best_color_match(target_value, e_series_data, custom_values=None):
                 }
         return best_match
 
-    for series_name, series_values in e_series_data.items():
-        for decade in range(-2, 8):
-            for base_value in series_values:
-                actual_value = base_value * (10**decade)
-                error = abs((actual_value - target_value) / target_value) * 100
-                if error < best_error:
-                    best_error = error
-                    # Assicuriamoci che base_value sia formattato per estrarre le cifre correttamente
-                    # Per valori come 1.0, 2.2 ecc. vogliamo le prime due cifre significative
-                    base_str = f"{base_value:g}".replace(".", "")
-                    if len(base_str) == 1:
-                        digit1 = int(base_str[0])
-                        digit2 = 0
-                    else:
-                        digit1 = int(base_str[0])
-                        digit2 = int(base_str[1])
-
-                    best_match = {
-                        "series_name": series_name,
-                        "band1": get_color_from_digit(digit1),
-                        "band2": get_color_from_digit(digit2),
-                        "multiplier": get_multiplier_color(decade),
-                        "tolerance": "oro",
-                        "tolerance_value": 5,
-                        "actual_value": actual_value,
-                        "error": error,
-                    }
-    return best_match
+    values, order, series_pos, bases, exps, names = all_series_index(e_series_data)
+    if len(values) == 0:
+        return None
+    pos = nearest_index(values, target_value, order)
+    actual_value = float(values[pos])
+    error = abs((actual_value - target_value) / target_value) * 100
+    return _series_color_match(names[series_pos[pos]], float(bases[pos]), int(exps[pos]), actual_value, error)
 
+def find_best_color_matches(target_values, e_series_data):
+    """
+    Versione vettorizzata di find_best_color_match (solo serie E) per un array di valori:
+    una sola ricerca binaria per tutti i target, poi le bande per ciascun risultato.
+    """
+    targets = np.atleast_1d(np.asarray(target_values, dtype=np.float64))
+    values, order, series_pos, bases, exps, names = all_series_index(e_series_data)
+    if len(values) == 0:
+        return [None] * targets.size
+    pos = nearest_indices(values, targets, order)
+    actual = values[pos]
+    errors = np.abs((actual - targets) / targets) * 100
+    return [_series_color_match(names[sp], base, decade, value, error)
+            for sp, base, decade, value, error in zip(series_pos[pos].tolist(), bases[pos].tolist(), exps[pos].tolist(),
+                                                       actual.tolist(), errors.tolist())]
+
+def _series_color_match(series_name, base_value, decade, actual_value, error):
+    # Assicuriamoci che base_value sia formattato per estrarre le cifre correttamente
+    # Per valori come 1.0, 2.2 ecc. vogliamo le prime due cifre significative
+    base_str = f"{base_value:g}".replace(".", "")
+    if len(base_str) == 1:
+        digit1 = int(base_str[0])
+        digit2 = 0
+    else:
+        digit1 = int(base_str[0])
+        digit2 = int(base_str[1])
+
+    return {
+        "series_name": series_name,
+        "band1": get_color_from_digit(digit1),
+        "band2": get_color_from_digit(digit2),
+        "multiplier": get_multiplier_color(decade),
+        "tolerance": "oro",
+        "tolerance_value": 5,
+        "actual_value": actual_value,
+        "error": error,
+    }
+
+@memoize()
 def calculate_series_parallel_logic(resistances, tolerances, conn_type):
     try:
         if conn_type == "serie":
             total_resistance = sum(resistances)
-            formula = "R_tot = R1 + R2 + ..."
-            calculation = f"R_tot = {' + '.join([format_value(r) for r in resistances])}"
         else:
             total_resistance = 1 / sum(1 / r for r in resistances)
-            formula = "R_tot = 1 / (1/R1 + 1/R2 + ...)"
-            calculation = f"R_tot = 1 / ({' + '.join([f'1/{format_value(r)}' for r in resistances])})"
         tol_mean = sum(tolerances) / len(tolerances) if tolerances else 0
         min_total = total_resistance * (1 - tol_mean / 100)
         max_total = total_resistance * (1 + tol_mean / 100)
-        result = f"--- Calcolo {conn_type.title()} ---\n\nFormula utilizzata: {formula}\nCalcolo: {calculation}\n\nResistenza Totale Calcolata: {format_value(total_resistance)}\nTolleranza media (approssimata): ±{tol_mean:.2f}%\nRange di funzionamento stimato: da {format_value(min_total)} a {format_value(max_total)}\n"
-        return result, total_resistance, None
+        return SeriesParallelResult(conn_type, tuple(resistances), total_resistance, tol_mean, min_total, max_total), None
     except Exception as e:
-        return None, None, f"Errore nel calcolo: {str(e)}"
+        return None, f"Errore nel calcolo: {str(e)}"
 
+@memoize()
 def optimize_with_commercial_logic(resistances, conn_type, series, e_series_data, custom_values=None):
     try:
         if not resistances: return None, "Nessuna resistenza inserita"
         series_values = e_series_data.get(series, list(e_series_data.values())[0])
-        source_name = "BOM" if custom_values else f"Serie {series}"
-        result = f"--- Ottimizzazione con Valori Commerciali ({source_name}) ---\n\nOgni resistenza teorica viene sostituita con il valore più vicino disponibile.\n\n"
-        optimized_resistances = []
-        for i, target_r in enumerate(resistances):
-            best_match = find_best_commercial_value(target_r, series_values, custom_values=custom_values)
-            optimized_resistances.append(best_match["value"])
-            result += f"- R{i + 1}: {format_value(target_r)} → {format_value(best_match['value'])} (Errore: {best_match['error']:.2f}%)\n"
+        matched, errors, _ = snap_to_series(resistances, series_values, custom_values=custom_values)
+        optimized_resistances = matched.tolist()
         if conn_type == "serie":
             optimized_total = sum(optimized_resistances)
             original_total = sum(resistances)
@@ -251,98 +313,461 @@ def optimize_with_commercial_logic(resistances, conn_type, series, e_series_data
             optimized_total = 1 / sum(1 / r for r in optimized_resistances)
             original_total = 1 / sum(1 / r for r in resistances)
         total_error_percent = (abs((optimized_total - original_total) / original_total) * 100 if original_total != 0 else 0)
-        result += f"\n--- Risultato Finale ---\nResistenza totale teorica: {format_value(original_total)}\nResistenza totale ottimizzata: {format_value(optimized_total)}\nErrore totale sull'equivalente: {total_error_percent:.2f}%\n"
-        return result, None
+        return OptimizationResult("BOM" if custom_values else series, conn_type, np.asarray(resistances), matched, errors,
+                                  original_total, optimized_total, total_error_percent), None
     except Exception as e:
         return None, f"Errore nell'ottimizzazione: {str(e)}"
 
-def run_monte_carlo_logic(vin, iterations, r1_nominal, tol1, r2_nominal, tol2):
+def sample_voltage_divider(rng, size, vin, r1_nominal, tol1, r2_nominal, tol2, dtype=np.float64):
+    """
+    Estrae in blocco `size` campioni di Vout per un partitore con R1/R2 uniformi
+    entro la rispettiva tolleranza. Le operazioni sono in-place per limitare la memoria.
+    """
+    r1 = rng.random(size, dtype=dtype)
+    r1 *= 2 * tol1
+    r1 += 1 - tol1
+    r1 *= r1_nominal
+    vout = rng.random(size, dtype=dtype)
+    vout *= 2 * tol2
+    vout += 1 - tol2
+    vout *= r2_nominal
+    r1 += vout          # r1 diventa R1 + R2
+    vout *= vin
+    vout /= r1          # Vout = Vin * R2 / (R1 + R2)
+    return vout
+
+# Dimensione dei blocchi per la modalità streaming e risoluzione dell'istogramma aggregato
+MC_CHUNK_SIZE = 1 << 20
+MC_HIST_BINS = 4000
+MC_HEAD_SAMPLES = 100
+MC_ITERATIONS_ERROR = "Il numero di iterazioni deve essere maggiore di zero."
+
+class MonteCarloStats:
+    """
+    Statistiche online di una simulazione Monte Carlo a memoria costante:
+    media/varianza (Welford, unione di blocchi con la formula di Chan), min/max,
+    istogramma a bin fissi e i primi campioni per il grafico di andamento.
+    I quantili sono stimati dall'istogramma, che a differenza di P² si unisce
+    esattamente tra blocchi diversi.
+    """
+    __slots__ = ("count", "mean", "m2", "min", "max", "bin_edges", "counts", "head")
+
+    def __init__(self, lo, hi, bins=MC_HIST_BINS):
+        if not hi > lo:
+            hi = lo + max(abs(lo), 1.0) * 1e-9
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+        self.bin_edges = np.linspace(lo, hi, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.head = np.empty(0)
+
+    def update(self, samples):
+        """Aggiunge un blocco di campioni alle statistiche."""
+        n = samples.size
+        if n == 0:
+            return
+        mean = float(samples.mean(dtype=np.float64))
+        delta = np.subtract(samples, mean, dtype=np.float64)
+        m2 = float(np.dot(delta, delta))
+        self._merge_moments(n, mean, m2)
+        self.min = min(self.min, float(samples.min()))
+        self.max = max(self.max, float(samples.max()))
+        lo, hi = self.bin_edges[0], self.bin_edges[-1]
+        bins = self.counts.size
+        idx = ((samples - lo) * (bins / (hi - lo))).astype(np.int64)
+        np.clip(idx, 0, bins - 1, out=idx)
+        self.counts += np.bincount(idx, minlength=bins)
+        if self.head.size < MC_HEAD_SAMPLES:
+            self.head = np.concatenate([self.head, samples[:MC_HEAD_SAMPLES - self.head.size]])
+
+    def merge(self, other):
+        """Unisce le statistiche parziali di un altro blocco (stessi bin)."""
+        if other.count == 0:
+            return
+        self._merge_moments(other.count, other.mean, other.m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.counts += other.counts
+        if self.head.size < MC_HEAD_SAMPLES:
+            self.head = np.concatenate([self.head, other.head[:MC_HEAD_SAMPLES - self.head.size]])
+
+    def _merge_moments(self, n, mean, m2):
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    @property
+    def std(self):
+        """Deviazione standard di popolazione (come np.std)."""
+        return (self.m2 / self.count) ** 0.5 if self.count else 0.0
+
+    def quantile(self, q):
+        """Stima il quantile q (0-1) interpolando linearmente l'istogramma cumulato."""
+        if self.count == 0:
+            return float('nan')
+        cum = np.cumsum(self.counts)
+        target = q * self.count
+        i = int(np.searchsorted(cum, target, side='left'))
+        i = min(i, self.counts.size - 1)
+        prev = cum[i - 1] if i > 0 else 0
+        frac = (target - prev) / self.counts[i] if self.counts[i] else 0.0
+        value = self.bin_edges[i] + frac * (self.bin_edges[i + 1] - self.bin_edges[i])
+        return float(min(max(value, self.min), self.max))
+
+    def histogram(self, bins=50):
+        """Restituisce (conteggi, bordi) raggruppando i bin fini in `bins` bin, se divisibili."""
+        if self.counts.size % bins:
+            return self.counts, self.bin_edges
+        factor = self.counts.size // bins
+        return self.counts.reshape(bins, factor).sum(axis=1), self.bin_edges[::factor]
+
+def voltage_divider_bounds(vin, r1_nominal, tol1, r2_nominal, tol2):
+    """Range esatto di Vout con R1/R2 agli estremi della tolleranza."""
+    r1_lo, r1_hi = r1_nominal * (1 - tol1), r1_nominal * (1 + tol1)
+    r2_lo, r2_hi = r2_nominal * (1 - tol2), r2_nominal * (1 + tol2)
+    a = vin * r2_lo / (r1_hi + r2_lo)
+    b = vin * r2_hi / (r1_lo + r2_hi)
+    return min(a, b), max(a, b)
+
+def _block_rng(seed_seq, index):
+    """Generatore indipendente per il blocco `index` (equivale a seed_seq.spawn(...)[index])."""
+    child = np.random.SeedSequence(seed_seq.entropy, spawn_key=seed_seq.spawn_key + (index,))
+    return np.random.default_rng(child)
+
+def _monte_carlo_block(sampler, seed_seq, index, size, bounds):
+    """Esegue un singolo blocco e ne restituisce le statistiche parziali (eseguibile in un processo worker)."""
+    stats = MonteCarloStats(*bounds)
+    stats.update(sampler(_block_rng(seed_seq, index), size))
+    return stats
+
+def run_monte_carlo_blocks(sampler, iterations, bounds, seed=None, chunk_size=MC_CHUNK_SIZE, workers=None):
+    """
+    Esegue `iterations` campioni di `sampler(rng, size)` a blocchi e ne unisce le statistiche.
+    Ogni blocco usa il proprio flusso figlio di SeedSequence(seed) e le statistiche parziali
+    vengono unite sempre nell'ordine dei blocchi: il risultato per un dato seed è identico
+    qualunque sia il numero di `workers`. Con workers > 1 i blocchi sono distribuiti su un
+    pool di processi, con al massimo 4 blocchi in volo per worker (memoria limitata).
+    """
+    if iterations <= 0:
+        raise ValueError(MC_ITERATIONS_ERROR)
+    seed_seq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    tasks = [(index, min(chunk_size, iterations - start))
+             for index, start in enumerate(range(0, iterations, chunk_size))]
+    total = MonteCarloStats(*bounds)
+    if not workers or workers <= 1 or len(tasks) <= 1:
+        for index, size in tasks:
+            total.merge(_monte_carlo_block(sampler, seed_seq, index, size, bounds))
+        return total
+
+    # Import locale: il pool (e multiprocessing) serve solo per i calcoli paralleli
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    # spawn: la funzione è chiamata anche dalla GUI e un fork del processo Tk non è sicuro
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        pending = deque()
+        for index, size in tasks:
+            pending.append(executor.submit(_monte_carlo_block, sampler, seed_seq, index, size, bounds))
+            if len(pending) >= workers * 4:
+                total.merge(pending.popleft().result())
+        while pending:
+            total.merge(pending.popleft().result())
+    return total
+
+def run_monte_carlo_logic(vin, iterations, r1_nominal, tol1, r2_nominal, tol2, seed=None, dtype=np.float64, chunk_size=None, workers=None):
+    """
+    Simulazione Monte Carlo vettorizzata di un partitore di tensione.
+    Usa un numpy.random.Generator indipendente (riproducibile tramite `seed`)
+    e restituisce (MonteCarloResult, errore); in `samples` ci sono i campioni di Vout
+    come ndarray (float64 o float32). Con `chunk_size` i campioni sono generati a
+    blocchi e aggregati in un MonteCarloStats, che prende il posto dei campioni (memoria costante);
+    oltre MC_CHUNK_SIZE iterazioni i blocchi si usano sempre. Con `workers` > 1 i blocchi sono
+    calcolati in parallelo su più processi, con risultati identici per lo stesso seed;
+    senza blocchi `workers` non ha effetto.
+    """
     try:
-        vout_values = []
-        for _ in range(iterations):
-            r1 = r1_nominal * random.uniform(1 - tol1, 1 + tol1)
-            r2 = r2_nominal * random.uniform(1 - tol2, 1 + tol2)
-            vout = vin * r2 / (r1 + r2)
-            vout_values.append(vout)
-        vout_mean = np.mean(vout_values)
-        vout_std = np.std(vout_values)
-        vout_min = np.min(vout_values)
-        vout_max = np.max(vout_values)
+        iterations = int(iterations)
+        if iterations <= 0:
+            return None, MC_ITERATIONS_ERROR
         vout_theoretical = vin * r2_nominal / (r1_nominal + r2_nominal)
-        result = f"--- Analisi Monte Carlo per Partitore di Tensione ---\n\nSpiegazione: La simulazione Monte Carlo testa il circuito migliaia di volte, \nvariando casualmente i valori dei resistori entro la loro tolleranza. \nQuesto aiuta a prevedere il comportamento reale del circuito.\n\nParametri di simulazione:\n- R1: {format_value(r1_nominal)} ±{tol1*100:.2f}%\n- R2: {format_value(r2_nominal)} ±{tol2*100:.2f}%\n- Vin: {vin} V\n- Iterazioni: {iterations}\n\n--- Risultati Statistici ---\nVout Teorico (calcolato con valori nominali): {vout_theoretical:.4f} V\nVout Medio (risultato della simulazione): {vout_mean:.4f} V\nDeviazione Standard (σ): {vout_std:.4f} V\nRange Vout: da {vout_min:.4f} V a {vout_max:.4f} V\n"
-        return result, vout_values, vout_theoretical, None
+        # La modalità dipende solo da iterations/chunk_size, mai da `workers`:
+        # così il numero di processi non cambia né il flusso casuale né il tipo dei campioni
+        if not chunk_size and iterations > MC_CHUNK_SIZE:
+            chunk_size = MC_CHUNK_SIZE
+        if chunk_size:
+            sampler = partial(sample_voltage_divider, vin=vin, r1_nominal=r1_nominal, tol1=tol1,
+                              r2_nominal=r2_nominal, tol2=tol2, dtype=dtype)
+            bounds = voltage_divider_bounds(vin, r1_nominal, tol1, r2_nominal, tol2)
+            stats = run_monte_carlo_blocks(sampler, iterations, bounds, seed=seed, chunk_size=chunk_size, workers=workers)
+            return MonteCarloResult(vin, iterations, r1_nominal, tol1, r2_nominal, tol2, vout_theoretical,
+                                    stats.mean, stats.std, stats.min, stats.max, stats), None
+
+        rng = np.random.default_rng(seed)
+        vout_values = sample_voltage_divider(rng, iterations, vin, r1_nominal, tol1, r2_nominal, tol2, dtype=dtype)
+        return MonteCarloResult(vin, iterations, r1_nominal, tol1, r2_nominal, tol2, vout_theoretical,
+                                float(vout_values.mean(dtype=np.float64)), float(vout_values.std(dtype=np.float64)),
+                                float(vout_values.min()), float(vout_values.max()), vout_values), None
+    except Exception as e:
+        return None, f"Errore nella simulazione: {str(e)}"
+
+# --- Reti serie/parallelo generiche ---
+# Un circuito è un albero di tuple: ('R', nome), ('serie', figli) o ('parallelo', figli).
+# Nelle espressioni '+' indica la serie e '||' il parallelo, che ha precedenza maggiore:
+# "R1 + R2 || R3" equivale a "R1 + (R2 || R3)".
+
+_CIRCUIT_TOKEN = re.compile(r"\s*(\|\||\+|\(|\)|[A-Za-z_][A-Za-z0-9_]*)")
+
+def _tokenize_circuit(expression):
+    tokens, pos = [], 0
+    expression = expression.strip()
+    while pos < len(expression):
+        match = _CIRCUIT_TOKEN.match(expression, pos)
+        if not match:
+            raise ValueError(f"Carattere non valido nell'espressione alla posizione {pos + 1}: '{expression[pos:].strip()[:1]}'")
+        tokens.append(match.group(1))
+        pos = match.end()
+        while pos < len(expression) and expression[pos].isspace():
+            pos += 1
+    return tokens
+
+def parse_circuit_expression(expression):
+    """Converte un'espressione come "R1 + (R2 || R3)" nell'albero del circuito."""
+    tokens = _tokenize_circuit(expression)
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else None
+
+    def take():
+        nonlocal pos
+        token = peek()
+        pos += 1
+        return token
+
+    def parse_series():
+        children = [parse_parallel()]
+        while peek() == '+':
+            take()
+            children.append(parse_parallel())
+        return _circuit_node('serie', children)
+
+    def parse_parallel():
+        children = [parse_atom()]
+        while peek() == '||':
+            take()
+            children.append(parse_atom())
+        return _circuit_node('parallelo', children)
+
+    def parse_atom():
+        token = take()
+        if token == '(':
+            node = parse_series()
+            if take() != ')':
+                raise ValueError("Parentesi non bilanciate nell'espressione.")
+            return node
+        if token is None or token in ('+', '||', ')'):
+            raise ValueError("Espressione incompleta: atteso il nome di un resistore.")
+        return ('R', token)
+
+    if not tokens:
+        raise ValueError("L'espressione del circuito è vuota.")
+    tree = parse_series()
+    if peek() is not None:
+        raise ValueError(f"Simbolo inatteso nell'espressione: '{peek()}'")
+    return tree
+
+def _circuit_node(kind, children):
+    """Crea un nodo serie/parallelo appiattendo i figli dello stesso tipo."""
+    if len(children) == 1:
+        return children[0]
+    flat = []
+    for child in children:
+        flat.extend(child[1] if child[0] == kind else (child,))
+    return (kind, tuple(flat))
+
+def circuit_component_names(tree):
+    """Nomi dei resistori del circuito, nell'ordine in cui compaiono."""
+    if tree[0] == 'R':
+        return (tree[1],)
+    names = []
+    for child in tree[1]:
+        names.extend(n for n in circuit_component_names(child) if n not in names)
+    return tuple(names)
+
+def circuit_to_expression(tree):
+    """Rappresentazione testuale dell'albero (inversa di parse_circuit_expression)."""
+    if tree[0] == 'R':
+        return tree[1]
+    inner = " + " if tree[0] == 'serie' else " || "
+    return inner.join(circuit_to_expression(c) if c[0] == 'R' else f"({circuit_to_expression(c)})" for c in tree[1])
+
+@lru_cache(maxsize=128)
+def compile_circuit(tree):
+    """
+    Compila l'albero una sola volta in una funzione vettorizzata
+    values (dict nome -> ndarray) -> ndarray della resistenza equivalente.
+    """
+    kind = tree[0]
+    if kind == 'R':
+        name = tree[1]
+        return lambda values: values[name]
+    children = [compile_circuit(child) for child in tree[1]]
+    if kind == 'serie':
+        def evaluate_series(values):
+            total = children[0](values).copy()
+            for child in children[1:]:
+                total += child(values)
+            return total
+        return evaluate_series
+
+    def evaluate_parallel(values):
+        conductance = np.reciprocal(children[0](values))
+        for child in children[1:]:
+            conductance += np.reciprocal(child(values))
+        return np.reciprocal(conductance)
+    return evaluate_parallel
+
+def evaluate_circuit(tree, values):
+    """Resistenza equivalente del circuito per valori scalari o array."""
+    values = {name: np.asarray(v, dtype=np.float64) for name, v in values.items()}
+    return compile_circuit(tree)(values)
+
+def sample_circuit(rng, size, tree, components, dtype=np.float64):
+    """
+    Estrae `size` campioni della resistenza equivalente. `components` è una tupla
+    (nome, nominale, tolleranza) nell'ordine di estrazione.
+    """
+    values = {}
+    for name, nominal, tol in components:
+        r = rng.random(size, dtype=dtype)
+        r *= 2 * tol
+        r += 1 - tol
+        r *= nominal
+        values[name] = r
+    return compile_circuit(tree)(values)
+
+def circuit_from_rows(resistances, tolerances, conn_type):
+    """Costruisce l'espressione R1 + R2 + ... (o R1 || R2 || ...) e i componenti dalle righe della vista Serie/Parallelo (tolleranze in %)."""
+    names = [f"R{i + 1}" for i in range(len(resistances))]
+    expression = (" + " if conn_type == "serie" else " || ").join(names)
+    components = {name: (r, tol / 100) for name, r, tol in zip(names, resistances, tolerances)}
+    return expression, components
+
+def run_circuit_monte_carlo_logic(expression, components, iterations, seed=None, dtype=np.float64, chunk_size=None, workers=None):
+    """
+    Monte Carlo della resistenza equivalente di una rete serie/parallelo arbitraria.
+    `expression` è una stringa (es. "R1 + (R2 || R3)") o un albero già analizzato,
+    `components` un dict nome -> (valore nominale, tolleranza frazionaria).
+    Restituisce (CircuitMonteCarloResult, errore); `samples` contiene i campioni o un MonteCarloStats.
+    """
+    try:
+        tree = parse_circuit_expression(expression) if isinstance(expression, str) else expression
+        names = circuit_component_names(tree)
+        missing = [n for n in names if n not in components]
+        if missing:
+            return None, f"Valori mancanti per: {', '.join(missing)}"
+        ordered = tuple((n, float(components[n][0]), float(components[n][1])) for n in names)
+        iterations = int(iterations)
+        if iterations <= 0:
+            return None, MC_ITERATIONS_ERROR
+        r_nominal = float(evaluate_circuit(tree, {n: nom for n, nom, _ in ordered}))
+        r_lo = float(evaluate_circuit(tree, {n: nom * (1 - tol) for n, nom, tol in ordered}))
+        r_hi = float(evaluate_circuit(tree, {n: nom * (1 + tol) for n, nom, tol in ordered}))
+
+        # La modalità dipende solo da iterations/chunk_size, mai da `workers`:
+        # così il numero di processi non cambia né il flusso casuale né il tipo dei campioni
+        if not chunk_size and iterations > MC_CHUNK_SIZE:
+            chunk_size = MC_CHUNK_SIZE
+        if chunk_size:
+            sampler = partial(sample_circuit, tree=tree, components=ordered, dtype=dtype)
+            stats = run_monte_carlo_blocks(sampler, iterations, (r_lo, r_hi), seed=seed, chunk_size=chunk_size, workers=workers)
+            samples = stats
+            r_mean, r_std, r_min, r_max = stats.mean, stats.std, stats.min, stats.max
+        else:
+            samples = sample_circuit(np.random.default_rng(seed), iterations, tree, ordered, dtype=dtype)
+            r_mean, r_std = float(samples.mean(dtype=np.float64)), float(samples.std(dtype=np.float64))
+            r_min, r_max = float(samples.min()), float(samples.max())
+
+        return CircuitMonteCarloResult(circuit_to_expression(tree), ordered, iterations, r_nominal,
+                                       r_mean, r_std, r_min, r_max, r_lo, r_hi, samples), None
     except Exception as e:
-        return None, None, None, f"Errore nella simulazione: {str(e)}"
+        return None, f"Errore nella simulazione: {str(e)}"
 
-def design_voltage_divider_logic(vin, vout_target, e_series_values=None, custom_values=None):
+def top_n_indices(errors, n, tie_keys=()):
+    """
+    Indici degli `n` errori più piccoli in ordine crescente, senza ordinare tutto l'array
+    (preselezione con np.partition). A parità di errore decidono, nell'ordine, le chiavi
+    in `tie_keys` (array della stessa lunghezza).
+    """
+    errors = np.asarray(errors)
+    if errors.size > n:
+        kth = np.partition(errors, n - 1)[n - 1]
+        candidates = np.flatnonzero(errors <= kth)
+    else:
+        candidates = np.arange(errors.size)
+    keys = tuple(np.asarray(key)[candidates] for key in reversed(tie_keys)) + (errors[candidates],)
+    return candidates[np.lexsort(keys)[:n]]
+
+@memoize()
+def design_voltage_divider_logic(vin, vout_target, e_series_values=None, custom_values=None, backend="search"):
     """
     Trova le migliori coppie di resistori per un partitore di tensione.
     Supporta serie E o una lista personalizzata (BOM).
+    Con backend="table" le serie E usano la tabella persistente dei rapporti
+    (divider_tables), costruita al primo uso e poi aperta in memory-map.
     """
     if vin <= 0 or vout_target <= 0 or vout_target >= vin:
         return None, "Vin deve essere > 0, Vout deve essere > 0 e Vin > Vout."
 
     target_ratio = vout_target / vin
-    best_pairs = []
+    empty = np.empty(0)
+    r1_best = r2_best = vout_best = error_best = empty
 
     # Genera i valori disponibili
     commercial_values = []
     if custom_values:
         commercial_values = custom_values
     elif e_series_values:
-        for decade in range(-1, 7):  # da 0.1 a 10M ohm
-            for base_val in e_series_values:
-                commercial_values.append(base_val * (10**decade))
-
-    # Itera su tutte le coppie possibili
-    for r1 in commercial_values:
-        for r2 in commercial_values:
-            # Evita divisione per zero e coppie identiche se non necessario
-            if r1 == 0 or r2 == 0:
-                continue
-
-            actual_ratio = r2 / (r1 + r2)
-            error = abs((actual_ratio - target_ratio) / target_ratio) * 100
-
-            # Salva le N migliori coppie
-            if len(best_pairs) < 10 or error < best_pairs[-1]['error']:
-                best_pairs.append({
-                    'r1': r1,
-                    'r2': r2,
-                    'vout_actual': vin * actual_ratio,
-                    'error': error
-                })
-                # Mantieni la lista ordinata per errore e limitata a 10 elementi
-                best_pairs.sort(key=lambda x: x['error'])
-                if len(best_pairs) > 10:
-                    best_pairs.pop()
-
-    # Formatta il risultato per la visualizzazione
-    if not best_pairs:
+        commercial_values = series_value_index(e_series_values, decades=(-1, 7))  # da 0.1 a 10M ohm
+
+    values = np.asarray(commercial_values, dtype=np.float64)
+    values = values[values != 0]
+    if values.size and backend == "table" and not custom_values:
+        table = load_divider_table(values)
+        i, j, error_best = query_divider_table(table, target_ratio, top=10)
+        r1_best, r2_best = values[i], values[j]
+        vout_best = vin * (r2_best / (r1_best + r2_best))
+    elif values.size:
+        # Per ogni R1 l'R2 ideale è r1·k/(1−k): il rapporto cresce con R2, quindi le
+        # migliori coppie per quell'R1 stanno tra i TOP vicini da ciascun lato (ricerca binaria).
+        top = 10
+        sorted_pos = np.argsort(values, kind='stable')
+        sorted_values = values[sorted_pos]
+        r2_ideal = values * target_ratio / (1 - target_ratio)
+        j = np.searchsorted(sorted_values, r2_ideal)[:, None] + np.arange(-top, top)
+        valid = (j >= 0) & (j < values.size)
+        i = np.broadcast_to(np.arange(values.size)[:, None], j.shape)[valid]
+        j = sorted_pos[j[valid]]
+        r1, r2 = values[i], values[j]
+        actual_ratio = r2 / (r1 + r2)
+        errors = np.abs((actual_ratio - target_ratio) / target_ratio) * 100
+        # A parità di errore vale l'ordine di scansione originale (prima R1, poi R2)
+        best = top_n_indices(errors, top, tie_keys=(i, j))
+        r1_best, r2_best, error_best = r1[best], r2[best], errors[best]
+        vout_best = vin * actual_ratio[best]
+
+    if r1_best.size == 0:
         msg = "Nessuna combinazione trovata."
         if custom_values: msg += " La BOM caricata non ha abbastanza valori compatibili."
         else: msg += " Prova a cambiare la serie E."
         return None, msg
 
-    source_name = "BOM Personalizzata" if custom_values else "Serie E"
-    result = f"--- Progettazione Partitore di Tensione ---\n"
-    result += f"Sorgente Valori: {source_name}\n\n"
-    result += f"Obiettivo: Vin={vin}V, Vout={vout_target:.3f}V (Rapporto: {target_ratio:.4f})\n"
-    result += "Migliori 10 coppie di resistori trovate:\n\n"
-    result += "{:<15} {:<15} {:<15} {:<10}\n".format("R1", "R2", "Vout Reale", "Errore")
-    result += "-"*55 + "\n"
-
-    for pair in best_pairs:
-        result += "{:<15} {:<15} {:<15.3f} {:<10.2f}%\n".format(
-            format_value(pair['r1']),
-            format_value(pair['r2']),
-            pair['vout_actual'],
-            pair['error']
-        )
-
-    result += "\nSpiegazione: Sono state testate tutte le combinazioni di resistori della serie E scelta per trovare quelle che minimizzano l'errore sul rapporto Vout/Vin."
-
-    return result, None
+    return DividerResult(vin, vout_target, bool(custom_values), r1_best, r2_best, vout_best, error_best), None
 
 def find_best_commercial_value(target_value, series_values=None, custom_values=None):
     """
@@ -360,18 +785,176 @@ def find_best_commercial_value(target_value, series_values=None, custom_values=N
                 best_match['error'] = error
         return best_match
 
-    # Comportamento standard con serie E
+    # Comportamento standard con serie E: ricerca binaria sull'indice precalcolato
     if series_values:
-        for decade in range(-2, 8):  # da 0.01 a 100M
-            for base in series_values:
-                value = base * (10**decade)
-                error = abs((value - target_value) / target_value) * 100
-                if error < best_match['error']:
-                    best_match['value'] = value
-                    best_match['error'] = error
+        values = series_value_index(series_values)
+        pos = nearest_index(values, target_value)
+        best_match['value'] = float(values[pos])
+        best_match['error'] = abs((best_match['value'] - target_value) / target_value) * 100
     
     return best_match
 
+def snap_to_series(values, series=None, mode="nearest", k=1, custom_values=None):
+    """
+    Versione vettorizzata di find_best_commercial_value per interi array di valori.
+    `series` può essere il nome di una serie E ("E24") o la lista dei valori base;
+    se `custom_values` (es. BOM) è fornito si cerca solo in quelli.
+    `mode`: "nearest" (errore relativo minimo), "floor" (valore <= target) o "ceil" (>= target).
+    Restituisce (valori scelti, errori %, candidati) dove `candidati` ha forma (n, k)
+    e contiene i k valori migliori per ogni target (NaN dove non disponibili).
+    """
+    if custom_values is not None and len(custom_values):
+        available = np.unique(np.asarray(custom_values, dtype=np.float64))
+    else:
+        if isinstance(series, str):
+            series = e_series[series]
+        available = series_value_index(series)
+    if mode not in ("nearest", "floor", "ceil"):
+        raise ValueError(f"Modalità non valida: {mode}")
+
+    targets = np.atleast_1d(np.asarray(values, dtype=np.float64))
+    m = len(available)
+    k = max(int(k), 1)
+    if mode == "nearest":
+        idx = np.searchsorted(available, targets)[:, None] + np.arange(-k, k)
+    elif mode == "floor":
+        idx = np.searchsorted(available, targets, side='right')[:, None] - 1 - np.arange(k)
+    else:
+        idx = np.searchsorted(available, targets, side='left')[:, None] + np.arange(k)
+    valid = (idx >= 0) & (idx < m)
+    candidates = available[np.clip(idx, 0, max(m - 1, 0))] if m else np.full(idx.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        errors = np.abs((candidates - targets[:, None]) / targets[:, None]) * 100
+    candidates = np.where(valid, candidates, np.nan)
+    errors = np.where(valid, errors, np.inf)
+    if mode == "nearest":
+        # Ordinamento stabile: a parità di errore resta prima il valore più basso
+        order = np.argsort(errors, axis=1, kind='stable')[:, :k]
+        candidates = np.take_along_axis(candidates, order, axis=1)
+        errors = np.take_along_axis(errors, order, axis=1)
+    errors = np.where(np.isnan(candidates), np.nan, errors)
+    return candidates[:, 0], errors[:, 0], candidates
+
+# --- Sintesi di un valore con 2 o 3 resistori ---
+# Topologie: codice -> (numero di parti, formato del testo)
+SYNTH_TOPOLOGIES = {
+    0: (1, "{a}"),
+    1: (2, "{a} + {b}"),
+    2: (2, "{a} || {b}"),
+    3: (3, "{a} + {b} + {c}"),
+    4: (3, "{a} || {b} || {c}"),
+    5: (3, "{a} + ({b} || {c})"),
+    6: (3, "{a} || ({b} + {c})"),
+}
+
+@lru_cache(maxsize=8)
+def _pair_tables(values_bytes):
+    """
+    Tabelle delle coppie (i <= j) ordinate per somma e per conduttanza,
+    calcolate una volta per insieme di valori.
+    """
+    values = np.frombuffer(values_bytes, dtype=np.float64)
+    i, j = np.triu_indices(values.size)
+    sums = values[i] + values[j]
+    by_sum = np.argsort(sums, kind='stable')
+    conductances = 1 / values[i] + 1 / values[j]
+    by_g = np.argsort(conductances, kind='stable')
+    return (sums[by_sum], i[by_sum], j[by_sum]), (conductances[by_g], i[by_g], j[by_g])
+
+def _window(sorted_values, targets, width):
+    """Posizioni dei `width` vicini per lato di ogni target (righe) e maschera di validità."""
+    pos = np.searchsorted(sorted_values, targets)[:, None] + np.arange(-width, width)
+    valid = (pos >= 0) & (pos < sorted_values.size)
+    return np.clip(pos, 0, max(sorted_values.size - 1, 0)), valid
+
+@memoize()
+def synthesize_resistance_logic(target, series_values=None, custom_values=None, max_parts=3, top_n=10):
+    """
+    Cerca le migliori combinazioni di 1, 2 o 3 resistori (serie, parallelo o miste)
+    che approssimano `target`, usando i valori della serie E o della BOM.
+    Ricerca meet-in-the-middle: le coppie sono precalcolate e ordinate per somma e per
+    conduttanza, così per ogni terzo resistore basta una ricerca binaria del resto.
+    """
+    try:
+        if target <= 0:
+            return None, "Il valore da sintetizzare deve essere maggiore di zero."
+        if custom_values:
+            values = np.unique(np.asarray(custom_values, dtype=np.float64))
+        elif series_values:
+            values = np.asarray(series_value_index(series_values, decades=(-1, 7)))
+        else:
+            return None, "Nessun valore resistivo fornito."
+        values = values[values > 0]
+        if values.size == 0:
+            return None, "Nessun valore resistivo fornito."
+
+        (sums, sum_i, sum_j), (conds, cond_i, cond_j) = _pair_tables(values.tobytes())
+        n = values.size
+        every = np.arange(n)
+        found = []  # (codice, a, b, c, valore) per ogni famiglia di candidati
+
+        def add(code, a, b, c, value, valid):
+            found.append((np.full(valid.sum(), code), a[valid], b[valid], c[valid], value[valid]))
+
+        pos, valid = _window(values, np.array([target]), top_n)
+        none = np.full(pos.shape, -1)
+        add(0, pos, none, none, values[pos], valid)
+        if max_parts >= 2:
+            pos, valid = _window(sums, np.array([target]), top_n)
+            add(1, sum_i[pos], sum_j[pos], none, sums[pos], valid)
+            pos, valid = _window(conds, np.array([1 / target]), top_n)
+            add(2, cond_i[pos], cond_j[pos], none, 1 / conds[pos], valid)
+        if max_parts >= 3:
+            a = np.broadcast_to(every[:, None], (n, 2 * top_n))
+            with np.errstate(divide='ignore'):
+                rest_r = target - values              # resto in serie: a + (coppia)
+                rest_g = 1 / target - 1 / values      # resto in parallelo: a || (coppia)
+                ok_r = (rest_r > 0)[:, None]
+                ok_g = (rest_g > 0)[:, None]
+                # a + b + c
+                pos, valid = _window(sums, rest_r, top_n)
+                add(3, a, sum_i[pos], sum_j[pos], values[a] + sums[pos], valid & ok_r)
+                # a || b || c
+                pos, valid = _window(conds, rest_g, top_n)
+                add(4, a, cond_i[pos], cond_j[pos], 1 / (1 / values[a] + conds[pos]), valid & ok_g)
+                # a + (b || c)
+                pos, valid = _window(conds, 1 / np.where(rest_r > 0, rest_r, np.inf), top_n)
+                add(5, a, cond_i[pos], cond_j[pos], values[a] + 1 / conds[pos], valid & ok_r)
+                # a || (b + c)
+                pos, valid = _window(sums, 1 / np.where(rest_g > 0, rest_g, np.inf), top_n)
+                add(6, a, sum_i[pos], sum_j[pos], 1 / (1 / values[a] + 1 / sums[pos]), valid & ok_g)
+
+        codes, part_a, part_b, part_c, achieved = (np.concatenate(col) for col in zip(*found))
+        errors = np.abs((achieved - target) / target) * 100
+        parts = np.array([SYNTH_TOPOLOGIES[code][0] for code in range(len(SYNTH_TOPOLOGIES))])[codes]
+        # A parità di errore si preferiscono meno componenti
+        order = np.lexsort((parts, errors))
+
+        best, seen = [], set()
+        for k in order:
+            code = int(codes[k])
+            a, b, c = int(part_a[k]), int(part_b[k]), int(part_c[k])
+            # La stessa combinazione può emergere da più ricerche: chiave canonica
+            key = (code, tuple(sorted((a, b, c)))) if code in (3, 4) else (code, a, b, c)
+            if key in seen:
+                continue
+            seen.add(key)
+            best.append(k)
+            if len(best) == top_n:
+                break
+
+        best = np.array(best, dtype=np.intp)
+        idx = np.column_stack((part_a[best], part_b[best], part_c[best]))
+        parts_used = np.where(idx >= 0, values[idx], np.nan)
+        # Serie e parallelo puri sono commutativi: parti in ordine crescente (NaN in coda)
+        pure = np.isin(codes[best], (3, 4))
+        parts_used[pure] = np.sort(parts_used[pure], axis=1)
+        return SynthesisResult(target, bool(custom_values), n, max_parts, codes[best],
+                               parts_used, achieved[best], errors[best]), None
+    except Exception as e:
+        return None, f"Errore nella sintesi: {str(e)}"
+
+@memoize()
 def calculate_led_resistor_logic(v_supply, v_led, i_led, e_series_values=None, package_power=None, custom_values=None):
     """
     Calcola il resistore per un LED, suggerisce un valore commerciale e un package.
@@ -385,15 +968,15 @@ def calculate_led_resistor_logic(v_supply, v_led, i_led, e_series_values=None, p
     r_ideal = (v_supply - v_led) / (i_led / 1000.0)  # i_led è in mA
 
     # 2. Trova il valore commerciale più vicino
-    best_match = find_best_commercial_value(r_ideal, series_values=e_series_values, custom_values=custom_values)
-    r_commercial = best_match['value']
+    matched, errors, _ = snap_to_series(r_ideal, e_series_values, custom_values=custom_values)
+    r_commercial = float(matched[0])
 
     # 3. Calcolo della potenza dissipata con il valore commerciale
     i_actual = (v_supply - v_led) / r_commercial
     power_dissipated = (v_supply - v_led) * i_actual
 
     # 4. Raccomandazione del package
-    recommended_package = "Nessuno (potenza troppo elevata)"
+    recommended_package, recommended_power = None, None
     safety_factor = 2.0  # Fattore di sicurezza minimo del 200%
 
     # Ordina i package per potenza crescente
@@ -401,105 +984,69 @@ def calculate_led_resistor_logic(v_supply, v_led, i_led, e_series_values=None, p
 
     for pkg_name, pkg_power in sorted_packages:
         if pkg_power >= (power_dissipated * safety_factor):
-            recommended_package = f"{pkg_name} ({pkg_power}W)"
+            recommended_package, recommended_power = pkg_name, pkg_power
             break
 
-    # Formattazione del risultato
-    source_name = "BOM Personalizzata" if custom_values else "Serie E"
-    result = f"--- Calcolo Resistore per LED ---\n"
-    result += f"Sorgente Valori: {source_name}\n\n"
-    result += f"Parametri di Input:\n"
-    result += f"- Tensione di Alimentazione: {v_supply} V\n"
-    result += f"- Tensione di Caduta LED (Vf): {v_led} V\n"
-    result += f"- Corrente LED (If): {i_led} mA\n\n"
-
-    result += f"--- Risultati ---\n"
-    result += f"1. Valore Resistore Ideale: {format_value(r_ideal)}\n"
-    result += f"2. Valore Commerciale più Vicino: {format_value(r_commercial)} (Errore: {best_match['error']:.2f}%)\n"
-    result += f"   - Corrente Reale con questo resistore: {i_actual*1000:.2f} mA\n"
-    result += f"3. Potenza Dissipata dal Resistore: {power_dissipated:.4f} W\n"
-    result += f"4. Package Raccomandato (con fattore di sicurezza >{safety_factor:.0f}x): {recommended_package}\n\n"
-
-    result += "Spiegazione:\n"
-    result += "Il resistore limita la corrente che scorre nel LED. Il valore commerciale è stato scelto dalla serie E selezionata. La potenza dissipata determina la dimensione fisica (package) del resistore necessaria per operare in sicurezza."
-
-    return result, None
+    return LedResult(v_supply, v_led, i_led, bool(custom_values), r_ideal, r_commercial, float(errors[0]),
+                     i_actual, power_dissipated, recommended_package, recommended_power, safety_factor), None
 
+@memoize()
 def design_rc_filter_logic(f_c_target, r_series_values=None, c_series_values=None, custom_values=None):
     """
     Trova le migliori coppie R/C per un filtro passa-basso.
+    Per ogni resistore il condensatore ideale viene confrontato, in scala logaritmica,
+    con i vicini nella serie ordinata dei condensatori (ricerca binaria vettorizzata).
     """
     if f_c_target <= 0:
         return None, "La frequenza di taglio deve essere maggiore di zero."
 
-    best_pairs = []
-
     # Genera i valori disponibili per i resistori
-    commercial_resistors = []
     if custom_values:
-        commercial_resistors = custom_values
+        commercial_resistors = np.asarray(custom_values, dtype=np.float64)
     elif r_series_values:
-        for decade in range(0, 7):  # 1 ohm a 10M ohm
-            for base_val in r_series_values:
-                commercial_resistors.append(base_val * (10**decade))
+        commercial_resistors = series_value_index(r_series_values, decades=(0, 7))  # 1 ohm a 10M ohm
     else:
         return None, "Nessun valore resistivo fornito."
+    commercial_resistors = commercial_resistors[commercial_resistors > 0]
+
+    # Valori commerciali ordinati dei condensatori, da 1pF a 1uF
+    if c_series_values is None:
+        c_series_values = capacitor_e_series['E12']
+    commercial_capacitors = series_value_index(c_series_values, decades=(-12, -4))
+
+    if commercial_resistors.size and commercial_capacitors.size:
+        # Condensatore ideale per ogni resistore, calcolato in un colpo solo
+        c_ideal = 1 / (2 * np.pi * commercial_resistors * f_c_target)
+
+        # Condensatore commerciale più vicino in scala logaritmica (rapporto minimo)
+        pos = np.searchsorted(commercial_capacitors, c_ideal)
+        lower = commercial_capacitors[np.clip(pos - 1, 0, commercial_capacitors.size - 1)]
+        upper = commercial_capacitors[np.clip(pos, 0, commercial_capacitors.size - 1)]
+        best_c = np.where(c_ideal / lower <= upper / c_ideal, lower, upper)
+
+        # Frequenza reale ed errore per tutte le coppie
+        f_c_actual = 1 / (2 * np.pi * commercial_resistors * best_c)
+        errors = np.abs((f_c_actual - f_c_target) / f_c_target) * 100
+
+        # Le 15 migliori coppie (a parità di errore, nell'ordine dei resistori)
+        best = top_n_indices(errors, 15, tie_keys=(np.arange(errors.size),))
+        if best.size:
+            return RcFilterResult(f_c_target, bool(custom_values), commercial_resistors[best], best_c[best],
+                                  f_c_actual[best], errors[best]), None
 
-    # Genera un range di valori commerciali per i condensatori
-    commercial_capacitors = []
-    for decade in range(-12, -4):  # 1pF a 1uF
-        for base_val in c_series_values:
-            commercial_capacitors.append(base_val * (10**decade))
-
-    # Itera sui resistori e trova il miglior condensatore per ciascuno
-    for r in commercial_resistors:
-        # Calcola il condensatore ideale per questo resistore
-        c_ideal = 1 / (2 * np.pi * r * f_c_target)
-
-        # Trova il condensatore commerciale più vicino
-        best_c = min(commercial_capacitors, key=lambda c: abs(c - c_ideal))
-
-        # Calcola la frequenza reale e l'errore
-        f_c_actual = 1 / (2 * np.pi * r * best_c)
-        error = abs((f_c_actual - f_c_target) / f_c_target) * 100
-
-        # Salva le N migliori coppie
-        if len(best_pairs) < 15 or error < best_pairs[-1]['error']:
-            best_pairs.append({
-                'r': r,
-                'c': best_c,
-                'f_c_actual': f_c_actual,
-                'error': error
-            })
-            best_pairs.sort(key=lambda x: x['error'])
-            if len(best_pairs) > 15:
-                best_pairs.pop()
-
-    if not best_pairs:
-        return None, "Nessuna combinazione R/C trovata."
-
-    source_name = "BOM Personalizzata" if custom_values else "Serie E"
-    result = f"--- Progettazione Filtro RC Passa-Basso ---\n"
-    result += f"Sorgente Resistori: {source_name}\n\n"
-    result += f"Obiettivo Frequenza di Taglio (fc): {format_value(f_c_target, unit='Hz')}\n"
-    result += "Migliori 15 combinazioni R/C trovate:\n\n"
-    result += "{:<15} {:<15} {:<20} {:<10}\n".format("Resistore", "Condensatore", "fc Reale", "Errore")
-    result += "-"*65 + "\n"
-
-    for pair in best_pairs:
-        result += "{:<15} {:<15} {:<20} {:<10.2f}%\n".format(
-            format_value(pair['r']),
-            format_value(pair['c'], unit='F'),
-            format_value(pair['f_c_actual'], unit='Hz'),
-            pair['error']
-        )
-
-    result += "\nSpiegazione: Per ogni resistore della serie E, è stato trovato il condensatore (anch'esso da una serie E) che minimizza l'errore sulla frequenza di taglio."
-    return result, None
-
-def calculate_regulator_logic(vin, vout_target, regulator_name, e_series_values=None, custom_values=None):
+    return None, "Nessuna combinazione R/C trovata."
+
+
+# Corrente massima in R1 considerata ragionevole (oltre si spreca corrente di riposo)
+REGULATOR_R1_MAX_CURRENT_MA = 20.0
+
+@memoize()
+def calculate_regulator_logic(vin, vout_target, regulator_name, e_series_values=None, custom_values=None, top_n=10, r1_current_ma=None):
     """
     Calcola le coppie R1/R2 per un regolatore lineare (es. LM317).
+    Valuta tutte le coppie R1×R2 della serie scelta (o della BOM) con il modello
+    Vout = Vref·(1 + R2/R1) + Iadj·R2, limitando R1 alla finestra di corrente
+    `r1_current_ma` = (min, max) in mA: il minimo garantisce il carico minimo del regolatore.
     """
     if regulator_name not in regulator_specs:
         return None, "Regolatore non supportato."
@@ -507,50 +1054,41 @@ def calculate_regulator_logic(vin, vout_target, regulator_name, e_series_values=
     spec = regulator_specs[regulator_name]
     vref = spec['vref']
     iadj = spec['iadj_ua'] / 1e6
-    r1_val = spec['r1_recommended']
 
     if abs(vout_target) < abs(vref):
         return None, f"La tensione target ({vout_target}V) deve essere maggiore della Vref ({vref}V)."
 
-    best_pairs = []
-    
-    # Testiamo diversi valori di R1 intorno a quello consigliato
-    for r1 in [r1_val, 120, 240, 330, 470]:
-        # Formule basate su segno di Vref (regolatori positivi o negativi)
-        # Vout = Vref * (1 + R2/R1) + Iadj * R2
-        # Resolvendo per R2: R2 = (Vout - Vref) / (Vref/R1 + Iadj)
-        try:
-            target_r2 = (abs(vout_target) - abs(vref)) / (abs(vref)/r1 + iadj)
-            if target_r2 < 0: continue
-            
-            best_r2_match = find_best_commercial_value(target_r2, e_series_values)
-            r2_commercial = best_r2_match['value']
-            
-            vout_actual = vref * (1 + r2_commercial/r1) + (iadj * r2_commercial if vref > 0 else -iadj * r2_commercial)
-            error = abs((vout_actual - vout_target) / vout_target) * 100
-            
-            best_pairs.append({
-                'r1': r1,
-                'r2': r2_commercial,
-                'vout': vout_actual,
-                'error': error
-            })
-        except ZeroDivisionError:
-            continue
-
-    best_pairs.sort(key=lambda x: x['error'])
-    
-    result = f"--- Progettazione Regolatore {regulator_name} ---\n\n"
-    result += f"Obiettivo: Vout = {vout_target}V (Vref = {vref}V)\n\n"
-    result += "{:<10} {:<10} {:<15} {:<10}\n".format("R1", "R2", "Vout Reale", "Errore")
-    result += "-"*50 + "\n"
-    for p in best_pairs[:5]:
-        result += "{:<10} {:<10} {:<15.3f} {:<10.2f}%\n".format(
-            format_value(p['r1']), format_value(p['r2']), p['vout'], p['error']
-        )
-    
-    return result, None
+    i_min_ma, i_max_ma = r1_current_ma or (spec['i_load_min_ma'], REGULATOR_R1_MAX_CURRENT_MA)
 
+    # Valori disponibili: BOM caricata o serie E espansa sulle decadi
+    if custom_values:
+        values = np.unique(np.asarray(custom_values, dtype=np.float64))
+    else:
+        values = series_value_index(e_series_values or e_series["E24"])
+    values = values[values > 0]
+
+    # R1 fissa la corrente nel partitore (|Vref|/R1): deve stare nella finestra richiesta
+    r1_current_ma_values = abs(vref) / values * 1000
+    r1 = values[(r1_current_ma_values >= i_min_ma) & (r1_current_ma_values <= i_max_ma)]
+    if r1.size == 0:
+        return None, (f"Nessun valore di R1 fornisce una corrente tra {i_min_ma} mA e {i_max_ma} mA "
+                      f"(R1 tra {format_value(abs(vref) / i_max_ma * 1000)} e {format_value(abs(vref) / i_min_ma * 1000)}).")
+
+    # Tutte le coppie R1×R2 in forma vettorizzata
+    # Formule basate su segno di Vref (regolatori positivi o negativi)
+    r1_grid = r1[:, None]
+    r2_grid = values[None, :]
+    vout_actual = vref * (1 + r2_grid / r1_grid) + (iadj * r2_grid if vref > 0 else -iadj * r2_grid)
+    errors = np.abs((vout_actual - vout_target) / vout_target) * 100
+
+    # Classifica delle migliori coppie (a parità di errore, R1 e poi R2 crescenti)
+    best = top_n_indices(errors.ravel(), top_n, tie_keys=(np.arange(errors.size),))
+    i, j = np.divmod(best, values.size)
+    return RegulatorResult(regulator_name, vref, spec['iadj_ua'], vout_target, bool(custom_values),
+                           i_min_ma, i_max_ma, r1.size, values.size, r1[i], values[j], vout_actual[i, j],
+                           abs(vref) / r1[i] * 1000, errors[i, j]), None
+
+@memoize()
 def calculate_current_divider_logic(i_total, resistances):
     """
     Calcola la corrente in ogni ramo di un ripartitore di corrente.
@@ -562,28 +1100,15 @@ def calculate_current_divider_logic(i_total, resistances):
         g_total = sum(1/r for r in resistances)
         v_equiv = i_total / g_total
         
-        result = "--- Analisi Ripartitore di Corrente ---\n\n"
-        result += f"Corrente Totale: {i_total} A\n\n"
-        result += "{:<10} {:<15} {:<15}\n".format("Ramo", "Resistenza", "Corrente")
-        result += "-"*40 + "\n"
-        
-        for i, r in enumerate(resistances):
-            i_branch = v_equiv / r
-            result += "R{:<9} {:<15} {:<15.4f} A\n".format(i+1, format_value(r), i_branch)
-            
-        return result, None
+        currents = np.array([v_equiv / r for r in resistances])
+        return CurrentDividerResult(i_total, np.asarray(resistances), currents), None
     except ZeroDivisionError:
         return None, "La resistenza non può essere zero."
 
 def convert_awg_logic(awg_val):
     if awg_val in awg_table:
         data = awg_table[awg_val]
-        result = f"--- Dati Cavo AWG {awg_val} ---\n\n"
-        result += f"- Diametro: {data['diameter_mm']} mm\n"
-        result += f"- Sezione: {data['area_mm2']} mm²\n"
-        result += f"- Resistenza: {data['res_ohm_km']} Ω/km\n"
-        result += f"- Corrente Max (indicativa): {data['max_amp']} A\n"
-        return result, None
+        return AwgResult(awg_val, data['diameter_mm'], data['area_mm2'], data['res_ohm_km'], data['max_amp']), None
     else:
         return None, "Valore AWG non in tabella (supportati 10-30)."
 
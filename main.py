@@ -1,12 +1,16 @@
 
-import tkinter as tk
+import argparse
+import importlib
+import sys
 import traceback
-from gui import ElectronicTool
 
-def main():
+def run_gui():
     """
     Main function to initialize and run the Electronic Tool application.
     """
+    # Import locali: i comandi headless non devono caricare tkinter né matplotlib
+    import tkinter as tk
+    from gui import ElectronicTool
     try:
         root = tk.Tk()
         app = ElectronicTool(root)
@@ -18,5 +22,30 @@ def main():
         # Re-raise the exception to make it visible in the console as well
         raise
 
+# Comandi headless: nome -> (modulo, descrizione). Il modulo (e quindi numpy, asyncio...)
+# si importa solo se il comando è stato scelto, così l'avvio della GUI resta leggero.
+COMMANDS = {
+    "batch": ("batch", "Esegue un file di job JSONL/CSV senza interfaccia grafica"),
+    "serve": ("server", "Avvia il servizio HTTP/JSON locale (solo 127.0.0.1)"),
+    "inventory": ("bom_inventory", "Inventario dei valori di tutte le BOM di una cartella (CSV)"),
+}
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = argparse.ArgumentParser(description="Resistor Tool: senza argomenti avvia l'interfaccia grafica.")
+    commands = parser.add_subparsers(dest="command")
+    chosen = None
+    for name, (module_name, help_text) in COMMANDS.items():
+        command_parser = commands.add_parser(name, help=help_text)
+        if argv and argv[0] == name:
+            chosen = importlib.import_module(module_name)
+            getattr(chosen, f"add_{name}_arguments")(command_parser)
+    args = parser.parse_args(argv)
+
+    if chosen is not None:
+        return getattr(chosen, f"{args.command}_main")(args)
+    run_gui()
+    return 0
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,230 @@
+
+# Report testuali (in italiano) per gli oggetti risultato di results.py.
+# La GUI chiama render_report(risultato); i chiamanti batch usano direttamente i numeri.
+from functools import singledispatch
+import numpy as np
+from resistor_lib import derating_start_temp_c
+from units import format_value, format_values
+from logic import MonteCarloStats, SYNTH_TOPOLOGIES
+from results import (
+    SmdDecodeResult, PowerResult, ColorCodeResult, ColorMatchResult,
+    SeriesParallelResult, OptimizationResult, MonteCarloResult, CircuitMonteCarloResult,
+    DividerResult, SynthesisResult, LedResult, RcFilterResult, RegulatorResult,
+    CurrentDividerResult, AwgResult
+)
+
+def _source_name(from_bom):
+    return "BOM Personalizzata" if from_bom else "Serie E"
+
+@singledispatch
+def render_report(result):
+    """Testo del report per un oggetto risultato di logic.py."""
+    raise TypeError(f"Nessun report per {type(result).__name__}")
+
+@render_report.register
+def _(result: SmdDecodeResult):
+    code = result.code
+    if result.code_type == "eia96":
+        value_code, multiplier_char = code[:2], code[2]
+        text = f"--- Decodifica Codice EIA-96 ---\n\nCodice Inserito: {code}\n"
+        text += f"Spiegazione:\n"
+        text += f"- Le prime due cifre '{value_code}' corrispondono al valore base: {result.base_value}.\n"
+        text += f"- La lettera '{multiplier_char}' corrisponde a un moltiplicatore: x{result.multiplier}.\n\n"
+        text += f"Calcolo: {result.base_value} × {result.multiplier} = {result.value}\n"
+        text += f"Valore Calcolato: {format_value(result.value)}"
+        return text
+
+    text = f"--- Decodifica Codice SMD Standard ---\n\nCodice Inserito: {code}\n"
+    if 'R' in code:
+        integer, decimal = code.split('R')
+        text += f"Spiegazione: La 'R' rappresenta il punto decimale. Valore: {integer}.{decimal}Ω.\n"
+    elif len(code) == 3:
+        text += f"Spiegazione: Le prime due cifre ({code[:2]}) sono la mantissa, la terza ({code[2]}) è il moltiplicatore (10^{code[2]}).\n"
+    else:
+        text += f"Spiegazione: Le prime tre cifre ({code[:3]}) sono la mantissa, la quarta ({code[3]}) è il moltiplicatore (10^{code[3]}).\n"
+    text += f"\nValore Calcolato: {format_value(result.value)}"
+    return text
+
+@render_report.register
+def _(result: PowerResult):
+    avg_power, derated_power, ambient_temp = result.power, result.derated_power, result.ambient_temp
+    text = f"--- Analisi Potenza e Derating Termico ---\n\n"
+    text += f"Potenza dissipata calcolata: {avg_power:.4f} W\n\n"
+    text += f"--- Valutazione Package: {result.package_name} ---\n"
+    text += f"Potenza Nominale Package (a 25°C): {result.package_power} W\n"
+    text += f"Temperatura Ambiente Impostata: {ambient_temp}°C\n\n"
+    text += f"--- Analisi Derating ---\n"
+    text += f"La potenza massima di un resistore diminuisce con la temperatura. \n"
+    text += f"(Modello usato: derating lineare a partire da {derating_start_temp_c}°C)\n"
+    text += f"Potenza Massima Reale a {ambient_temp}°C: {derated_power:.4f} W\n\n"
+
+    text += f"--- Raccomandazioni ---\n"
+    if avg_power > derated_power:
+        text += f"✗ CRITICO: La potenza dissipata ({avg_power:.4f}W) supera la potenza massima del package alla temperatura di lavoro ({derated_power:.4f}W). Rischio di guasto imminente! Scegli un package più grande."
+    else:
+        safety_factor = result.safety_factor
+        text += f"Fattore di Sicurezza (reale, a {ambient_temp}°C): {safety_factor:.1f}x\n"
+        if safety_factor >= 2.0:
+            text += "✓ OTTIMO: Il componente lavora in un regime di sicurezza eccellente."
+        elif safety_factor >= 1.5:
+            text += "✓ BUONO: Il componente ha un margine di sicurezza adeguato per la maggior parte delle applicazioni."
+        else:
+            text += "⚠ ATTENZIONE: Margine di sicurezza ridotto. Il componente potrebbe surriscaldarsi in condizioni di stress o scarsa ventilazione. Valuta un package superiore per una maggiore affidabilità."
+    return text
+
+@render_report.register
+def _(result: ColorCodeResult):
+    band1_val, band2_val = result.digits
+    return f"--- Analisi del Codice Colori (IEC 60062) ---\n\nValore Nominale: {format_value(result.value)}\nTolleranza: ±{result.tolerance_percent}%\nRange di funzionamento: da {format_value(result.min_value)} a {format_value(result.max_value)}\n\nSpiegazione:\nIl valore è calcolato combinando le prime due bande ({band1_val} e {band2_val}) e moltiplicando per 10^{result.multiplier_exp}."
+
+@render_report.register
+def _(result: ColorMatchResult):
+    source = "BOM Personalizzata" if result.from_bom else f"Serie {result.series_name}"
+    return f"--- Ricerca Valore Commerciale ---\n\nValore richiesto: {format_value(result.target)}\nSorgente: {source}\n\nCodice colori suggerito per il valore più vicino:\n- Banda 1: {result.band1}\n- Banda 2: {result.band2}\n- Moltiplicatore: {result.multiplier}\n- Tolleranza: {result.tolerance} (±{result.tolerance_percent}%)\n\nValore trovato: {format_value(result.actual_value)}\nErrore rispetto al valore richiesto: {result.error:.2f}%\n\nSpiegazione:\nÈ stato cercato il valore più vicino tra quelli disponibili per minimizzare l'errore percentuale."
+
+@render_report.register
+def _(result: SeriesParallelResult):
+    if result.conn_type == "serie":
+        formula = "R_tot = R1 + R2 + ..."
+        calculation = f"R_tot = {' + '.join([format_value(r) for r in result.resistances])}"
+    else:
+        formula = "R_tot = 1 / (1/R1 + 1/R2 + ...)"
+        calculation = f"R_tot = 1 / ({' + '.join([f'1/{format_value(r)}' for r in result.resistances])})"
+    return f"--- Calcolo {result.conn_type.title()} ---\n\nFormula utilizzata: {formula}\nCalcolo: {calculation}\n\nResistenza Totale Calcolata: {format_value(result.total)}\nTolleranza media (approssimata): ±{result.tolerance_mean:.2f}%\nRange di funzionamento stimato: da {format_value(result.min_total)} a {format_value(result.max_total)}\n"
+
+@render_report.register
+def _(result: OptimizationResult):
+    source_name = "BOM" if result.source == "BOM" else f"Serie {result.source}"
+    text = f"--- Ottimizzazione con Valori Commerciali ({source_name}) ---\n\nOgni resistenza teorica viene sostituita con il valore più vicino disponibile.\n\n"
+    for i, (target_r, matched, error) in enumerate(zip(format_values(result.targets), format_values(result.matched), result.errors)):
+        text += f"- R{i + 1}: {target_r} → {matched} (Errore: {error:.2f}%)\n"
+    text += f"\n--- Risultato Finale ---\nResistenza totale teorica: {format_value(result.original_total)}\nResistenza totale ottimizzata: {format_value(result.optimized_total)}\nErrore totale sull'equivalente: {result.total_error:.2f}%\n"
+    return text
+
+@render_report.register
+def _(result: MonteCarloResult):
+    text = f"--- Analisi Monte Carlo per Partitore di Tensione ---\n\nSpiegazione: La simulazione Monte Carlo testa il circuito migliaia di volte, \nvariando casualmente i valori dei resistori entro la loro tolleranza. \nQuesto aiuta a prevedere il comportamento reale del circuito.\n\nParametri di simulazione:\n- R1: {format_value(result.r1_nominal)} ±{result.tol1*100:.2f}%\n- R2: {format_value(result.r2_nominal)} ±{result.tol2*100:.2f}%\n- Vin: {result.vin} V\n- Iterazioni: {result.iterations}\n\n--- Risultati Statistici ---\nVout Teorico (calcolato con valori nominali): {result.theoretical:.4f} V\nVout Medio (risultato della simulazione): {result.mean:.4f} V\nDeviazione Standard (σ): {result.std:.4f} V\nRange Vout: da {result.min:.4f} V a {result.max:.4f} V\n"
+    stats = result.samples
+    if isinstance(stats, MonteCarloStats):
+        text += f"Percentili (stimati dall'istogramma): P1 = {stats.quantile(0.01):.4f} V, P50 = {stats.quantile(0.5):.4f} V, P99 = {stats.quantile(0.99):.4f} V\n"
+    return text
+
+@render_report.register
+def _(result: CircuitMonteCarloResult):
+    text = f"--- Analisi Monte Carlo della Rete ---\n\nCircuito: {result.expression}\n\nComponenti:\n"
+    for name, nominal, tol in result.components:
+        text += f"- {name}: {format_value(nominal)} ±{tol*100:.2f}%\n"
+    text += f"- Iterazioni: {result.iterations}\n\n--- Risultati Statistici ---\n"
+    text += f"Resistenza Nominale: {format_value(result.nominal)}\n"
+    text += f"Resistenza Media (simulazione): {format_value(result.mean)}\n"
+    text += f"Deviazione Standard (σ): {format_value(result.std)} ({result.std / result.nominal * 100:.3f}%)\n"
+    text += f"Range Simulato: da {format_value(result.min)} a {format_value(result.max)}\n"
+    text += f"Limiti Teorici (worst case): da {format_value(result.lower)} a {format_value(result.upper)}\n"
+    stats = result.samples
+    if isinstance(stats, MonteCarloStats):
+        text += f"Percentili (stimati dall'istogramma): P1 = {format_value(stats.quantile(0.01))}, P99 = {format_value(stats.quantile(0.99))}\n"
+    return text
+
+@render_report.register
+def _(result: DividerResult):
+    lines = [
+        f"--- Progettazione Partitore di Tensione ---\n",
+        f"Sorgente Valori: {_source_name(result.from_bom)}\n\n",
+        f"Obiettivo: Vin={result.vin}V, Vout={result.vout_target:.3f}V (Rapporto: {result.target_ratio:.4f})\n",
+        "Migliori 10 coppie di resistori trovate:\n\n",
+        "{:<15} {:<15} {:<15} {:<10}\n".format("R1", "R2", "Vout Reale", "Errore"),
+        "-"*55 + "\n",
+    ]
+    for r1, r2, vout, error in zip(format_values(result.r1), format_values(result.r2), result.vout.tolist(), result.error.tolist()):
+        lines.append("{:<15} {:<15} {:<15.3f} {:<10.2f}%\n".format(r1, r2, vout, error))
+    lines.append("\nSpiegazione: Sono state testate tutte le combinazioni di resistori della serie E scelta per trovare quelle che minimizzano l'errore sul rapporto Vout/Vin.")
+    return "".join(lines)
+
+@render_report.register
+def _(result: SynthesisResult):
+    lines = [
+        f"--- Sintesi con Più Resistori ---\n",
+        f"Sorgente Valori: {_source_name(result.from_bom)} ({result.value_count} valori)\n",
+        f"Valore desiderato: {format_value(result.target)} (max {result.max_parts} componenti)\n\n",
+        "{:<48} {:<15} {:<10}\n".format("Configurazione", "Valore", "Errore"),
+        "-"*75 + "\n",
+    ]
+    part_labels = format_values(result.parts)
+    present = ~np.isnan(result.parts)
+    for code, labels, used, value, error in zip(result.topology.tolist(), part_labels, present,
+                                                format_values(result.value), result.error.tolist()):
+        labels = dict(zip("abc", labels[used]))
+        lines.append("{:<48} {:<15} {:<10.4f}%\n".format(SYNTH_TOPOLOGIES[code][1].format(**labels), value, error))
+    lines.append("\nSpiegazione: '+' indica la serie e '||' il parallelo. Le combinazioni di due resistori sono precalcolate e ordinate, così per ogni terzo resistore la parte mancante si trova con una ricerca binaria.")
+    return "".join(lines)
+
+@render_report.register
+def _(result: LedResult):
+    package = f"{result.package} ({result.package_power}W)" if result.package else "Nessuno (potenza troppo elevata)"
+    text = f"--- Calcolo Resistore per LED ---\n"
+    text += f"Sorgente Valori: {_source_name(result.from_bom)}\n\n"
+    text += f"Parametri di Input:\n"
+    text += f"- Tensione di Alimentazione: {result.v_supply} V\n"
+    text += f"- Tensione di Caduta LED (Vf): {result.v_led} V\n"
+    text += f"- Corrente LED (If): {result.i_led} mA\n\n"
+
+    text += f"--- Risultati ---\n"
+    text += f"1. Valore Resistore Ideale: {format_value(result.r_ideal)}\n"
+    text += f"2. Valore Commerciale più Vicino: {format_value(result.r_commercial)} (Errore: {result.error:.2f}%)\n"
+    text += f"   - Corrente Reale con questo resistore: {result.i_actual*1000:.2f} mA\n"
+    text += f"3. Potenza Dissipata dal Resistore: {result.power:.4f} W\n"
+    text += f"4. Package Raccomandato (con fattore di sicurezza >{result.safety_factor:.0f}x): {package}\n\n"
+
+    text += "Spiegazione:\n"
+    text += "Il resistore limita la corrente che scorre nel LED. Il valore commerciale è stato scelto dalla serie E selezionata. La potenza dissipata determina la dimensione fisica (package) del resistore necessaria per operare in sicurezza."
+    return text
+
+@render_report.register
+def _(result: RcFilterResult):
+    lines = [
+        f"--- Progettazione Filtro RC Passa-Basso ---\n",
+        f"Sorgente Resistori: {_source_name(result.from_bom)}\n\n",
+        f"Obiettivo Frequenza di Taglio (fc): {format_value(result.f_c_target, unit='Hz')}\n",
+        "Migliori 15 combinazioni R/C trovate:\n\n",
+        "{:<15} {:<15} {:<20} {:<10}\n".format("Resistore", "Condensatore", "fc Reale", "Errore"),
+        "-"*65 + "\n",
+    ]
+    for r, c, f_c, error in zip(format_values(result.r), format_values(result.c, unit='F'),
+                                format_values(result.f_c, unit='Hz'), result.error.tolist()):
+        lines.append("{:<15} {:<15} {:<20} {:<10.2f}%\n".format(r, c, f_c, error))
+    lines.append("\nSpiegazione: Per ogni resistore della serie E, è stato trovato il condensatore (anch'esso da una serie E) che minimizza l'errore sulla frequenza di taglio.")
+    return "".join(lines)
+
+@render_report.register
+def _(result: RegulatorResult):
+    lines = [
+        f"--- Progettazione Regolatore {result.regulator_name} ---\n\n",
+        f"Sorgente Valori: {_source_name(result.from_bom)}\n",
+        f"Obiettivo: Vout = {result.vout_target}V (Vref = {result.vref}V, Iadj = {result.iadj_ua} µA)\n",
+        f"Corrente in R1 ammessa: {result.i_min_ma:g} - {result.i_max_ma:g} mA ({result.r1_count} valori di R1 × {result.r2_count} di R2)\n\n",
+        "{:<10} {:<10} {:<15} {:<10} {:<10}\n".format("R1", "R2", "Vout Reale", "I R1", "Errore"),
+        "-"*60 + "\n",
+    ]
+    for r1, r2, vout, i_r1, error in zip(format_values(result.r1), format_values(result.r2), result.vout.tolist(),
+                                         result.i_r1_ma.tolist(), result.error.tolist()):
+        lines.append("{:<10} {:<10} {:<15.3f} {:<10} {:<10.2f}%\n".format(r1, r2, vout, f"{i_r1:.2f} mA", error))
+    return "".join(lines)
+
+@render_report.register
+def _(result: CurrentDividerResult):
+    text = "--- Analisi Ripartitore di Corrente ---\n\n"
+    text += f"Corrente Totale: {result.i_total} A\n\n"
+    text += "{:<10} {:<15} {:<15}\n".format("Ramo", "Resistenza", "Corrente")
+    text += "-"*40 + "\n"
+    for i, (r, i_branch) in enumerate(zip(format_values(result.resistances), result.currents.tolist())):
+        text += "R{:<9} {:<15} {:<15.4f} A\n".format(i+1, r, i_branch)
+    return text
+
+@render_report.register
+def _(result: AwgResult):
+    text = f"--- Dati Cavo AWG {result.awg} ---\n\n"
+    text += f"- Diametro: {result.diameter_mm} mm\n"
+    text += f"- Sezione: {result.area_mm2} mm²\n"
+    text += f"- Resistenza: {result.res_ohm_km} Ω/km\n"
+    text += f"- Corrente Max (indicativa): {result.max_amp} A\n"
+    return text
@@ -96,11 +96,12 @@ def get_multiplier_color(exponent):
         return "nero"
 
 # Specifiche Regolatori Lineari
+# i_load_min_ma: corrente minima di carico tipica (da datasheet), da garantire tramite R1
 regulator_specs = {
-    "LM317": {"vref": 1.25, "iadj_ua": 50, "r1_recommended": 240},
-    "LM337": {"vref": -1.25, "iadj_ua": 50, "r1_recommended": 240},
-    "LM350": {"vref": 1.25, "iadj_ua": 50, "r1_recommended": 120},
-    "AMS1117-ADJ": {"vref": 1.25, "iadj_ua": 60, "r1_recommended": 120}
+    "LM317": {"vref": 1.25, "iadj_ua": 50, "i_load_min_ma": 3.5},
+    "LM337": {"vref": -1.25, "iadj_ua": 50, "i_load_min_ma": 2.5},
+    "LM350": {"vref": 1.25, "iadj_ua": 50, "i_load_min_ma": 3.5},
+    "AMS1117-ADJ": {"vref": 1.25, "iadj_ua": 60, "i_load_min_ma": 5}
 }
 
 # Tabella AWG (American Wire Gauge)
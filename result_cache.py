@@ -0,0 +1,183 @@
+
+# Cache LRU in memoria per i risultati delle funzioni pure di logic.py.
+# Le chiavi sono una forma canonica degli argomenti: le liste lunghe (BOM,
+# serie E) sono sostituite da un hash del contenuto, così un cambio di BOM
+# produce chiavi diverse e i risultati restano sempre corretti.
+import hashlib
+import inspect
+import sys
+import threading
+from collections import OrderedDict
+from functools import wraps
+import numpy as np
+
+# Sotto questa lunghezza le sequenze entrano nella chiave così come sono
+_INLINE_SEQUENCE_LEN = 32
+
+class _Uncacheable(Exception):
+    pass
+
+def _digest(values):
+    data = np.ascontiguousarray(np.asarray(values, dtype=np.float64))
+    return ('sha1', data.size, hashlib.sha1(data.tobytes()).hexdigest())
+
+def canonical_key(value):
+    """Converte un argomento in una chiave hashable e stabile (solleva _Uncacheable se non possibile)."""
+    if value is None or isinstance(value, (str, bytes)):
+        return value
+    # Il tipo entra nella chiave: 1, 1.0 e True possono dare risultati diversi
+    if isinstance(value, (bool, int)):
+        return (type(value).__name__, value)
+    if isinstance(value, float):
+        return ('float', value + 0.0)  # -0.0 e 0.0 hanno la stessa chiave
+    if isinstance(value, np.generic):
+        return canonical_key(value.item())
+    if isinstance(value, np.ndarray) or (isinstance(value, (list, tuple)) and len(value) > _INLINE_SEQUENCE_LEN):
+        try:
+            return _digest(value)
+        except (TypeError, ValueError):
+            pass
+    if isinstance(value, (list, tuple)):
+        return ('seq',) + tuple(canonical_key(v) for v in value)
+    if isinstance(value, dict):
+        return ('dict',) + tuple(sorted((str(k), canonical_key(v)) for k, v in value.items()))
+    raise _Uncacheable(type(value).__name__)
+
+def estimate_size(value):
+    """Stima approssimativa in byte della memoria occupata da un risultato."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes + sys.getsizeof(value)
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if hasattr(value, '__slots__'):
+        return sys.getsizeof(value) + sum(estimate_size(getattr(value, s, None)) for s in value.__slots__)
+    return sys.getsizeof(value)
+
+def freeze_arrays(value):
+    """Rende di sola lettura gli ndarray contenuti in un risultato (stessa visita di estimate_size)."""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, (list, tuple, set)):
+        for v in value:
+            freeze_arrays(v)
+    elif isinstance(value, dict):
+        for v in value.values():
+            freeze_arrays(v)
+    elif hasattr(value, '__slots__'):
+        for s in value.__slots__:
+            freeze_arrays(getattr(value, s, None))
+    return value
+
+class LRUResultCache:
+    """
+    Cache LRU thread-safe con limite sul numero di voci e sui byte stimati.
+    Ogni voce può avere dei tag (es. "bom") per l'invalidazione selettiva.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.current_bytes = 0
+        self._entries = OrderedDict()  # chiave -> (valore, byte, tag)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, tags=()):
+        size = estimate_size(value)
+        with self._lock:
+            if size > self.max_bytes:
+                return
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size, frozenset(tags))
+            self.current_bytes += size
+            self._evict()
+
+    def resize(self, max_entries=None, max_bytes=None):
+        """Cambia i limiti ed elimina subito le voci in eccesso."""
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._evict()
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes):
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+
+    def invalidate(self, tag=None):
+        """Rimuove tutte le voci (tag=None) o solo quelle con il tag indicato. Restituisce quante."""
+        with self._lock:
+            if tag is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                self.current_bytes = 0
+                return removed
+            keys = [k for k, (_, _, tags) in self._entries.items() if tag in tags]
+            for k in keys:
+                self.current_bytes -= self._entries.pop(k)[1]
+            return len(keys)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries), 'bytes': self.current_bytes,
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'max_entries': self.max_entries, 'max_bytes': self.max_bytes,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+default_cache = LRUResultCache()
+
+def memoize(cache=None, bom_args=('custom_values',)):
+    """
+    Decoratore che memorizza i risultati di una funzione pura nella cache LRU.
+    Le chiamate posizionali e per keyword producono la stessa chiave; le voci con
+    argomenti BOM non vuoti ricevono il tag "bom". Argomenti non riconosciuti
+    disattivano la cache per quella chiamata. I risultati restituiti sono condivisi
+    tra i chiamanti: i loro ndarray sono resi di sola lettura (freeze_arrays).
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            target = cache if cache is not None else default_cache
+            try:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                key = (func.__module__, func.__qualname__) + tuple(
+                    (name, canonical_key(value)) for name, value in bound.arguments.items())
+            except (_Uncacheable, TypeError):
+                return func(*args, **kwargs)
+            missing = object()
+            result = target.get(key, missing)
+            if result is missing:
+                result = freeze_arrays(func(*args, **kwargs))
+                tags = ('bom',) if any(bound.arguments.get(name) is not None and len(bound.arguments[name])
+                                       for name in bom_args if name in bound.arguments) else ()
+                target.put(key, result, tags)
+            return result
+
+        wrapper.uncached = func
+        return wrapper
+    return decorator
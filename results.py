@@ -0,0 +1,205 @@
+
+# Oggetti risultato restituiti dalle funzioni di logic.py.
+# Contengono solo i numeri: il testo per la GUI viene prodotto a parte da
+# reports.render_report, così chi lavora in batch non paga la formattazione.
+# Le tabelle di candidati sono colonne ndarray (una riga per candidato).
+# Le istanze possono essere condivise dalla cache dei risultati: non modificarle.
+from dataclasses import dataclass, fields
+import numpy as np
+
+def _plain(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, tuple):
+        return [_plain(v) for v in value]
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    return value
+
+class ResultMixin:
+    __slots__ = ()
+    # Campi esclusi da to_dict (es. i campioni Monte Carlo, troppo grandi per JSON)
+    _skip_fields = ()
+
+    def to_dict(self):
+        """Dizionario di soli tipi Python (liste al posto degli array), pronto per JSON."""
+        return {f.name: _plain(getattr(self, f.name)) for f in fields(self) if f.name not in self._skip_fields}
+
+_result = dataclass(frozen=True, slots=True, eq=False)
+
+@_result
+class SmdDecodeResult(ResultMixin):
+    code: str
+    code_type: str               # "standard" o "eia96"
+    value: float
+    base_value: float = None     # solo EIA-96
+    multiplier: float = None     # solo EIA-96
+
+@_result
+class PowerResult(ResultMixin):
+    power: float                 # potenza media dissipata (W)
+    package_name: str
+    package_power: float         # potenza nominale a 25°C (W)
+    ambient_temp: float
+    derated_power: float         # potenza massima alla temperatura ambiente (W)
+
+    @property
+    def safety_factor(self):
+        return self.derated_power / self.power if self.power > 0 else float('inf')
+
+@_result
+class ColorCodeResult(ResultMixin):
+    value: float
+    tolerance_percent: float
+    min_value: float
+    max_value: float
+    digits: tuple                # (cifra banda 1, cifra banda 2)
+    multiplier_exp: int
+
+@_result
+class ColorMatchResult(ResultMixin):
+    target: float
+    series_name: str             # "BOM" per i valori personalizzati
+    from_bom: bool
+    band1: str
+    band2: str
+    multiplier: str
+    tolerance: str
+    tolerance_percent: float
+    actual_value: float
+    error: float
+
+@_result
+class SeriesParallelResult(ResultMixin):
+    conn_type: str               # "serie" o "parallelo"
+    resistances: tuple
+    total: float
+    tolerance_mean: float
+    min_total: float
+    max_total: float
+
+@_result
+class OptimizationResult(ResultMixin):
+    source: str                  # "BOM" o nome della serie
+    conn_type: str
+    targets: np.ndarray
+    matched: np.ndarray
+    errors: np.ndarray
+    original_total: float
+    optimized_total: float
+    total_error: float
+
+@_result
+class MonteCarloResult(ResultMixin):
+    vin: float
+    iterations: int
+    r1_nominal: float
+    tol1: float
+    r2_nominal: float
+    tol2: float
+    theoretical: float
+    mean: float
+    std: float
+    min: float
+    max: float
+    samples: object              # ndarray dei campioni oppure MonteCarloStats
+
+    _skip_fields = ('samples',)
+
+@_result
+class CircuitMonteCarloResult(ResultMixin):
+    expression: str
+    components: tuple            # ((nome, nominale, tolleranza frazionaria), ...)
+    iterations: int
+    nominal: float
+    mean: float
+    std: float
+    min: float
+    max: float
+    lower: float                 # limiti teorici (worst case)
+    upper: float
+    samples: object              # ndarray dei campioni oppure MonteCarloStats
+
+    _skip_fields = ('samples',)
+
+@_result
+class DividerResult(ResultMixin):
+    vin: float
+    vout_target: float
+    from_bom: bool
+    r1: np.ndarray
+    r2: np.ndarray
+    vout: np.ndarray
+    error: np.ndarray
+
+    @property
+    def target_ratio(self):
+        return self.vout_target / self.vin
+
+@_result
+class SynthesisResult(ResultMixin):
+    target: float
+    from_bom: bool
+    value_count: int
+    max_parts: int
+    topology: np.ndarray         # codici di logic.SYNTH_TOPOLOGIES
+    parts: np.ndarray            # forma (n, 3), NaN dove il componente non c'è
+    value: np.ndarray
+    error: np.ndarray
+
+@_result
+class LedResult(ResultMixin):
+    v_supply: float
+    v_led: float
+    i_led: float                 # mA
+    from_bom: bool
+    r_ideal: float
+    r_commercial: float
+    error: float
+    i_actual: float              # A
+    power: float                 # W
+    package: str                 # None se nessun package è sufficiente
+    package_power: float
+    safety_factor: float
+
+@_result
+class RcFilterResult(ResultMixin):
+    f_c_target: float
+    from_bom: bool
+    r: np.ndarray
+    c: np.ndarray
+    f_c: np.ndarray
+    error: np.ndarray
+
+@_result
+class RegulatorResult(ResultMixin):
+    regulator_name: str
+    vref: float
+    iadj_ua: float
+    vout_target: float
+    from_bom: bool
+    i_min_ma: float
+    i_max_ma: float
+    r1_count: int
+    r2_count: int
+    r1: np.ndarray
+    r2: np.ndarray
+    vout: np.ndarray
+    i_r1_ma: np.ndarray
+    error: np.ndarray
+
+@_result
+class CurrentDividerResult(ResultMixin):
+    i_total: float
+    resistances: np.ndarray
+    currents: np.ndarray
+
+@_result
+class AwgResult(ResultMixin):
+    awg: int
+    diameter_mm: float
+    area_mm2: float
+    res_ohm_km: float
+    max_amp: float
@@ -1,17 +1,244 @@
+
+# Diagnostica e misura delle prestazioni di avvio.
+# - Import: tempo per modulo misurato con `python -X importtime` in un processo nuovo,
+#   "a freddo" (senza bytecode in cache, tutto ricompilato) e "a caldo" (cache pronta).
+# - Avvio: tempo di main.main() senza argomenti fino alla chiamata di run_gui, cioè il
+#   percorso reale di `python main.py` prima che si apra la finestra.
+# - GUI: costruzione di ElectronicTool e di ogni vista tramite show_tool, con la
+#   finestra ritirata (withdraw). Senza display la parte GUI viene saltata e segnalata;
+#   su un server si può usare un display virtuale, es. `xvfb-run python run_diagnostics.py`.
+# - Memoria: picco di RSS del processo.
+# I risultati sono scritti in JSON insieme alle soglie e alle eventuali violazioni.
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
 import traceback
-try:
-    import main
-    import tkinter as tk
 
-    root = tk.Tk()
+# Moduli misurati all'import (nucleo di calcolo, GUI, dipendenze pesanti)
+IMPORT_MODULES = (
+    "units", "logic", "reports", "utils", "batch", "server", "gui", "main",
+    "numpy", "matplotlib.backends.backend_tkagg", "pandas",
+)
+
+# Soglie predefinite (ms e MB); sovrascrivibili con --thresholds file.json
+DEFAULT_THRESHOLDS = {
+    "import_warm_ms.gui": 100.0,
+    "startup_ms": 150.0,
+    "import_warm_ms.logic": 400.0,
+    "construct_ms": 500.0,
+    "view_first_ms_max": 1500.0,
+    "peak_rss_mb": 400.0,
+}
+
+def _parse_importtime(stderr, module):
+    """Dall'output di -X importtime: (tempo cumulativo del modulo in µs, import più pesanti)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            rows.append((int(cumulative), name.strip()))
+        except ValueError:
+            continue  # riga di intestazione
+    total = next((us for us, name in rows if name == module), None)
+    top = sorted(rows, reverse=True)[:5]
+    return total, [{"module": name, "ms": round(us / 1000, 2)} for us, name in top if name != module]
+
+def _import_once(module, pycache_prefix=None):
+    cmd = [sys.executable, "-X", "importtime"]
+    if pycache_prefix:
+        cmd += ["-X", f"pycache_prefix={pycache_prefix}"]
+    # La cache del bytecode deve potersi scrivere, altrimenti ogni esecuzione resta "a freddo"
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    proc = subprocess.run(cmd + ["-c", f"import {module}"], capture_output=True, text=True, env=env,
+                          cwd=os.path.dirname(os.path.abspath(__file__)))
+    if proc.returncode != 0:
+        return None, [], proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "errore"
+    total, top = _parse_importtime(proc.stderr, module)
+    return total, top, None
+
+def measure_imports(modules=IMPORT_MODULES, runs=3):
+    """
+    Tempo di import di ogni modulo in un interprete nuovo. "cold_ms": prima esecuzione con
+    una cartella di bytecode vuota (pycache_prefix temporaneo); "warm_ms": mediana di `runs`
+    esecuzioni successive con la stessa cartella, ormai popolata.
+    """
+    results = {}
+    for module in modules:
+        with tempfile.TemporaryDirectory(prefix="rt_pycache_") as prefix:
+            cold, _, error = _import_once(module, prefix)
+            if error:
+                results[module] = {"error": error}
+                continue
+            warm, top = [], []
+            for _ in range(runs):
+                total, top, error = _import_once(module, prefix)
+                if total is not None:
+                    warm.append(total)
+        results[module] = {
+            "cold_ms": round(cold / 1000, 2) if cold is not None else None,
+            "warm_ms": round(statistics.median(warm) / 1000, 2) if warm else None,
+            "heaviest": top,
+        }
+    return results
+
+# Eseguito in un interprete nuovo: run_gui è sostituita da una funzione che misura il
+# tempo trascorso e le dipendenze pesanti già caricate a quel punto
+_STARTUP_CODE = """
+import sys, time, json
+start = time.perf_counter()
+import main
+def run_gui():
+    heavy = sorted(m for m in ("numpy", "matplotlib", "pandas", "asyncio", "logic") if m in sys.modules)
+    print(json.dumps({"ms": (time.perf_counter() - start) * 1000, "heavy_modules": heavy}))
+main.run_gui = run_gui
+main.main([])
+"""
+
+def measure_startup(runs=3):
+    """Mediana su `runs` processi del tempo di main.main() fino a run_gui (bytecode già in cache)."""
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    timings, heavy = [], []
+    for _ in range(runs + 1):  # la prima esecuzione popola la cache del bytecode
+        proc = subprocess.run([sys.executable, "-c", _STARTUP_CODE], capture_output=True, text=True, env=env,
+                              cwd=os.path.dirname(os.path.abspath(__file__)))
+        if proc.returncode != 0:
+            return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "errore"}
+        data = json.loads(proc.stdout.strip().splitlines()[-1])
+        timings.append(data["ms"])
+        heavy = data["heavy_modules"]
+    return {"ms": round(statistics.median(timings[1:]), 2), "heavy_modules": heavy}
+
+def peak_rss_mb():
+    """Picco di memoria residente del processo (None dove `resource` non esiste, es. Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux riporta KiB, macOS byte
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def measure_gui():
+    """Costruzione di ElectronicTool e di ogni vista (prima e seconda apertura), finestra ritirata."""
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        return {"skipped": f"nessun display disponibile ({e})"}
     root.withdraw()
-    app = main.ElectronicTool(root)
-    root.update()
-    root.destroy()
-
-    with open('diagnostic.log', 'w', encoding='utf-8') as f:
-        f.write('DIAGNOSTIC: OK\n')
-except Exception:
-    with open('diagnostic.log', 'w', encoding='utf-8') as f:
-        traceback.print_exc(file=f)
-    raise
+    try:
+        start = time.perf_counter()
+        from gui import ElectronicTool, TOOL_VIEWS
+        import_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        app = ElectronicTool(root)
+        # Il prewarm importerebbe le viste in anticipo: qui si misura l'apertura a freddo
+        # (il thread di prewarm, avviato al primo idle, trova la coda vuota e termina)
+        prewarm_queue, app._prewarm_queue = app._prewarm_queue, []
+        root.update_idletasks()
+        construct_ms = (time.perf_counter() - start) * 1000
+        root.update()
+
+        views = {}
+        for tool_id in TOOL_VIEWS:
+            timings = []
+            for _ in range(2):
+                start = time.perf_counter()
+                app.show_tool(tool_id)
+                root.update_idletasks()
+                timings.append((time.perf_counter() - start) * 1000)
+            views[tool_id] = {"first_ms": round(timings[0], 2), "second_ms": round(timings[1], 2)}
+        app.show_dashboard()
+
+        # Tempo complessivo degli import del prewarm, qui in sequenza (con le viste già importate resta quasi solo matplotlib)
+        app._prewarm_queue = prewarm_queue
+        start = time.perf_counter()
+        while app._prewarm_queue:
+            app.prewarm_step()
+        prewarm_ms = (time.perf_counter() - start) * 1000
+        root.update()
+        return {"import_ms": round(import_ms, 2), "construct_ms": round(construct_ms, 2), "views": views, "prewarm_ms": round(prewarm_ms, 2)}
+    finally:
+        root.destroy()
+
+def check_thresholds(report, thresholds):
+    """Confronta il report con le soglie e restituisce l'elenco delle violazioni."""
+    values = {"peak_rss_mb": report.get("peak_rss_mb"), "startup_ms": report.get("startup", {}).get("ms")}
+    for module, data in report.get("imports", {}).items():
+        values[f"import_warm_ms.{module}"] = data.get("warm_ms")
+        values[f"import_cold_ms.{module}"] = data.get("cold_ms")
+    gui = report.get("gui", {})
+    if "construct_ms" in gui:
+        values["construct_ms"] = gui["construct_ms"]
+        values["view_first_ms_max"] = max(v["first_ms"] for v in gui["views"].values())
+    violations = []
+    for key, limit in thresholds.items():
+        value = values.get(key)
+        if value is not None and value > limit:
+            violations.append({"metric": key, "value": value, "limit": limit})
+    return violations
+
+def run(output="diagnostic.json", runs=3, modules=IMPORT_MODULES, thresholds=None, skip_imports=False):
+    thresholds = dict(DEFAULT_THRESHOLDS if thresholds is None else thresholds)
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "display": os.environ.get("DISPLAY"),
+        "imports": {} if skip_imports else measure_imports(modules, runs),
+        "startup": {} if skip_imports else measure_startup(runs),
+        "gui": measure_gui(),
+        "peak_rss_mb": peak_rss_mb(),
+        "thresholds": thresholds,
+    }
+    report["violations"] = check_thresholds(report, thresholds)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diagnostica e tempi di avvio di Electronic Tool.")
+    parser.add_argument("-o", "--output", default="diagnostic.json", help="File JSON dei risultati (default diagnostic.json)")
+    parser.add_argument("--runs", type=int, default=3, help="Esecuzioni a caldo per ogni import (default 3)")
+    parser.add_argument("--modules", nargs="+", default=list(IMPORT_MODULES), help="Moduli di cui misurare l'import")
+    parser.add_argument("--thresholds", help="File JSON con le soglie (sostituisce quelle predefinite)")
+    parser.add_argument("--skip-imports", action="store_true", help="Misura solo GUI e memoria")
+    args = parser.parse_args(argv)
+    thresholds = None
+    if args.thresholds:
+        with open(args.thresholds, encoding="utf-8") as f:
+            thresholds = json.load(f)
+
+    try:
+        report = run(args.output, args.runs, args.modules, thresholds, args.skip_imports)
+        with open('diagnostic.log', 'w', encoding='utf-8') as f:
+            f.write('DIAGNOSTIC: OK\n')
+    except Exception:
+        with open('diagnostic.log', 'w', encoding='utf-8') as f:
+            traceback.print_exc(file=f)
+        raise
+
+    startup = report["startup"]
+    if "ms" in startup:
+        print(f"Avvio (main fino a run_gui): {startup['ms']:.1f} ms"
+              + (f", già caricati: {', '.join(startup['heavy_modules'])}" if startup["heavy_modules"] else ""))
+    gui = report["gui"]
+    if "skipped" in gui:
+        print(f"GUI non misurata: {gui['skipped']}")
+    else:
+        print(f"ElectronicTool: {gui['construct_ms']:.1f} ms, vista più lenta: "
+              f"{max(v['first_ms'] for v in gui['views'].values()):.1f} ms")
+    for violation in report["violations"]:
+        print(f"SOGLIA SUPERATA: {violation['metric']} = {violation['value']} (limite {violation['limit']})")
+    print(f"Risultati in {args.output}")
+    return 1 if report["violations"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,358 @@
+
+# Servizio HTTP/JSON locale (solo loopback) che espone i calcolatori di logic.py.
+# - /nearest e /color_code: le richieste concorrenti vengono raccolte in micro-batch
+#   e risolte con una sola chiamata vettorizzata (snap_to_series, find_best_color_matches).
+# - /divider, /regulator, /rc_filter, /monte_carlo: calcoli pesanti, eseguiti in un
+#   pool di processi così il ciclo degli eventi non si blocca mai.
+# - /metrics: istogrammi di latenza per endpoint.
+# Solo libreria standard + numpy: nessun servizio esterno.
+import asyncio
+import json
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from resistor_lib import e_series
+from logic import snap_to_series, find_best_color_matches, find_best_color_match
+from results import ColorMatchResult
+from result_cache import canonical_key
+from batch import JOB_TYPES, run_job
+
+HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 1 << 20
+# Un micro-batch parte quando è pieno o dopo questo ritardo dalla prima richiesta
+BATCH_MAX_SIZE = 512
+BATCH_MAX_DELAY = 0.002
+# Job eseguiti nel pool di processi; gli altri sono abbastanza veloci da restare nel ciclo
+HEAVY_JOBS = {"divider", "regulator", "rc_filter", "monte_carlo"}
+# Massimo numero di candidati di /nearest (k): la finestra di ricerca è n × 2k
+NEAREST_MAX_K = 16
+# Chiave delle metriche per tutte le richieste senza rotta (404/405)
+UNKNOWN_ROUTE = "(sconosciuta)"
+
+class LatencyHistogram:
+    """Istogramma delle latenze con bin logaritmici da 10 µs a ~100 s (4 bin per ottava)."""
+
+    BINS_PER_OCTAVE = 4
+    MIN_SECONDS = 1e-5
+    NUM_BINS = 93
+
+    def __init__(self):
+        self.counts = [0] * (self.NUM_BINS + 1)  # l'ultimo bin raccoglie tutto ciò che è oltre
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        if seconds <= self.MIN_SECONDS:
+            index = 0
+        else:
+            index = min(int(math.log2(seconds / self.MIN_SECONDS) * self.BINS_PER_OCTAVE) + 1, self.NUM_BINS)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def upper_bound(self, index):
+        return self.MIN_SECONDS * 2 ** (index / self.BINS_PER_OCTAVE)
+
+    def quantile(self, q):
+        """Limite superiore del bin che contiene il quantile `q` (stima per eccesso)."""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return min(self.upper_bound(index), self.max)
+        return self.max
+
+    def snapshot(self):
+        ms = lambda s: None if s is None else round(s * 1000, 4)
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.total / self.count) if self.count else None,
+            "p50_ms": ms(self.quantile(0.5)), "p90_ms": ms(self.quantile(0.9)), "p99_ms": ms(self.quantile(0.99)),
+            "max_ms": ms(self.max),
+            "buckets": [[ms(self.upper_bound(i)), n] for i, n in enumerate(self.counts) if n],
+        }
+
+class MicroBatcher:
+    """
+    Raccoglie le richieste con la stessa chiave e le risolve insieme con `solve(key, items)`,
+    che riceve la lista degli item e restituisce una lista di risultati nello stesso ordine.
+    Il batch parte quando raggiunge `max_size` item o `max_delay` secondi dopo il primo.
+    """
+
+    def __init__(self, solve, max_size=BATCH_MAX_SIZE, max_delay=BATCH_MAX_DELAY):
+        self.solve = solve
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.pending = {}  # chiave -> (item, future, handle del timer)
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, key, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if key not in self.pending:
+            timer = loop.call_later(self.max_delay, self._flush, key)
+            self.pending[key] = ([], [], timer)
+        items, futures, _ = self.pending[key]
+        items.append(item)
+        futures.append(future)
+        if len(items) >= self.max_size:
+            self._flush(key)
+        return future
+
+    def _flush(self, key):
+        entry = self.pending.pop(key, None)
+        if entry is None:
+            return
+        items, futures, timer = entry
+        timer.cancel()
+        self.batches += 1
+        self.items += len(items)
+        try:
+            results = self.solve(key, items)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error"}
+
+def _values(body):
+    # "value" singolo o lista "values": la risposta rispetta la stessa forma
+    if "values" in body:
+        return [float(v) for v in body["values"]], False
+    if "value" in body:
+        return [float(body["value"])], True
+    raise HttpError(400, "Specificare 'value' o 'values'.")
+
+def _solve_nearest(key, items):
+    series, mode, k, _ = key
+    custom_values = items[0][1]
+    sizes = [len(values) for values, _ in items]
+    matched, errors, candidates = snap_to_series(np.concatenate([values for values, _ in items]),
+                                                 series, mode=mode, k=k, custom_values=custom_values)
+    out, start = [], 0
+    for size in sizes:
+        out.append((matched[start:start + size], errors[start:start + size], candidates[start:start + size]))
+        start += size
+    return out
+
+def _color_match_dict(target, match, from_bom):
+    if match is None:
+        return None
+    return ColorMatchResult(target, match['series_name'], from_bom, match['band1'], match['band2'], match['multiplier'],
+                            match['tolerance'], match['tolerance_value'], match['actual_value'], match['error']).to_dict()
+
+def _solve_color_code(key, items):
+    custom_values = items[0][1]
+    targets = [v for values, _ in items for v in values]
+    if custom_values:
+        # Con una BOM la ricerca resta quella scalare (i valori non hanno bande standard)
+        matches = [find_best_color_match(t, e_series, custom_values=custom_values) for t in targets]
+    else:
+        matches = find_best_color_matches(targets, e_series)
+    dicts = [_color_match_dict(t, m, bool(custom_values)) for t, m in zip(targets, matches)]
+    out, start = [], 0
+    for values, _ in items:
+        out.append(dicts[start:start + len(values)])
+        start += len(values)
+    return out
+
+def _nan_to_none(values):
+    # NaN e ±inf non sono JSON valido
+    return [v if math.isfinite(v) else None for v in values.tolist()]
+
+class ResistorService:
+    """Instrada le richieste HTTP/JSON verso i calcolatori e misura le latenze."""
+
+    def __init__(self, workers=None):
+        # "spawn": un worker creato con fork durante una richiesta erediterebbe il socket
+        # del client, e la risposta con Connection: close non arriverebbe mai a EOF
+        self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self.latency = {}
+        self.nearest = MicroBatcher(_solve_nearest)
+        self.color_code = MicroBatcher(_solve_color_code)
+        self.routes = {
+            ("GET", "/health"): self.health,
+            ("GET", "/metrics"): self.metrics,
+            ("POST", "/nearest"): self.handle_nearest,
+            ("POST", "/color_code"): self.handle_color_code,
+        }
+        for job_type in JOB_TYPES:
+            if job_type != "color_code":
+                self.routes[("POST", f"/{job_type}")] = self._job_handler(job_type)
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    async def dispatch(self, method, path, body):
+        start = time.perf_counter()
+        handler = self.routes.get((method, path))
+        try:
+            if handler is None:
+                known = {p for _, p in self.routes}
+                raise HttpError(405 if path in known else 404, f"{method} {path} non supportato.")
+            status, payload = await handler(body)
+        except HttpError as e:
+            status, payload = e.status, {"error": str(e)}
+        except (KeyError, TypeError, ValueError) as e:
+            status, payload = 400, {"error": f"Richiesta non valida: {e}"}
+        except Exception as e:
+            # Es. BrokenProcessPool o un errore numpy in un micro-batch: si risponde comunque
+            status, payload = 500, {"error": f"Errore interno: {type(e).__name__}: {e}"}
+        # Le rotte sconosciute finiscono sotto un'unica chiave, così la mappa resta limitata
+        key = path if handler is not None else UNKNOWN_ROUTE
+        self.latency.setdefault(key, LatencyHistogram()).record(time.perf_counter() - start)
+        return status, payload
+
+    async def health(self, body):
+        return 200, {"status": "ok"}
+
+    async def metrics(self, body):
+        return 200, {
+            "latency": {path: hist.snapshot() for path, hist in sorted(self.latency.items())},
+            "batching": {name: {"batches": b.batches, "items": b.items}
+                         for name, b in (("nearest", self.nearest), ("color_code", self.color_code))},
+        }
+
+    async def handle_nearest(self, body):
+        values, single = _values(body)
+        if any(v <= 0 for v in values):
+            raise HttpError(400, "I valori devono essere maggiori di zero.")
+        series = body.get("series", "E24")
+        if series not in e_series:
+            raise HttpError(400, f"Serie sconosciuta: {series}")
+        mode, k = body.get("mode", "nearest"), int(body.get("k", 1))
+        if mode not in ("nearest", "floor", "ceil"):
+            raise HttpError(400, f"Modalità non valida: {mode}")
+        if not 1 <= k <= NEAREST_MAX_K:
+            raise HttpError(400, f"k deve essere compreso tra 1 e {NEAREST_MAX_K}.")
+        custom = body.get("custom_values") or None
+        key = (series, mode, k, canonical_key(custom))
+        matched, errors, candidates = await self.nearest.submit(key, (values, custom))
+        matched, errors = _nan_to_none(matched), _nan_to_none(errors)
+        payload = {"matched": matched[0] if single else matched, "error": errors[0] if single else errors}
+        if k > 1:
+            rows = [_nan_to_none(row) for row in candidates]
+            payload["candidates"] = rows[0] if single else rows
+        return 200, payload
+
+    async def handle_color_code(self, body):
+        values, single = _values(body)
+        if any(v <= 0 for v in values):
+            raise HttpError(400, "I valori devono essere maggiori di zero.")
+        custom = body.get("custom_values") or None
+        matches = await self.color_code.submit(canonical_key(custom), (values, custom))
+        return 200, {"result": matches[0] if single else matches}
+
+    def _job_handler(self, job_type):
+        async def handler(body):
+            if not isinstance(body, dict):
+                raise HttpError(400, "Il corpo deve essere un oggetto JSON.")
+            job = dict(body, type=job_type)
+            if job_type in HEAVY_JOBS:
+                out = await asyncio.get_running_loop().run_in_executor(self.executor, run_job, job)
+            else:
+                out = run_job(job)
+            return (200 if out["error"] is None else 422), {"result": out["result"], "error": out["error"]}
+        return handler
+
+async def _read_request(reader):
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, path, _ = request_line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(400, "Richiesta HTTP non valida.")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0) or 0)
+    if length > MAX_BODY_BYTES:
+        raise HttpError(413, "Corpo della richiesta troppo grande.")
+    body = None
+    if length:
+        try:
+            body = json.loads(await reader.readexactly(length))
+        except ValueError:
+            raise HttpError(400, "JSON non valido.")
+    keep_alive = headers.get("connection", "").lower() != "close"
+    return method, path.split("?", 1)[0], body if body is not None else {}, keep_alive
+
+def _response(status, payload, keep_alive):
+    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\nContent-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + data
+
+async def serve(port=DEFAULT_PORT, workers=None, ready=None):
+    """
+    Avvia il servizio su 127.0.0.1:`port` (0 = porta libera scelta dal sistema).
+    `ready`, se fornito, è un callback chiamato con (server, service) una volta in ascolto.
+    """
+    service = ResistorService(workers=workers)
+
+    async def handle_connection(reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                    if request is None:
+                        break
+                    method, path, body, keep_alive = request
+                    status, payload = await service.dispatch(method, path, body)
+                except HttpError as e:
+                    status, payload, keep_alive = e.status, {"error": str(e)}, False
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle_connection, HOST, port)
+    try:
+        if ready is not None:
+            ready(server, service)
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+def add_serve_arguments(parser):
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Porta su 127.0.0.1 (default {DEFAULT_PORT})")
+    parser.add_argument("--workers", type=int, default=None, help="Processi per i calcoli pesanti (default: numero di CPU)")
+
+def serve_main(args):
+    def ready(server, service):
+        print(f"In ascolto su http://{HOST}:{server.sockets[0].getsockname()[1]}", flush=True)
+    try:
+        asyncio.run(serve(args.port, args.workers, ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -1,18 +1,40 @@
 import sys
 import os
+import tempfile
+import io
+import importlib
+import subprocess
+import asyncio
+import json
+import time
+import numpy as np
 
 # Add project root to path
 sys.path.append(os.path.abspath('.'))
 
 from logic import (
     find_best_color_match,
+    find_best_commercial_value,
+    series_value_index,
+    snap_to_series,
     calculate_power_logic,
     calculate_color_code_logic,
     calculate_regulator_logic,
+    design_voltage_divider_logic,
+    design_rc_filter_logic,
+    synthesize_resistance_logic,
+    run_monte_carlo_logic,
+    run_circuit_monte_carlo_logic,
+    parse_circuit_expression,
+    evaluate_circuit,
     convert_awg_logic,
     search_glossary_logic
 )
-from utils import format_value
+from utils import format_value, format_values, normalize_resistor_value
+from result_cache import LRUResultCache, memoize, default_cache
+from reports import render_report
+from batch import run_batch, run_job, read_jobs
+from server import serve, LatencyHistogram, UNKNOWN_ROUTE
 from resistor_lib import e_series, color_codes, tolerance_colors
 
 def test_format_value():
@@ -21,6 +43,12 @@ def test_format_value():
     assert format_value(1000, unit='Hz') == "1.000 kHz"
     assert format_value(0.000001, unit='F') == "1.000 µF"
     assert format_value(1e9) == "1.000 GΩ"
+    # La versione vettorizzata produce esattamente lo stesso testo (anche sulle soglie)
+    values = np.concatenate((np.logspace(-9, 12, 500), [0, -0.0, 999.9995, 1e3, 1e-3, -4.7e-5]))
+    for unit in ('Ω', 'Hz', 'F'):
+        assert format_values(values, unit).tolist() == [format_value(v, unit) for v in values]
+        assert format_values(values[:5], unit).tolist() == [format_value(v, unit) for v in values[:5]]
+    assert format_values(np.ones((2, 3))).shape == (2, 3)
     print("✓ format_value OK")
 
 def test_find_best_color_match():
@@ -33,26 +61,552 @@ def test_find_best_color_match():
     assert match['band2'] == "nero"
     print("✓ find_best_color_match OK")
 
+def test_find_best_commercial_value():
+    print("Testing find_best_commercial_value...")
+    values = series_value_index(e_series["E12"])
+    assert len(values) == 12 * 10 and (values[1:] > values[:-1]).all()
+    match = find_best_commercial_value(4600, e_series["E12"])
+    assert abs(match['value'] - 4700) < 1e-9
+    assert abs(match['error'] - 100 / 46) < 1e-9
+    match = find_best_commercial_value(1e12, e_series["E12"])
+    assert abs(match['value'] - 82e6) < 1
+    assert find_best_commercial_value(1010, custom_values=[1000, 1200])['value'] == 1000
+    print("✓ find_best_commercial_value OK")
+
+def test_snap_to_series():
+    print("Testing snap_to_series...")
+    targets = [4600, 1050, 5e9]
+    matched, errors, candidates = snap_to_series(targets, "E12", k=2)
+    for t, m in zip(targets, matched):
+        assert m == find_best_commercial_value(t, e_series["E12"])['value']
+    assert candidates.shape == (3, 2) and candidates[1, 1] == 1200
+    matched, _, _ = snap_to_series([1050], "E12", mode="ceil")
+    assert matched[0] == 1200
+    matched, errors, _ = snap_to_series([0.001], "E12", mode="floor")
+    assert np.isnan(matched[0]) and np.isnan(errors[0])
+    matched, _, _ = snap_to_series([1010, 4000], custom_values=[1000, 1200, 3900])
+    assert list(matched) == [1000, 3900]
+    print("✓ snap_to_series OK")
+
 def test_power_logic():
     print("Testing power_logic...")
     res, error = calculate_power_logic(5, 0, 500, 0.125, "0805", 25)
     assert error is None
-    assert "0.0500 W" in res
+    assert abs(res.power - 0.05) < 1e-12
+    assert "0.0500 W" in render_report(res)
     print("✓ power_logic OK")
 
+def test_voltage_divider_logic():
+    print("Testing voltage_divider_logic...")
+    res, error = design_voltage_divider_logic(12, 3.3, e_series["E24"])
+    assert error is None
+    assert res.r1.size == 10
+    assert (np.diff(res.error) >= 0).all()
+    assert res.error[0] < 1
+    rows = [line for line in render_report(res).splitlines() if line.endswith("%")]
+    assert len(rows) == 10
+    res, error = design_voltage_divider_logic(10, 5, custom_values=[1000, 2200, 4700])
+    assert error is None and "1.000 kΩ        1.000 kΩ" in render_report(res)
+    print("✓ voltage_divider_logic OK")
+
+def test_divider_ratio_table():
+    print("Testing divider ratio table...")
+    previous = os.environ.get("RESISTOR_TOOL_CACHE")
+    os.environ["RESISTOR_TOOL_CACHE"] = tempfile.mkdtemp()
+    try:
+        for vout in (3.3, 1.8, 0.5):
+            expected, _ = design_voltage_divider_logic(12, vout, e_series["E24"])
+            table, _ = design_voltage_divider_logic(12, vout, e_series["E24"], backend="table")
+            assert render_report(table) == render_report(expected)
+        assert any(name.endswith("_ratio.npy") for name in os.listdir(os.environ["RESISTOR_TOOL_CACHE"]))
+        # Le tabelle aperte restano limitate anche con molti insiemi di valori (BOM diverse)
+        import divider_tables
+        for n in range(2, 2 + divider_tables.DIVIDER_TABLES_MAX_ENTRIES + 4):
+            divider_tables.load_divider_table(np.arange(1, n + 1, dtype=np.float64))
+        assert len(divider_tables._tables) == divider_tables.DIVIDER_TABLES_MAX_ENTRIES
+    finally:
+        if previous is None:
+            del os.environ["RESISTOR_TOOL_CACHE"]
+        else:
+            os.environ["RESISTOR_TOOL_CACHE"] = previous
+    print("✓ divider ratio table OK")
+
+def test_rc_filter_logic():
+    print("Testing rc_filter_logic...")
+    res, error = design_rc_filter_logic(1000, e_series["E24"], [1.0, 1.2, 1.5, 1.8, 2.2, 2.7, 3.3, 3.9, 4.7, 5.6, 6.8, 8.2])
+    assert error is None
+    assert res.r.size == 15
+    assert np.allclose(res.f_c, 1 / (2 * np.pi * res.r * res.c))
+    # C ideale = 109.8 nF: più vicino a 100 nF in valore assoluto, ma a 120 nF in scala logaritmica
+    r = 1 / (2 * np.pi * 1000 * 109.8e-9)
+    res, error = design_rc_filter_logic(1000, c_series_values=[1.0, 1.2], custom_values=[r])
+    assert error is None and res.c[0] == 120e-9
+    assert "0.120 µF" in render_report(res)
+    print("✓ rc_filter_logic OK")
+
+def test_synthesize_resistance_logic():
+    print("Testing synthesize_resistance_logic...")
+    res, error = synthesize_resistance_logic(37000, e_series["E12"], max_parts=2)
+    assert error is None
+    assert "10.000 kΩ + 27.000 kΩ" in render_report(res)
+    res, error = synthesize_resistance_logic(500, custom_values=[1000])
+    assert error is None
+    assert res.topology[0] == 2 and res.value[0] == 500
+    assert np.isnan(res.parts[0, 2])
+    rows = [line for line in render_report(res).splitlines() if line.endswith("%")]
+    assert rows[0].startswith("1.000 kΩ || 1.000 kΩ ")
+    res, error = synthesize_resistance_logic(1500, custom_values=[1000])
+    assert "1.000 kΩ + (1.000 kΩ || 1.000 kΩ)" in render_report(res)
+    print("✓ synthesize_resistance_logic OK")
+
 def test_regulator_logic():
     print("Testing regulator_logic...")
     res, error = calculate_regulator_logic(12, 5, "LM317", e_series["E24"])
     assert error is None
     # LM317 with R1=240 and Vout=5V usually gives ~4.8V or ~5.2V with E24
-    assert "V" in res
+    assert abs(res.vout[0] - 5) < 0.1
+    assert "V" in render_report(res)
+    res, error = calculate_regulator_logic(12, 5, "LM317", custom_values=[240, 720, 750, 10000])
+    assert error is None
+    rows = [line for line in render_report(res).splitlines() if line.endswith("%")]
+    assert rows[0].startswith("240.000 Ω  720.000 Ω")
+    assert 10000 not in res.r1  # 0.125 mA in R1: sotto il carico minimo
+    res, error = calculate_regulator_logic(12, 5, "LM317", custom_values=[10000, 22000])
+    assert res is None and error
     print("✓ regulator_logic OK")
 
+def test_result_cache():
+    print("Testing result_cache...")
+    cache = LRUResultCache(max_entries=2)
+    calls = []
+
+    @memoize(cache)
+    def double(x, custom_values=None):
+        calls.append(x)
+        return x * 2
+
+    assert double(1) == 2 and double(x=1) == 2
+    assert calls == [1] and cache.hits == 1 and cache.misses == 1
+    double(2)
+    double(3)  # supera max_entries: esce la voce meno recente (x=1)
+    assert len(cache) == 2 and cache.evictions == 1
+    double(1)
+    assert calls == [1, 2, 3, 1]
+    # Stessa BOM per contenuto -> stessa chiave; la BOM cambia -> nuova chiave
+    double(5, custom_values=list(range(100)))
+    double(5, custom_values=list(range(100)))
+    double(5, custom_values=list(range(1, 101)))
+    assert calls.count(5) == 2
+    assert cache.invalidate('bom') == 2 and len(cache) == 0
+    # int, float e bool con lo stesso valore sono chiavi diverse
+    assert double(True) == 2 and double(1.0) == 2.0 and type(double(1.0)) is float
+    assert calls[-2:] == [True, 1.0]
+
+    default_cache.invalidate()
+    first = design_voltage_divider_logic(12, 5, e_series["E24"])
+    hits = default_cache.hits
+    assert design_voltage_divider_logic(12, 5, e_series_values=list(e_series["E24"])) is first
+    assert default_cache.hits == hits + 1
+    # Il risultato condiviso non si può modificare per errore
+    try:
+        first[0].r1[0] = 0
+        assert False, "array in cache modificabile"
+    except ValueError:
+        pass
+    print("✓ result_cache OK")
+
+def test_monte_carlo_logic():
+    print("Testing monte_carlo_logic...")
+    res, error = run_monte_carlo_logic(10, 20000, 1000, 0.05, 2200, 0.05, seed=42)
+    assert error is None
+    values, theo = res.samples, res.theoretical
+    assert values.shape == (20000,)
+    assert abs(values.mean() - theo) < 0.01
+    assert 10 * 2090 / (1050 + 2090) <= values.min() and values.max() <= 10 * 2310 / (950 + 2310)
+    again, _ = run_monte_carlo_logic(10, 20000, 1000, 0.05, 2200, 0.05, seed=42)
+    assert (values == again.samples).all()
+    res32, _ = run_monte_carlo_logic(10, 100, 1000, 0.05, 2200, 0.05, seed=1, dtype=np.float32)
+    assert res32.samples.dtype == np.float32
+    print("✓ monte_carlo_logic OK")
+
+def test_monte_carlo_streaming():
+    print("Testing monte_carlo streaming...")
+    res, error = run_monte_carlo_logic(10, 50000, 1000, 0.05, 2200, 0.05, seed=7, chunk_size=4096)
+    assert error is None
+    stats = res.samples
+    assert stats.count == 50000 and stats.counts.sum() == 50000
+    assert abs(stats.mean - res.theoretical) < 0.01
+    assert stats.min <= stats.quantile(0.5) <= stats.max
+    assert "P50" in render_report(res)
+    assert "samples" not in res.to_dict()
+    full, _ = run_monte_carlo_logic(10, 50000, 1000, 0.05, 2200, 0.05, seed=7)
+    assert abs(stats.std - full.samples.std()) < 0.005
+    for chunk_size in (None, 4096):
+        res, error = run_monte_carlo_logic(10, 0, 1000, 0.05, 2200, 0.05, chunk_size=chunk_size)
+        assert res is None and error == "Il numero di iterazioni deve essere maggiore di zero."
+    print("✓ monte_carlo streaming OK")
+
+def test_monte_carlo_workers():
+    print("Testing monte_carlo workers...")
+    serial, _ = run_monte_carlo_logic(5, 40000, 4700, 0.01, 10000, 0.01, seed=123, chunk_size=5000)
+    parallel, error = run_monte_carlo_logic(5, 40000, 4700, 0.01, 10000, 0.01, seed=123, chunk_size=5000, workers=3)
+    assert error is None
+    serial, parallel = serial.samples, parallel.samples
+    assert serial.mean == parallel.mean and serial.m2 == parallel.m2
+    assert (serial.counts == parallel.counts).all()
+    assert (serial.head == parallel.head).all()
+    # Senza chunk_size il numero di worker non cambia né i campioni né il loro tipo
+    single, _ = run_monte_carlo_logic(5, 2000, 4700, 0.01, 10000, 0.01, seed=5, workers=1)
+    multi, _ = run_monte_carlo_logic(5, 2000, 4700, 0.01, 10000, 0.01, seed=5, workers=2)
+    assert isinstance(multi.samples, np.ndarray) and (single.samples == multi.samples).all()
+    print("✓ monte_carlo workers OK")
+
+def test_circuit_monte_carlo():
+    print("Testing circuit monte_carlo...")
+    tree = parse_circuit_expression("R1 + (R2 || R3)")
+    assert abs(evaluate_circuit(tree, {"R1": 1000, "R2": 2000, "R3": 2000}) - 2000) < 1e-9
+    assert parse_circuit_expression("R1 + R2 || R3") == tree
+    components = {"R1": (1000, 0.05), "R2": (2000, 0.05), "R3": (2000, 0.05)}
+    res, error = run_circuit_monte_carlo_logic("R1 + (R2 || R3)", components, 10000, seed=3)
+    assert error is None
+    assert abs(res.nominal - 2000) < 1e-9
+    assert 1900 - 1e-6 <= res.samples.min() and res.samples.max() <= 2100 + 1e-6
+    _, error = run_circuit_monte_carlo_logic("R1 + (R2 ||", components, 10)
+    assert error is not None
+    print("✓ circuit monte_carlo OK")
+
+def test_batch_jobs():
+    print("Testing batch jobs...")
+    jobs = [{"id": i, "type": "color_code", "value": 1000 + i} for i in range(10)]
+    jobs += [{"id": "smd", "type": "smd", "code": "103"}, {"id": "bad", "type": "divider", "vin": 12}]
+    serial = list(run_batch(jobs))
+    parallel = list(run_batch(jobs, workers=2, batch_size=3))
+    assert [r["id"] for r in parallel] == [job["id"] for job in jobs]
+    assert parallel == serial
+    assert serial[10]["result"]["value"] == 10000
+    assert serial[11]["error"] == "Parametro mancante: vout"
+    csv_jobs = list(read_jobs(io.StringIO("type,vin,vout,custom_values\ndivider,12,5,1000;2200\n"), "csv"))
+    assert csv_jobs == [{"type": "divider", "vin": 12, "vout": 5, "custom_values": [1000.0, 2200.0], "id": 2}]
+    smd_jobs = list(read_jobs(io.StringIO("type,code\nsmd,047\nsmd,000\n"), "csv"))
+    assert [job["code"] for job in smd_jobs] == ["047", "000"]
+    assert [run_job(job)["error"] for job in smd_jobs] == [None, None]
+    bad = list(read_jobs(io.StringIO('{"type": "smd", "code": "103"}\nnon json\n')))
+    assert bad[0]["id"] == 1 and "_invalid" in bad[1]
+    # Il percorso headless non deve caricare la GUI
+    loaded = subprocess.run([sys.executable, "-c", "import sys, main, batch; print(sorted(m for m in ('tkinter', 'matplotlib') if m in sys.modules))"],
+                            capture_output=True, text=True, check=True).stdout.strip()
+    assert loaded == "[]"
+    print("✓ batch jobs OK")
+
+def test_headless_imports():
+    print("Testing headless imports...")
+    # Il nucleo di calcolo (e utils, finché non si apre un dialogo) non carica GUI né pandas
+    code = ("import sys, units, logic, reports, utils; "
+            "print(sorted(m for m in ('tkinter', 'matplotlib', 'pandas', 'concurrent.futures.process') if m in sys.modules))")
+    loaded = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.strip()
+    assert loaded == "[]"
+    # main senza sottocomando (avvio della GUI) non importa i moduli dei comandi headless
+    code = ("import sys, main; main.run_gui = lambda: None; main.main([]); "
+            "print(sorted(m for m in ('numpy', 'asyncio', 'batch', 'server', 'bom_inventory') if m in sys.modules))")
+    loaded = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.strip()
+    assert loaded == "[]"
+    assert normalize_resistor_value("4,7Kohm") == 4700 and normalize_resistor_value("1k2") == 1200
+    assert normalize_resistor_value(float("nan")) is None and normalize_resistor_value("") is None
+    print("✓ headless imports OK")
+
+def test_view_registry():
+    print("Testing view registry...")
+    # La dashboard non carica né numpy né matplotlib: arrivano con le viste o col prewarm
+    code = "import sys, gui; print(sorted(m for m in ('numpy', 'matplotlib', 'pandas', 'logic') if m in sys.modules))"
+    loaded = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.strip()
+    assert loaded == "[]"
+    import gui
+    for module_name, _ in gui.TOOL_VIEWS.values():
+        assert callable(importlib.import_module(module_name).build)
+        assert module_name in gui.PREWARM_MODULES
+    print("✓ view registry OK")
+
+def test_diagnostics_report():
+    print("Testing diagnostics report...")
+    from run_diagnostics import _parse_importtime, check_thresholds
+    stderr = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       120 |        120 |   units\n"
+              "import time:      2000 |      95000 |   numpy\n"
+              "import time:       300 |      99000 | logic\n")
+    total, heaviest = _parse_importtime(stderr, "logic")
+    assert total == 99000 and heaviest[0] == {"module": "numpy", "ms": 95.0}
+    report = {"imports": {"logic": {"warm_ms": 99.0, "cold_ms": 500.0}}, "gui": {"skipped": "nessun display"}, "peak_rss_mb": 50.0,
+              "startup": {"ms": 30.0, "heavy_modules": []}}
+    violations = check_thresholds(report, {"import_warm_ms.logic": 80.0, "peak_rss_mb": 100.0, "construct_ms": 1.0, "startup_ms": 20.0})
+    assert violations == [{"metric": "import_warm_ms.logic", "value": 99.0, "limit": 80.0},
+                          {"metric": "startup_ms", "value": 30.0, "limit": 20.0}]
+    print("✓ diagnostics report OK")
+
+def test_benchmark_compare():
+    print("Testing benchmark compare...")
+    from benchmarks import summarize, compare_results, run_benchmarks
+    stats = summarize([0.001] * 9 + [0.011], items=100)
+    assert stats["p50_ms"] == 1.0 and stats["p99_ms"] > 9 and stats["throughput_per_s"] == 50000.0
+    baseline = {"results": {"a": {"p50_ms": 1.0}, "b": {"p50_ms": 0.01}, "c": {"p50_ms": 2.0}}}
+    current = {"results": {"a": {"p50_ms": 1.5}, "b": {"p50_ms": 0.03}, "c": {"p50_ms": 2.1}, "d": {"p50_ms": 1.0}}}
+    rows = compare_results(current, baseline, threshold=0.25)
+    # "b" è triplicato ma resta sotto la soglia di rumore; "d" non è nel baseline
+    assert [(case, regression) for case, _, _, _, regression in rows] == [("b", False), ("a", True), ("c", False)]
+    report = run_benchmarks(quick=True, only={"monte_carlo"})
+    assert set(report["results"]) == {"monte_carlo/1000", "monte_carlo/100000"}
+    print("✓ benchmark compare OK")
+
+def test_normalize_values():
+    print("Testing normalize_resistor_values...")
+    from units import normalize_resistor_values
+    expected = {
+        "4,7Kohm": 4700, "1k2": 1200, "10ohm": 10, "220": 220, "4R7": 4.7, "R47": 0.47, "4Ω7": 4.7,
+        "1M": 1e6, "2M2": 2.2e6, "1MEGohm": 1e6, "1meg": 1e6, "25mohm": 0.025, "25mΩ": 0.025, "1m": 1e-3,
+        "0ohm": 0, "61,9ohm": 61.9, "1 kΩ": 1000, "47K ohm": 47000, "100 Ohms": 100, "1e3": 1000, 330: 330,
+    }
+    for text, ohm in expected.items():
+        assert abs(normalize_resistor_value(text) - ohm) <= 1e-12 * ohm, text
+    cells = list(expected) + ["abc", "4.7k2", "ohm", "", "  ", None, float("nan")] + list(expected)
+    ohms, unparsed = normalize_resistor_values(cells)
+    assert unparsed.tolist() == [len(expected), len(expected) + 1, len(expected) + 2]
+    for i, cell in enumerate(cells):
+        scalar = normalize_resistor_value(cell)
+        assert (np.isnan(ohms[i]) and scalar is None) or ohms[i] == scalar, cell
+    # Anche da ndarray e su colonne grandi con pochi valori distinti
+    column = np.array(["4k7", "10R", "1M", "x"] * 25000, dtype=object)
+    ohms, unparsed = normalize_resistor_values(column)
+    assert ohms.shape == (100000,) and unparsed.size == 25000 and ohms[:3].tolist() == [4700, 10, 1e6]
+    print("✓ normalize_resistor_values OK")
+
+def test_bom_reader():
+    print("Testing BOM reader...")
+    from openpyxl import Workbook
+    from bom import iter_bom_rows, parse_bom_excel
+    # BOM reale: intestazione alla riga 4, REFDES con più designatori per riga
+    sample = os.path.join(os.path.dirname(os.path.abspath(__file__)), "BOM", "08090300405.xlsx")
+    rows = list(iter_bom_rows(sample))
+    assert rows and all(r.sheet == "LIDU" and r.refdes.startswith("R") and r.row > 4 for r in rows)
+    values, error = parse_bom_excel(sample)
+    assert error is None and values == sorted(values)
+    assert {4700.0, 402000.0, 1e6} <= set(values)
+
+    # Più fogli: quello senza intestazione si salta, righe vuote e non resistori ignorate
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "multi.xlsx")
+        wb = Workbook()
+        wb.active.title = "Note"
+        wb.active.append(["solo note"])
+        sheet = wb.create_sheet("Scheda A")
+        for row in (["Titolo"], ["RefDes", "Value", "Qty"], ["R1", "4K7", 1], ["C1", "100n", 1], [None, None], ["R2", 220, 2]):
+            sheet.append(row)
+        sheet = wb.create_sheet("Scheda B")
+        sheet.append(["REFDES", "VALUE"])
+        sheet.append(["R9", "1M"])
+        wb.save(path)
+        rows = list(iter_bom_rows(path))
+        assert [(r.sheet, r.row, r.refdes, r.value, r.qty) for r in rows] == [
+            ("Scheda A", 3, "R1", "4K7", 1), ("Scheda A", 6, "R2", 220, 2), ("Scheda B", 2, "R9", "1M", None)]
+        assert parse_bom_excel(path) == ([220.0, 4700.0, 1e6], None)
+
+        # Nessun foglio con VALUE/REFDES, file non Excel
+        wb = Workbook()
+        wb.active.append(["ITEM", "DESCRIPTION"])
+        wb.save(path)
+        values, error = parse_bom_excel(path)
+        assert values is None and "REFDES" in error
+        bad = os.path.join(tmp, "bad.xlsx")
+        with open(bad, "w") as f:
+            f.write("non excel")
+        assert parse_bom_excel(bad)[0] is None
+    print("✓ BOM reader OK")
+
+def test_bom_cache():
+    print("Testing BOM cache...")
+    import shutil
+    import bom_cache
+    from bom import parse_bom
+    sample = os.path.join(os.path.dirname(os.path.abspath(__file__)), "BOM", "08090300405.xlsx")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = os.path.join(tmp, "cache")
+        expected, _ = parse_bom(sample)
+        first, error = bom_cache.load_bom(sample, cache_dir)
+        assert error is None and len(first) == len(expected)
+        names = sorted(os.listdir(bom_cache.bom_cache_dir(cache_dir)))
+        assert len(names) == 2 and names[0].endswith(".json") and names[1].endswith(".npz")
+
+        # Seconda apertura dalla cache, anche di una copia con un altro nome: stesse colonne
+        copy = os.path.join(tmp, "copia.xlsx")
+        shutil.copy(sample, copy)
+        cached, error = bom_cache.load_bom(copy, cache_dir)
+        assert error is None and cached.sheets == expected.sheets
+        for name in ("sheet", "row", "refdes", "text", "values", "qty", "unparsed"):
+            assert np.array_equal(getattr(cached, name), getattr(expected, name), equal_nan=name in ("values", "qty")), name
+        assert len(os.listdir(bom_cache.bom_cache_dir(cache_dir))) == 2
+
+        # Header di un'altra versione: la voce viene ignorata e riscritta
+        json_path = os.path.join(bom_cache.bom_cache_dir(cache_dir), names[0])
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({"version": -1}, f)
+        bom_cache._known_digests.clear()
+        assert len(bom_cache.load_bom(sample, cache_dir)[0]) == len(expected)
+        with open(json_path, encoding="utf-8") as f:
+            assert json.load(f)["version"] == bom_cache.BOM_CACHE_VERSION
+
+        # Eliminazione per età e per spazio
+        assert bom_cache.evict_bom_cache(cache_dir, now=time.time()) == 0
+        assert bom_cache.evict_bom_cache(cache_dir, max_bytes=0) == 1
+        assert os.listdir(bom_cache.bom_cache_dir(cache_dir)) == []
+        bom_cache.load_bom(sample, cache_dir)
+        assert bom_cache.evict_bom_cache(cache_dir, max_age=60, now=time.time() + 3600) == 1
+        assert bom_cache.load_bom(os.path.join(tmp, "manca.xlsx"), cache_dir)[0] is None
+    print("✓ BOM cache OK")
+
+def test_bom_inventory():
+    print("Testing BOM inventory...")
+    import shutil
+    from openpyxl import Workbook
+    from bom_inventory import bulk_import_boms, write_inventory_csv
+    sample = os.path.join(os.path.dirname(os.path.abspath(__file__)), "BOM", "08090300405.xlsx")
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = os.path.join(tmp, "bom")
+        os.makedirs(os.path.join(folder, "sub"))
+        shutil.copy(sample, folder)
+        wb = Workbook()
+        for row in (["REFDES", "VALUE", "QTY"], ["R1", "4K7", 2], ["R2", "4700", 1], ["R3,R4", "1M", None], ["R5", "??", 1]):
+            wb.active.append(row)
+        wb.save(os.path.join(folder, "sub", "scheda.xlsx"))
+        with open(os.path.join(folder, "rotto.xlsx"), "w") as f:
+            f.write("non excel")
+        with open(os.path.join(folder, "~$scheda.xlsx"), "w") as f:
+            f.write("lock di Office")
+
+        calls = []
+        inventories = []
+        for workers in (1, 2):
+            inventory, error = bulk_import_boms(folder, workers=workers, cache_dir=os.path.join(tmp, "cache"),
+                                                progress=lambda *args: calls.append(args))
+            assert error is None
+            inventories.append(inventory)
+        assert sorted(call[:2] for call in calls) == sorted([(i, 3) for i in (1, 2, 3)] * 2)
+        serial, parallel = inventories
+        for name in ("values", "lines", "pieces", "project_ptr", "project_idx"):
+            assert np.array_equal(getattr(serial, name), getattr(parallel, name)), name
+        assert serial.projects == parallel.projects == ("08090300405", "scheda")
+        assert [os.path.basename(path) for path, _ in serial.errors] == ["rotto.xlsx"]
+
+        # 4K7 e 4700 sono lo stesso valore; senza QTY i pezzi sono i designatori (R3,R4)
+        rows = {value: row for value, *row in serial.rows()}
+        # (nella BOM di esempio 4.7k compare su 2 righe per 8 pezzi e 1M su una riga per 2 pezzi)
+        assert rows[4700.0] == [2 + 2, 8 + 3, 2, ["08090300405", "scheda"]]
+        assert rows[1e6] == [1 + 1, 2 + 2, 2, ["08090300405", "scheda"]]
+        single, _ = bulk_import_boms(os.path.join(folder, "sub"), workers=1, cache_dir=os.path.join(tmp, "cache"))
+        assert single.values.tolist() == [4700.0, 1e6] and single.lines.tolist() == [2, 1] and single.pieces.tolist() == [3, 2]
+        out = io.StringIO()
+        write_inventory_csv(single, out)
+        assert out.getvalue().splitlines()[1:] == ["4700,2,3,1,scheda", "1e+06,1,2,1,scheda"]
+        assert bulk_import_boms(os.path.join(tmp, "manca"))[0] is None
+    print("✓ BOM inventory OK")
+
+def test_bom_index():
+    print("Testing BOM index...")
+    from openpyxl import Workbook
+    from bom import parse_bom
+    from bom_index import BomIndex, index_from_files
+    sample = os.path.join(os.path.dirname(os.path.abspath(__file__)), "BOM", "08090300405.xlsx")
+    parsed, _ = parse_bom(sample)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scheda.xlsx")
+        wb = Workbook()
+        for row in (["REFDES", "VALUE", "QTY"], ["R1", "4K7", 2], ["R2,R3", "4.75k", None], ["R4", "1m", 1], ["R5", "??", 1]):
+            wb.active.append(row)
+        wb.save(path)
+        index, errors = index_from_files([sample, path, os.path.join(tmp, "manca.xlsx")], os.path.join(tmp, "cache"))
+    assert [os.path.basename(p) for p, _ in errors] == ["manca.xlsx"]
+    assert index.projects == ("08090300405", "scheda")
+    assert index.values.size == np.count_nonzero(~np.isnan(parsed.values)) + 3
+    assert np.all(np.diff(index.distinct) > 0) and index.starts[-1] == index.values.size
+
+    # Quali designatori usano 4.7k (2 righe nella BOM di esempio, 1 nella seconda)
+    assert index.refdes_for(4700) == ["R270", "R271", "R274", "R275", "R443", "R435", "R436", "R437", "R1"]
+    assert index.usage(4700)[-1] == ("scheda", "R1", 2.0, 2)
+    assert index.quantity(4700) == 8 + 2 and index.quantity(4750) == 2
+    assert index.refdes_for(4701) == [] and index.quantity(4701) == 0
+    # Valori entro ±2% (estremi inclusi) e valori distinti per decade
+    assert index.within(4700, 2).tolist() == [4700.0, 4750.0]
+    assert index.within(4700, 0).tolist() == [4700.0]
+    decades = index.decade_counts()
+    assert decades[-3] == 1 and sum(decades.values()) == np.count_nonzero(index.distinct > 0)
+    assert index.design_values() == sorted(set(parsed.distinct_values().tolist()) | {4750.0, 1e-3})
+
+    empty = BomIndex.build([])
+    assert len(empty) == 0 and not empty and empty.refdes_for(4700) == [] and empty.within(4700, 2).size == 0
+    assert empty.decade_counts() == {}
+    print("✓ BOM index OK")
+
+def test_server_batching():
+    print("Testing server batching...")
+
+    async def request(port, method, path, payload=None):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        body = json.dumps(payload).encode() if payload is not None else b""
+        writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+        status_line, _, data = (await reader.read()).partition(b"\r\n\r\n")
+        writer.close()
+        return int(status_line.split()[1]), json.loads(data)
+
+    async def scenario():
+        started = asyncio.get_running_loop().create_future()
+        task = asyncio.create_task(serve(0, workers=1, ready=lambda server, service: started.set_result((server, service))))
+        server, service = await started
+        port = server.sockets[0].getsockname()[1]
+        try:
+            replies = await asyncio.gather(*(request(port, "POST", "/nearest", {"value": 1000 + i, "series": "E12"}) for i in range(50)))
+            assert [r[1]["matched"] for r in replies] == snap_to_series([1000 + i for i in range(50)], "E12")[0].tolist()
+            assert service.nearest.items == 50 and service.nearest.batches < 50
+            status, reply = await request(port, "POST", "/color_code", {"values": [4700, 1000]})
+            assert status == 200 and reply["result"][0]["band1"] == "giallo"
+            status, reply = await request(port, "POST", "/divider", {"vin": 12, "vout": 3.3})
+            assert status == 200 and len(reply["result"]["r1"]) == 10
+            status, reply = await request(port, "POST", "/divider", {"vin": 12})
+            assert status == 422 and reply["error"] == "Parametro mancante: vout"
+            status, _ = await request(port, "GET", "/nope")
+            assert status == 404
+
+            async def broken(body):
+                raise RuntimeError("guasto")
+            service.routes[("GET", "/broken")] = broken
+            status, reply = await request(port, "GET", "/broken")
+            assert status == 500 and "guasto" in reply["error"]
+            status, metrics = await request(port, "GET", "/metrics")
+            assert metrics["latency"]["/nearest"]["count"] == 50
+            assert "/nope" not in metrics["latency"] and metrics["latency"][UNKNOWN_ROUTE]["count"] == 1
+            # k limitato, valori non positivi rifiutati come in /color_code
+            for body in ({"value": 1000, "k": 10 ** 9}, {"value": 1000, "k": 0}, {"value": 0}, {"values": [1000, -5]}):
+                status, reply = await request(port, "POST", "/nearest", body)
+                assert status == 400, body
+            status, reply = await request(port, "POST", "/nearest", {"value": 1000, "k": 3, "custom_values": [1000]})
+            assert status == 200 and reply["candidates"] == [1000, None, None]
+        finally:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    asyncio.run(scenario())
+    hist = LatencyHistogram()
+    for ms in range(1, 101):
+        hist.record(ms / 1000)
+    assert 0.05 <= hist.quantile(0.5) <= 0.05 * 2 ** 0.25
+    print("✓ server batching OK")
+
 def test_awg_logic():
     print("Testing awg_logic...")
     res, error = convert_awg_logic(22)
     assert error is None
-    assert "0.644 mm" in res
+    assert res.diameter_mm == 0.644
+    assert "0.644 mm" in render_report(res)
     print("✓ awg_logic OK")
 
 def test_glossary_logic():
@@ -65,8 +619,30 @@ if __name__ == "__main__":
     try:
         test_format_value()
         test_find_best_color_match()
+        test_find_best_commercial_value()
+        test_snap_to_series()
         test_power_logic()
+        test_voltage_divider_logic()
+        test_divider_ratio_table()
+        test_rc_filter_logic()
+        test_synthesize_resistance_logic()
         test_regulator_logic()
+        test_result_cache()
+        test_monte_carlo_logic()
+        test_monte_carlo_streaming()
+        test_monte_carlo_workers()
+        test_circuit_monte_carlo()
+        test_batch_jobs()
+        test_headless_imports()
+        test_view_registry()
+        test_diagnostics_report()
+        test_benchmark_compare()
+        test_normalize_values()
+        test_bom_reader()
+        test_bom_cache()
+        test_bom_inventory()
+        test_bom_index()
+        test_server_batching()
         test_awg_logic()
         test_glossary_logic()
         print("\nALL TESTS PASSED!")
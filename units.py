@@ -0,0 +1,127 @@
+
+# Formattazione dei valori con prefissi SI e lettura dei valori scritti a mano
+# (es. nelle BOM). Modulo senza dipendenze grafiche né pandas, usato sia dalla
+# GUI sia dai percorsi headless (batch, server).
+import re
+
+def format_value(value, unit='Ω'):
+    """Formatta il valore con il prefisso appropriato (da Giga a Micro)"""
+    abs_val = abs(value)
+    if abs_val >= 1e9:
+        return f"{value / 1e9:.3f} G{unit}"
+    if abs_val >= 1e6:
+        return f"{value / 1e6:.3f} M{unit}"
+    elif abs_val >= 1e3:
+        return f"{value / 1e3:.3f} k{unit}"
+    elif abs_val >= 1 or abs_val == 0:
+        return f"{value:.3f} {unit}"
+    elif abs_val >= 1e-3:
+        return f"{value * 1e3:.3f} m{unit}"
+    else:
+        return f"{value * 1e6:.3f} µ{unit}"
+
+# Prefissi di format_value: (simbolo, operazione che porta il valore nella scala del prefisso)
+_SI_PREFIXES = (
+    ("G", lambda v: v / 1e9), ("M", lambda v: v / 1e6), ("k", lambda v: v / 1e3),
+    ("", lambda v: v), ("m", lambda v: v * 1e3), ("µ", lambda v: v * 1e6),
+)
+# Sotto questa dimensione il ciclo su format_value costa meno del setup vettoriale
+_FORMAT_VALUES_MIN_SIZE = 64
+
+def format_values(values, unit='Ω'):
+    """
+    Versione vettorizzata di format_value: restituisce un ndarray (object) di stringhe
+    identiche a quelle di format_value, con la stessa forma di `values`.
+    Il prefisso è scelto con confronti vettoriali sulle stesse soglie della versione
+    scalare; poi ogni gruppo di valori con lo stesso prefisso viene formattato con
+    una sola operazione '%' su un modello ripetuto, invece di una f-string per valore.
+    """
+    import numpy as np  # locale: format_value e la GUI all'avvio non richiedono numpy
+    values = np.asarray(values, dtype=np.float64)
+    flat = values.ravel()
+    out = np.empty(flat.size, dtype=object)
+    if flat.size < _FORMAT_VALUES_MIN_SIZE:
+        out[:] = [format_value(v, unit) for v in flat.tolist()]
+        return out.reshape(values.shape)
+    abs_val = np.abs(flat)
+    conditions = [abs_val >= 1e9, abs_val >= 1e6, abs_val >= 1e3, (abs_val >= 1) | (abs_val == 0), abs_val >= 1e-3]
+    prefix = np.select(conditions, np.arange(len(conditions)), len(conditions))
+    for code, (symbol, scale) in enumerate(_SI_PREFIXES):
+        idx = np.flatnonzero(prefix == code)
+        if idx.size:
+            template = "%.3f " + f"{symbol}{unit}".replace("%", "%%") + "\0"
+            out[idx] = ((template * idx.size) % tuple(scale(flat[idx]).tolist())).split("\0")[:-1]
+    return out.reshape(values.shape)
+
+# Valore di resistenza scritto a mano, una riga per valore (re.M): mantissa, prefisso e
+# cifre dopo il prefisso ('4k7', '4R7', 'R47', '1MEG', '25mΩ'), unità facoltativa.
+# Maiuscole e minuscole contano solo per M (mega) e m (milli). Una riga che non è un
+# valore valido finisce nel gruppo 'bad', così ogni riga produce esattamente un match.
+_VALUE_PATTERN = re.compile(r"""
+    ^(?:
+        (?P<mant>(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)?
+        [ \t]*
+        (?:(?P<prefix>[Mm][Ee][Gg]|[GMkKmRrΩ])(?P<tail>\d+)?)?
+        [ \t]*(?:(?i:ohms?)|Ω)?
+    |(?P<bad>.*))$
+""", re.VERBOSE | re.MULTILINE)
+# Moltiplicatore di ogni prefisso; R e Ω fanno da punto decimale ('4R7' = 4.7)
+_PREFIX_MULTIPLIERS = {None: 1.0, "R": 1.0, "r": 1.0, "Ω": 1.0, "k": 1e3, "K": 1e3, "m": 1e-3, "M": 1e6, "G": 1e9}
+
+def _clean_value_text(cell):
+    """Testo da interpretare ('' per celle vuote): virgola decimale e spazi normalizzati."""
+    if cell is None or cell != cell:  # None o NaN (float o numpy, l'unico valore diverso da sé stesso)
+        return ""
+    return str(cell).strip().replace(",", ".").replace("\n", " ")
+
+def _match_ohm(match):
+    """Ohm di un match di _VALUE_PATTERN, None se la riga non è un valore."""
+    mant, prefix, tail = match.group("mant", "prefix", "tail")
+    if match.group("bad") is not None or not (mant or tail):
+        return None
+    if tail and mant and not mant.isdigit():  # '4.7k2', '1e3k5'
+        return None
+    number = float(f"{mant or 0}.{tail}" if tail else mant)
+    multiplier = 1e6 if prefix and len(prefix) == 3 else _PREFIX_MULTIPLIERS[prefix]  # 'meg' in ogni grafia
+    return number * multiplier
+
+def normalize_resistor_value(val_str):
+    """Converte stringhe come '4,7Kohm', '1k2', '4R7', '1MEG', '25mohm' in float (Ohm)."""
+    if isinstance(val_str, (int, float)) and not isinstance(val_str, bool):
+        return float(val_str) if val_str == val_str else None
+    text = _clean_value_text(val_str)
+    if not text:
+        return None
+    return _match_ohm(_VALUE_PATTERN.match(text))
+
+def normalize_resistor_values(values):
+    """
+    Versione per colonne di normalize_resistor_value (lista, ndarray o Series).
+    Restituisce (ohm, non_interpretate): un ndarray float64 con NaN per le celle vuote o
+    non valide, e gli indici delle celle non vuote che non è stato possibile leggere.
+    Le BOM ripetono pochi valori su molte righe: si interpretano solo i valori distinti,
+    tutti insieme con una sola scansione di _VALUE_PATTERN sul testo unito, e il
+    risultato torna sulle righe con un indice numpy.
+    """
+    import numpy as np  # locale, come in format_values
+    cells = values.tolist() if hasattr(values, "tolist") else list(values)
+    distinct = {}
+    codes = np.fromiter((distinct.setdefault(cell, len(distinct)) for cell in cells), dtype=np.intp, count=len(cells))
+    ohms = np.full(len(distinct), np.nan)
+    bad = np.zeros(len(distinct), dtype=bool)
+    texts, text_slots = [], []
+    for slot, cell in enumerate(distinct):
+        if isinstance(cell, (int, float, np.number)) and not isinstance(cell, (bool, np.bool_)):
+            ohms[slot] = cell  # i NaN restano celle vuote
+            continue
+        text = _clean_value_text(cell)
+        if text:
+            texts.append(text)
+            text_slots.append(slot)
+    for slot, match in zip(text_slots, _VALUE_PATTERN.finditer("\n".join(texts))):
+        ohm = _match_ohm(match)
+        if ohm is None:
+            bad[slot] = True
+        else:
+            ohms[slot] = ohm
+    return ohms[codes], np.flatnonzero(bad[codes])
@@ -1,106 +1,123 @@
 
-import tkinter as tk
-from tkinter import messagebox, filedialog
+# Funzioni di supporto della GUI (menu, dialoghi, progetti, BOM).
+# tkinter è importato al primo uso: importare utils (o i moduli di calcolo che ne
+# usano le funzioni di formattazione) non richiede Tk. La lettura delle BOM è in bom.py.
 import json
 import os
-try:
-    import pandas as pd
-except ImportError:
-    pd = None
-
-def normalize_resistor_value(val_str):
-    """Converte stringhe come '4,7Kohm', '1k2', '10ohm' in float (Ohm)."""
-    if pd.isna(val_str) or not str(val_str).strip():
-        return None
-    s = str(val_str).lower().replace(',', '.').replace('ohm', '').strip()
-    
-    multiplier = 1.0
-    if 'k' in s:
-        multiplier = 1e3
-        parts = s.split('k')
-        if parts[0] and parts[1]: # 1k2 case -> 1.2k
-            try:
-                dec_val = float(parts[1])
-                return (float(parts[0]) + dec_val / (10**len(parts[1]))) * multiplier
-            except ValueError: pass
-        s = s.replace('k', '')
-    elif 'm' in s and 'meg' not in s: # handle M or Meg
-        multiplier = 1e6
-        s = s.replace('m', '')
-    elif 'meg' in s:
-        multiplier = 1e6
-        s = s.replace('meg', '')
-    
-    try:
-        return float(s) * multiplier
-    except ValueError:
-        return None
-
-def parse_bom_excel(file_path):
-    """Legge un file Excel e restituisce un set di valori Ohm unici per i resistori."""
-    if not pd:
-        return None, "Libreria pandas non trovata."
-    try:
-        # Trova header automaticamente
-        df_raw = pd.read_excel(file_path, header=None, nrows=20)
-        header_row = -1
-        for i, row in df_raw.iterrows():
-            row_values = [str(x).strip().lower() for x in row.values]
-            if 'value' in row_values and 'refdes' in row_values:
-                header_row = i
-                break
-        
-        if header_row == -1:
-            return None, "Formato BOM non riconosciuto (colonne 'VALUE' e 'REFDES' non trovate)."
-        
-        df = pd.read_excel(file_path, header=header_row)
-        # Normalizziamo i nomi delle colonne per sicurezza (tutti in minuscolo)
-        df.columns = [str(c).strip().lower() for c in df.columns]
-        
-        # Filtra resistori: Reference che inizia con 'r' (case-insensitive)
-        res_df = df[df['refdes'].astype(str).str.upper().str.startswith('R', na=False)]
-        
-        values = set()
-        for v in res_df['value']:
-            norm_v = normalize_resistor_value(v)
-            if norm_v is not None:
-                values.add(norm_v)
-        
-        return sorted(list(values)), None
-    except Exception as e:
-        return None, str(e)
+from units import format_value, format_values, normalize_resistor_value
+from bom import parse_bom_excel
+
+def run_in_background(app, work, done, poll_ms=50, tick=None):
+    """
+    Esegue work() in un thread, senza bloccare il main loop di Tk. Al termine done(future)
+    viene chiamata dal main loop (controllo periodico con after): solo lì si toccano i widget.
+    tick(), se indicata, è chiamata a ogni controllo finché il lavoro è in corso (es. avanzamento).
+    """
+    import threading
+    from concurrent.futures import Future
+    future = Future()
+
+    def target():
+        try:
+            future.set_result(work())
+        except BaseException as e:
+            future.set_exception(e)
+
+    def poll():
+        if future.done():
+            done(future)
+        else:
+            if tick:
+                tick()
+            app.root.after(poll_ms, poll)
+
+    threading.Thread(target=target, daemon=True).start()
+    app.root.after(poll_ms, poll)
+    return future
 
 def import_bom(app):
+    from tkinter import messagebox, filedialog
     path = filedialog.askopenfilename(filetypes=[('Excel', '*.xlsx *.xls')])
     if path:
-        values, error = parse_bom_excel(path)
+        # Una BOM già aperta in passato si rilegge dalla cache su disco (bom_cache)
+        from bom_cache import load_bom
+        parsed, error = load_bom(path)
         if error:
             messagebox.showerror("Errore BOM", error)
         else:
-            app.bom_values = values
+            from result_cache import default_cache
+            from bom_index import BomIndex
+            from bom_inventory import project_name
+            app.bom_index = BomIndex.build([(project_name(path), parsed)])
+            app.bom_inventory = None
+            # I risultati calcolati sulla BOM precedente non servono più
+            default_cache.invalidate('bom')
             app.bom_path.set(os.path.basename(path))
-            messagebox.showinfo("BOM Caricata", f"Caricati {len(values)} valori univoci di resistenze dalla BOM.")
+            message = f"Caricati {len(app.bom_index)} valori univoci di resistenze dalla BOM."
+            if parsed.unparsed.size:
+                rows = ", ".join(f"{parsed.sheets[parsed.sheet[i]]}:{parsed.row[i]} ('{parsed.text[i]}')" for i in parsed.unparsed[:5])
+                message += f"\n\n{parsed.unparsed.size} righe con valore non riconosciuto, es. {rows}."
+            messagebox.showinfo("BOM Caricata", message)
             if hasattr(app, 'update_bom_status'):
                 app.update_bom_status()
 
 
-def format_value(value, unit='Ω'):
-    """Formatta il valore con il prefisso appropriato (da Giga a Micro)"""
-    abs_val = abs(value)
-    if abs_val >= 1e9:
-        return f"{value / 1e9:.3f} G{unit}"
-    if abs_val >= 1e6:
-        return f"{value / 1e6:.3f} M{unit}"
-    elif abs_val >= 1e3:
-        return f"{value / 1e3:.3f} k{unit}"
-    elif abs_val >= 1 or abs_val == 0:
-        return f"{value:.3f} {unit}"
-    elif abs_val >= 1e-3:
-        return f"{value * 1e3:.3f} m{unit}"
-    else:
-        return f"{value * 1e6:.3f} µ{unit}"
+def import_bom_folder(app):
+    """Inventario di tutte le BOM di una cartella (bom_inventory); le loro righe diventano l'indice della BOM attiva."""
+    from tkinter import messagebox, filedialog
+    running = getattr(app, 'bom_import_future', None)
+    if running is not None and not running.done():
+        messagebox.showinfo("BOM", "Importazione di una cartella già in corso.")
+        return
+    directory = filedialog.askdirectory(title="Cartella delle BOM")
+    if not directory:
+        return
+    from bom_inventory import bulk_import_boms
+    from bom_index import index_from_files
+    # La lettura gira in un thread: il callback di avanzamento non tocca Tk, lascia solo
+    # l'ultimo messaggio che il main loop mostra nella barra di stato
+    latest = ["Lettura delle BOM..."]
+
+    def progress(done, total, path, error):
+        latest[0] = f"BOM {done}/{total}: {os.path.basename(path)}{' (errore)' if error else ''}"
+
+    def work():
+        inventory, error = bulk_import_boms(directory, progress=progress)
+        if error:
+            return None, None, error
+        # Le BOM appena lette sono in cache: l'indice per valore si costruisce in pochi ms per file
+        index, _ = index_from_files(inventory.files)
+        return inventory, index, None
+
+    def finished(future):
+        try:
+            inventory, index, error = future.result()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        if error:
+            app.status.set("Pronto")
+            messagebox.showerror("Errore BOM", error)
+            return
+        from result_cache import default_cache
+        app.bom_index = index
+        app.bom_inventory = inventory
+        default_cache.invalidate('bom')
+        app.bom_path.set(f"{os.path.basename(os.path.normpath(directory))} ({len(inventory.files)} BOM)")
+        app.status.set(f"Inventario BOM: {len(inventory.files)} file, {len(inventory)} valori distinti")
+        message = f"Lette {len(inventory.files)} BOM: {len(inventory)} valori univoci di resistenze."
+        if inventory.errors:
+            failed = "\n".join(f"- {os.path.basename(path)}: {err}" for path, err in inventory.errors[:5])
+            message += f"\n\n{len(inventory.errors)} file non letti:\n{failed}"
+        messagebox.showinfo("BOM Caricate", message)
+        if hasattr(app, 'update_bom_status'):
+            app.update_bom_status()
+
+    app.status.set(latest[0])
+    app.bom_import_future = run_in_background(app, work, finished, tick=lambda: app.status.set(latest[0]))
 
 def export_results(app):
+    import tkinter as tk
+    from tkinter import messagebox, filedialog
     try:
         content = ''
         # raccoglie contenuti visibili
@@ -125,6 +142,7 @@ def export_results(app):
         messagebox.showerror('Errore export', str(e))
 
 def show_quick_help():
+    from tkinter import messagebox
     help_text = (
         "Guida all'Apprendimento:\n\n"
         "Questo tool è progettato per essere anche uno strumento didattico. Ogni scheda ti guida attraverso un concetto chiave:\n\n"
@@ -136,6 +154,7 @@ def show_quick_help():
     messagebox.showinfo('Guida Rapida all\'Apprendimento', help_text)
 
 def show_about():
+    from tkinter import messagebox
     about = '''Electronic Tool — v1.2 (Educational & Standard-Aware)
 Autore: Samu
 
@@ -149,6 +168,7 @@ I valori di potenza e le tolleranze sono indicativi. Per progetti professionali,
     messagebox.showinfo('Informazioni e Disclaimer', about)
 
 def create_menu(app):
+    import tkinter as tk
     menubar = tk.Menu(app.root)
 
     # File
@@ -166,6 +186,7 @@ def create_menu(app):
     # BOM
     bom_menu = tk.Menu(menubar, tearoff=0)
     bom_menu.add_command(label='Importa BOM Excel...', command=lambda: import_bom(app))
+    bom_menu.add_command(label='Importa cartella di BOM...', command=lambda: import_bom_folder(app))
     bom_menu.add_checkbutton(label='Attiva Modalità BOM', variable=app.use_bom)
     bom_menu.add_separator()
     bom_menu.add_command(label='Rimuovi BOM', command=app.clear_bom)
@@ -209,6 +230,7 @@ def create_menu(app):
 
 def save_project(app):
     """Salva lo stato corrente dell'applicazione in un file JSON."""
+    from tkinter import messagebox, filedialog
     data = {
         "color": {
             "num_bands": app.num_bands.get(),
@@ -230,6 +252,8 @@ def save_project(app):
 
 def load_project(app):
     """Carica lo stato dell'applicazione da un file JSON."""
+    import tkinter as tk
+    from tkinter import messagebox, filedialog
     path = filedialog.askopenfilename(filetypes=[('JSON', '*.json')])
     if not path: return
     try:
@@ -244,7 +268,8 @@ def load_project(app):
             app.tolerance_var.set(c.get("tolerance", "oro"))
             app.value_entry.delete(0, tk.END)
             app.value_entry.insert(0, c.get("target_value", "1000"))
-            app.update_resistor_drawing()
+            from views.color import update_resistor_drawing
+            update_resistor_drawing(app)
         messagebox.showinfo('Carica', 'Progetto caricato con successo')
     except Exception as e:
         messagebox.showerror('Errore Carica', str(e))
@@ -0,0 +1,3 @@
+
+# Viste dei singoli strumenti di ElectronicTool (una per modulo, caricate su richiesta
+# da gui.TOOL_VIEWS). Ogni modulo espone build(app), che costruisce la vista in app.main_container.
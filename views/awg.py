@@ -0,0 +1,25 @@
+
+# Vista Tabella cavi AWG.
+import tkinter as tk
+from tkinter import ttk
+from tkinter.scrolledtext import ScrolledText
+from reports import render_report
+from logic import convert_awg_logic
+from resistor_lib import awg_table
+
+def build(app):
+    awg_frame = ttk.LabelFrame(app.main_container, text="Convertitore AWG / Metrico")
+    awg_frame.pack(fill=tk.X, padx=10, pady=10)
+    ttk.Label(awg_frame, text="Seleziona AWG:").pack(side=tk.LEFT, padx=5, pady=10)
+    app.awg_var = tk.IntVar(value=22)
+    app.awg_combo = ttk.Combobox(awg_frame, textvariable=app.awg_var, values=list(awg_table.keys()), width=10)
+    app.awg_combo.pack(side=tk.LEFT, padx=5)
+    ttk.Button(awg_frame, text="Mostra Dati", command=lambda: show_awg_data(app)).pack(side=tk.LEFT, padx=5)
+
+    app.awg_result_text = ScrolledText(app.main_container, height=10, width=80)
+    app.awg_result_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+def show_awg_data(app):
+    res, error = convert_awg_logic(app.awg_var.get())
+    app.awg_result_text.delete(1.0, tk.END)
+    app.awg_result_text.insert(1.0, render_report(res) if res is not None else error)
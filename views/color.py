@@ -0,0 +1,102 @@
+
+# Vista Codice Colori: decodifica delle bande (IEC 60062) e ricerca del valore commerciale.
+import tkinter as tk
+from tkinter import ttk, messagebox
+from tkinter.scrolledtext import ScrolledText
+from reports import render_report
+from logic import calculate_color_code_logic, find_color_code_logic
+
+def build(app):
+    input_frame = ttk.LabelFrame(app.main_container, text="1. Decodifica Codice Colori (IEC 60062)")
+    input_frame.pack(fill=tk.X, padx=10, pady=10)
+    bands_frame = ttk.Frame(input_frame)
+    bands_frame.pack(fill=tk.X, padx=5, pady=5)
+    ttk.Label(bands_frame, text="Numero bande:").grid(row=0, column=4, padx=5, pady=5)
+    app.num_bands = tk.IntVar(value=4)
+    ttk.Radiobutton(bands_frame, text="4", variable=app.num_bands, value=4, command=lambda: update_band_visibility(app)).grid(row=0, column=5)
+    ttk.Radiobutton(bands_frame, text="5", variable=app.num_bands, value=5, command=lambda: update_band_visibility(app)).grid(row=0, column=6)
+    ttk.Label(bands_frame, text="Banda 1:").grid(row=0, column=0, padx=5, pady=5)
+    app.band1_var = tk.StringVar()
+    app.band1_combo = ttk.Combobox(bands_frame, textvariable=app.band1_var, values=list(app.color_codes.keys())[:-2], width=12)
+    app.band1_combo.grid(row=0, column=1, padx=5, pady=5)
+    app.band1_combo.set("marrone")
+    ttk.Label(bands_frame, text="Banda 2:").grid(row=0, column=2, padx=5, pady=5)
+    app.band2_var = tk.StringVar()
+    app.band2_combo = ttk.Combobox(bands_frame, textvariable=app.band2_var, values=list(app.color_codes.keys()), width=12)
+    app.band2_combo.grid(row=0, column=3, padx=5, pady=5)
+    app.band2_combo.set("nero")
+    ttk.Label(bands_frame, text="Banda 3 (Moltiplicatore):").grid(row=1, column=0, padx=5, pady=5)
+    app.multiplier_var = tk.StringVar()
+    app.multiplier_combo = ttk.Combobox(bands_frame, textvariable=app.multiplier_var, values=list(app.color_codes.keys()), width=12)
+    app.multiplier_combo.grid(row=1, column=1, padx=5, pady=5)
+    app.multiplier_combo.set("rosso")
+    ttk.Label(bands_frame, text="Tolleranza:").grid(row=1, column=2, padx=5, pady=5)
+    app.tolerance_var = tk.StringVar()
+    app.tolerance_combo = ttk.Combobox(bands_frame, textvariable=app.tolerance_var, values=list(app.tolerance_colors.keys()), width=12)
+    app.tolerance_combo.grid(row=1, column=3, padx=5, pady=5)
+    app.tolerance_combo.set("oro")
+    calc_btn = ttk.Button(input_frame, text="Decodifica e Spiega", command=lambda: calculate_color_code(app))
+    calc_btn.pack(pady=10)
+    draw_frame = ttk.Frame(app.main_container)
+    draw_frame.pack(fill=tk.X, padx=10, pady=5)
+    app.res_canvas = tk.Canvas(draw_frame, width=440, height=80, bg='#FFFFFF', highlightthickness=1, highlightbackground='#CCCCCC')
+    app.res_canvas.pack(side=tk.LEFT, padx=5)
+    update_resistor_drawing(app)
+    result_frame = ttk.LabelFrame(app.main_container, text="Analisi e Spiegazione")
+    result_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    app.color_result_text = ScrolledText(result_frame, height=10, width=60, wrap=tk.WORD)
+    app.color_result_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+    value_frame = ttk.LabelFrame(app.main_container, text="2. Trova Valore Commerciale e Codice (IEC 60063)")
+    value_frame.pack(fill=tk.X, padx=10, pady=10)
+    ttk.Label(value_frame, text="Valore Desiderato (Ω):").grid(row=0, column=0, padx=5, pady=5)
+    app.value_entry = ttk.Entry(value_frame, width=15)
+    app.value_entry.grid(row=0, column=1, padx=5, pady=5)
+    app.value_entry.insert(0, "1000")
+    find_btn = ttk.Button(value_frame, text="Trova e Spiega", command=lambda: find_color_code(app))
+    find_btn.grid(row=0, column=2, padx=10, pady=5)
+
+def calculate_color_code(app):
+    result, error = calculate_color_code_logic(app.color_codes, app.tolerance_colors, app.band1_var.get(), app.band2_var.get(), app.multiplier_var.get(), app.tolerance_var.get())
+    if error: messagebox.showerror("Errore", error)
+    else: 
+        app.color_result_text.delete(1.0, tk.END)
+        app.color_result_text.insert(1.0, render_report(result))
+    update_resistor_drawing(app)
+
+def update_band_visibility(app):
+    update_resistor_drawing(app)
+
+def update_resistor_drawing(app):
+    try: app.res_canvas.delete('all')
+    except Exception: return
+    w = 440; h = 80
+    app.res_canvas.create_rectangle(40, 20, 400, 60, fill='#F0F0F0', outline='#333333')
+    app.res_canvas.create_line(0, 40, 40, 40, width=3, fill='#333333')
+    app.res_canvas.create_line(400, 40, w, 40, width=3, fill='#333333')
+    band_colors = []
+    try:
+        band_colors.append(app.color_codes[app.band1_var.get()][1])
+        band_colors.append(app.color_codes[app.band2_var.get()][1])
+        band_colors.append(app.color_codes[app.multiplier_var.get()][1])
+        band_colors.append(app.tolerance_colors[app.tolerance_var.get()][1])
+    except Exception: band_colors = ['#000000'] * 4
+    n = app.num_bands.get()
+    if n == 5:
+        band_positions = [80, 140, 200, 260, 320]
+        try:
+            mid_color = app.color_codes.get(app.band2_var.get(), ('', '#000000'))[1]
+            band_colors = [app.color_codes[app.band1_var.get()][1], mid_color, app.color_codes[app.band2_var.get()][1], app.color_codes[app.multiplier_var.get()][1], app.tolerance_colors[app.tolerance_var.get()][1]]
+        except Exception: band_colors = ['#000000'] * 5
+    else: band_positions = [110, 170, 230, 290]
+    for i, pos in enumerate(band_positions[:len(band_colors)]): app.res_canvas.create_rectangle(pos-8, 22, pos+8, 58, fill=band_colors[i], outline='')
+
+def find_color_code(app):
+    try:
+        value = float(app.value_entry.get())
+        custom = app.bom_design_values()
+        result, error = find_color_code_logic(value, app.e_series, custom_values=custom)
+        if error: messagebox.showwarning("Attenzione", error)
+        else: 
+            app.color_result_text.delete(1.0, tk.END)
+            app.color_result_text.insert(1.0, render_report(result))
+    except ValueError: messagebox.showerror("Errore", "Inserisci un valore numerico valido")
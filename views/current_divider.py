@@ -0,0 +1,35 @@
+
+# Vista Ripartitore di Corrente.
+import tkinter as tk
+from tkinter import ttk, messagebox
+from tkinter.scrolledtext import ScrolledText
+from reports import render_report
+from logic import calculate_current_divider_logic
+
+def build(app):
+    div_frame = ttk.LabelFrame(app.main_container, text="Ripartitore di Corrente")
+    div_frame.pack(fill=tk.X, padx=10, pady=10)
+    ttk.Label(div_frame, text="Corrente Totale (A):").pack(side=tk.LEFT, padx=5, pady=10)
+    app.div_curr_entry = ttk.Entry(div_frame, width=10)
+    app.div_curr_entry.pack(side=tk.LEFT, padx=5)
+    app.div_curr_entry.insert(0, "1.0")
+
+    ttk.Label(div_frame, text="Resistenze (es: 100, 220):").pack(side=tk.LEFT, padx=5)
+    app.div_res_entry = ttk.Entry(div_frame, width=20)
+    app.div_res_entry.pack(side=tk.LEFT, padx=5)
+
+    ttk.Button(div_frame, text="Calcola Branch", command=lambda: calculate_divider(app)).pack(side=tk.LEFT, padx=5)
+
+    app.div_result_text = ScrolledText(app.main_container, height=15, width=80)
+    app.div_result_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+def calculate_divider(app):
+    try:
+        itot = float(app.div_curr_entry.get())
+        ress = [float(r.strip()) for r in app.div_res_entry.get().split(",") if r.strip()]
+        res, error = calculate_current_divider_logic(itot, ress)
+        if error: messagebox.showerror("Errore", error)
+        else:
+            app.div_result_text.delete(1.0, tk.END)
+            app.div_result_text.insert(1.0, render_report(res))
+    except ValueError: messagebox.showerror("Errore", "Inserisci numeri validi separati da virgola.")
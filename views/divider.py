@@ -0,0 +1,57 @@
+
+# Vista Partitore di Tensione.
+import tkinter as tk
+from tkinter import ttk, messagebox
+from tkinter.scrolledtext import ScrolledText
+from reports import render_report
+from logic import design_voltage_divider_logic
+
+def build(app):
+    input_frame = ttk.LabelFrame(app.main_container, text="1. Imposta i Parametri del Partitore di Tensione")
+    input_frame.pack(fill=tk.X, padx=10, pady=10)
+
+    params_frame = ttk.Frame(input_frame)
+    params_frame.pack(fill=tk.X, padx=5, pady=5)
+
+    ttk.Label(params_frame, text="Tensione di Ingresso (Vin):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+    app.divider_vin_entry = ttk.Entry(params_frame, width=15)
+    app.divider_vin_entry.grid(row=0, column=1, padx=5, pady=5)
+    app.divider_vin_entry.insert(0, "12")
+
+    ttk.Label(params_frame, text="Tensione di Uscita (Vout) Desiderata:").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
+    app.divider_vout_entry = ttk.Entry(params_frame, width=15)
+    app.divider_vout_entry.grid(row=1, column=1, padx=5, pady=5)
+    app.divider_vout_entry.insert(0, "3.3")
+
+    ttk.Label(params_frame, text="Serie E per Resistori:").grid(row=2, column=0, padx=5, pady=5, sticky=tk.W)
+    app.divider_series_var = tk.StringVar(value="E24")
+    app.divider_series_combo = ttk.Combobox(params_frame, textvariable=app.divider_series_var, values=list(app.e_series.keys()), width=12)
+    app.divider_series_combo.grid(row=2, column=1, padx=5, pady=5)
+
+    calc_btn = ttk.Button(app.main_container, text="Trova Migliori Combinazioni", command=lambda: design_voltage_divider(app))
+    calc_btn.pack(pady=10)
+
+    result_frame = ttk.LabelFrame(app.main_container, text="Risultati e Combinazioni Suggerite")
+    result_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+    app.divider_result_text = ScrolledText(result_frame, height=15, width=80, wrap=tk.WORD, font=("Courier New", 9))
+    app.divider_result_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+def design_voltage_divider(app):
+    try:
+        vin = float(app.divider_vin_entry.get())
+        vout = float(app.divider_vout_entry.get())
+        series = app.divider_series_var.get()
+        custom = app.bom_design_values()
+        result, error = design_voltage_divider_logic(vin, vout, app.e_series[series], custom_values=custom, backend="table")
+
+        if error:
+            messagebox.showerror("Errore di Progettazione", error)
+        else:
+            app.divider_result_text.delete(1.0, tk.END)
+            app.divider_result_text.insert(1.0, render_report(result))
+
+    except ValueError:
+        messagebox.showerror("Errore", "Assicurati che Vin e Vout siano valori numerici validi.")
+    except Exception as e:
+        messagebox.showerror("Errore Inaspettato", f"Si è verificato un errore: {str(e)}")
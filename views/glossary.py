@@ -0,0 +1,24 @@
+
+# Vista Glossario tecnico.
+import tkinter as tk
+from tkinter import ttk
+from tkinter.scrolledtext import ScrolledText
+from logic import search_glossary_logic
+
+def build(app):
+    search_frame = ttk.Frame(app.main_container)
+    search_frame.pack(fill=tk.X, padx=10, pady=10)
+    ttk.Label(search_frame, text="Cerca nel Glossario:").pack(side=tk.LEFT, padx=5)
+    app.glossary_query = ttk.Entry(search_frame, width=30)
+    app.glossary_query.pack(side=tk.LEFT, padx=5)
+    app.glossary_query.bind('<KeyRelease>', lambda e: search_glossary(app))
+
+    app.glossary_text = ScrolledText(app.main_container, height=25, width=80, wrap=tk.WORD)
+    app.glossary_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    search_glossary(app)
+
+def search_glossary(app):
+    query = app.glossary_query.get()
+    res = search_glossary_logic(query)
+    app.glossary_text.delete(1.0, tk.END)
+    app.glossary_text.insert(1.0, res)
@@ -0,0 +1,57 @@
+
+# Vista Resistore per LED.
+import tkinter as tk
+from tkinter import ttk, messagebox
+from tkinter.scrolledtext import ScrolledText
+from reports import render_report
+from logic import calculate_led_resistor_logic
+
+def build(app):
+    led_frame = ttk.LabelFrame(app.main_container, text="Calcolatore Resistore per LED")
+    led_frame.pack(fill=tk.X, padx=10, pady=10)
+    params_frame = ttk.Frame(led_frame)
+    params_frame.pack(fill=tk.X, padx=5, pady=5)
+    ttk.Label(params_frame, text="Tensione Alimentazione (V):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+    app.led_vsupply_entry = ttk.Entry(params_frame, width=15)
+    app.led_vsupply_entry.grid(row=0, column=1, padx=5, pady=5)
+    app.led_vsupply_entry.insert(0, "5")
+    ttk.Label(params_frame, text="Tensione LED (Vf):").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
+    app.led_vf_entry = ttk.Entry(params_frame, width=15)
+    app.led_vf_entry.grid(row=1, column=1, padx=5, pady=5)
+    app.led_vf_entry.insert(0, "2.1")
+    ttk.Label(params_frame, text="Corrente LED (mA):").grid(row=2, column=0, padx=5, pady=5, sticky=tk.W)
+    app.led_if_entry = ttk.Entry(params_frame, width=15)
+    app.led_if_entry.grid(row=2, column=1, padx=5, pady=5)
+    app.led_if_entry.insert(0, "20")
+    ttk.Label(params_frame, text="Serie E per Resistore:").grid(row=3, column=0, padx=5, pady=5, sticky=tk.W)
+    app.led_series_var = tk.StringVar(value="E24")
+    app.led_series_combo = ttk.Combobox(params_frame, textvariable=app.led_series_var, values=list(app.e_series.keys()), width=12)
+    app.led_series_combo.grid(row=3, column=1, padx=5, pady=5)
+
+    calc_btn = ttk.Button(led_frame, text="Calcola Resistore e Package", command=lambda: calculate_led_resistor(app))
+    calc_btn.pack(pady=10)
+
+    result_frame = ttk.LabelFrame(app.main_container, text="Risultati e Raccomandazioni")
+    result_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    app.led_result_text = ScrolledText(result_frame, height=15, width=80, wrap=tk.WORD)
+    app.led_result_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+def calculate_led_resistor(app):
+    try:
+        v_supply = float(app.led_vsupply_entry.get())
+        v_led = float(app.led_vf_entry.get())
+        i_led = float(app.led_if_entry.get())
+        series = app.led_series_var.get()
+        custom = app.bom_design_values()
+        result, error = calculate_led_resistor_logic(v_supply, v_led, i_led, app.e_series[series], app.package_power, custom_values=custom)
+
+        if error:
+            messagebox.showerror("Errore di Calcolo", error)
+        else:
+            app.led_result_text.delete(1.0, tk.END)
+            app.led_result_text.insert(1.0, render_report(result))
+
+    except ValueError:
+        messagebox.showerror("Errore", "Assicurati che tutti i campi siano valori numerici validi.")
+    except Exception as e:
+        messagebox.showerror("Errore Inaspettato", f"Si è verificato un errore: {str(e)}")
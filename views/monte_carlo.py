@@ -0,0 +1,139 @@
+
+# Vista Analisi Monte Carlo del partitore di tensione.
+import os
+import tkinter as tk
+from tkinter import ttk, messagebox
+from tkinter.scrolledtext import ScrolledText
+from reports import render_report
+from utils import run_in_background
+from logic import run_monte_carlo_logic, MonteCarloStats, MC_CHUNK_SIZE
+# Il modulo si carica solo all'apertura della vista (o nel prewarm): matplotlib arriva qui
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+def build(app):
+    info_frame = ttk.LabelFrame(app.main_container, text="Cos'è l'Analisi Monte Carlo?")
+    info_frame.pack(fill=tk.X, padx=10, pady=10)
+    info_text = "L'analisi Monte Carlo è una tecnica di simulazione che prevede il comportamento di un sistema (come un circuito) tenendo conto della variazione casuale dei suoi componenti. Invece di usare solo valori nominali, esegue migliaia di calcoli usando valori che variano all'interno della tolleranza specificata, fornendo una visione statistica del comportamento reale del circuito."
+    ttk.Label(info_frame, text=info_text, wraplength=1000, justify=tk.LEFT).pack(padx=5, pady=5)
+
+    input_frame = ttk.LabelFrame(app.main_container, text="1. Imposta i Parametri del Circuito e della Simulazione")
+    input_frame.pack(fill=tk.X, padx=10, pady=10)
+
+    divider_frame = ttk.LabelFrame(input_frame, text="Circuito: Partitore di Tensione")
+    divider_frame.pack(fill=tk.X, padx=5, pady=5)
+
+    ttk.Label(divider_frame, text="R1 (Ω):").grid(row=0, column=0, padx=5, pady=5)
+    app.r1_entry = ttk.Entry(divider_frame, width=15)
+    app.r1_entry.grid(row=0, column=1, padx=5, pady=5)
+    app.r1_entry.insert(0, "1000")
+
+    ttk.Label(divider_frame, text="R2 (Ω):").grid(row=0, column=2, padx=5, pady=5)
+    app.r2_entry = ttk.Entry(divider_frame, width=15)
+    app.r2_entry.grid(row=0, column=3, padx=5, pady=5)
+    app.r2_entry.insert(0, "2200")
+
+    ttk.Label(divider_frame, text="Vin (V):").grid(row=1, column=0, padx=5, pady=5)
+    app.vin_entry = ttk.Entry(divider_frame, width=15)
+    app.vin_entry.grid(row=1, column=1, padx=5, pady=5)
+    app.vin_entry.insert(0, "10")
+
+    mc_frame = ttk.LabelFrame(input_frame, text="Parametri Simulazione")
+    mc_frame.pack(fill=tk.X, padx=5, pady=5)
+
+    ttk.Label(mc_frame, text="Tolleranza (%):").grid(row=0, column=0, padx=5, pady=5)
+    app.mc_tolerance_entry = ttk.Entry(mc_frame, width=10)
+    app.mc_tolerance_entry.grid(row=0, column=1, padx=5, pady=5)
+    app.mc_tolerance_entry.insert(0, "5")
+
+    ttk.Label(mc_frame, text="Numero Iterazioni:").grid(row=0, column=2, padx=5, pady=5)
+    app.mc_iterations_entry = ttk.Entry(mc_frame, width=10)
+    app.mc_iterations_entry.grid(row=0, column=3, padx=5, pady=5)
+    app.mc_iterations_entry.insert(0, "5000")
+
+    app.mc_run_button = ttk.Button(input_frame, text="Esegui Simulazione e Analizza", command=lambda: run_monte_carlo(app))
+    app.mc_run_button.pack(pady=10)
+
+    result_frame = ttk.LabelFrame(app.main_container, text="Analisi Statistica e Spiegazione")
+    result_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    app.mc_result_text = ScrolledText(result_frame, height=10, width=64, wrap=tk.WORD)
+    app.mc_result_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+    app.mc_graph_frame = ttk.Frame(app.main_container)
+    app.mc_graph_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+def run_monte_carlo(app):
+    try:
+        vin = float(app.vin_entry.get())
+        iterations = int(app.mc_iterations_entry.get())
+        r1_nominal, tol1, r2_nominal, tol2 = None, None, None, None
+        # Le righe della vista Serie/Parallelo esistono solo se è stata aperta
+        res_rows = getattr(app, 'res_rows', [])
+        if len(res_rows) >= 2:
+            try: r1_nominal = float(res_rows[0]['val'].get()); tol1 = float(res_rows[0]['tol'].get()) / 100
+            except Exception: pass
+            try: r2_nominal = float(res_rows[1]['val'].get()); tol2 = float(res_rows[1]['tol'].get()) / 100
+            except Exception: pass
+        if r1_nominal is None: r1_nominal = float(app.r1_entry.get()); tol1 = float(app.mc_tolerance_entry.get()) / 100
+        if r2_nominal is None: r2_nominal = float(app.r2_entry.get()); tol2 = float(app.mc_tolerance_entry.get()) / 100
+        # Oltre un blocco si passa alla modalità streaming (memoria costante)
+        # e da molti blocchi al calcolo parallelo su tutti i core
+        chunk_size = MC_CHUNK_SIZE if iterations > MC_CHUNK_SIZE else None
+        workers = os.cpu_count() if iterations > 8 * MC_CHUNK_SIZE else None
+    except Exception as e:
+        messagebox.showerror("Errore", f"Errore nella simulazione: {str(e)}")
+        return
+
+    # La simulazione gira in un thread (e, con workers, nei processi del pool): la finestra
+    # resta reattiva e il risultato torna nel main loop di Tk
+    def show_result(future):
+        if app.mc_run_button.winfo_exists():
+            app.mc_run_button.state(["!disabled"])
+        app.status.set("Pronto")
+        try:
+            result, error = future.result()
+        except Exception as e:
+            messagebox.showerror("Errore", f"Errore nella simulazione: {str(e)}")
+            return
+        if error:
+            messagebox.showerror("Errore", error)
+        elif app.mc_result_text.winfo_exists():  # la vista può essere stata chiusa nel frattempo
+            app.mc_result_text.delete(1.0, tk.END)
+            app.mc_result_text.insert(1.0, render_report(result))
+            create_mc_graph(app, result.samples, result.theoretical)
+
+    app.mc_run_button.state(["disabled"])
+    app.status.set(f"Simulazione Monte Carlo in corso ({iterations} iterazioni)...")
+    run_in_background(app, lambda: run_monte_carlo_logic(vin, iterations, r1_nominal, tol1, r2_nominal, tol2,
+                                                         chunk_size=chunk_size, workers=workers), show_result)
+
+def create_mc_graph(app, vout_values, vout_theoretical):
+    for widget in app.mc_graph_frame.winfo_children(): widget.destroy()
+    fig = Figure(figsize=(10, 6), dpi=100)
+    ax1 = fig.add_subplot(211)
+    if isinstance(vout_values, MonteCarloStats):
+        # Istogramma già aggregato: si disegnano i conteggi come pesi sui centri dei bin
+        counts, edges = vout_values.histogram(bins=50)
+        ax1.hist((edges[:-1] + edges[1:]) / 2, bins=edges, weights=counts, alpha=0.7, color='blue', edgecolor='black')
+        vout_values = vout_values.head
+    else:
+        ax1.hist(vout_values, bins=50, alpha=0.7, color='blue', edgecolor='black')
+    ax1.axvline(vout_theoretical, color='red', linestyle='--', linewidth=2, label=f'Vout Teorico: {vout_theoretical:.3f} V')
+    ax1.set_xlabel('Tensione di Uscita (Vout)')
+    ax1.set_ylabel('Frequenza')
+    ax1.set_title('Distribuzione di Vout (Istogramma)')
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+    ax2 = fig.add_subplot(212)
+    indices = range(min(100, len(vout_values)))
+    ax2.scatter(indices, vout_values[:100], alpha=0.6, color='green')
+    ax2.axhline(vout_theoretical, color='red', linestyle='--', linewidth=2, label='Vout Teorico')
+    ax2.set_xlabel('Numero Simulazione')
+    ax2.set_ylabel('Tensione di Uscita (Vout)')
+    ax2.set_title('Andamento delle Prime 100 Simulazioni')
+    ax2.legend()
+    ax2.grid(True, alpha=0.3)
+    fig.tight_layout()
+    canvas = FigureCanvasTkAgg(fig, app.mc_graph_frame)
+    canvas.draw()
+    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
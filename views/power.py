@@ -0,0 +1,69 @@
+
+# Vista Potenza e Derating.
+import tkinter as tk
+from tkinter import ttk, messagebox
+from tkinter.scrolledtext import ScrolledText
+from reports import render_report
+from logic import calculate_power_logic
+
+def build(app):
+    input_frame = ttk.LabelFrame(app.main_container, text="1. Inserisci Parametri Elettrici e Termici")
+    input_frame.pack(fill=tk.X, padx=10, pady=10)
+
+    param_frame = ttk.Frame(input_frame)
+    param_frame.pack(fill=tk.X, padx=5, pady=5)
+
+    ttk.Label(param_frame, text="Tensione (V):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+    app.voltage_entry = ttk.Entry(param_frame, width=15)
+    app.voltage_entry.grid(row=0, column=1, padx=5, pady=5)
+    app.voltage_entry.insert(0, "5")
+
+    ttk.Label(param_frame, text="Corrente (A):").grid(row=0, column=2, padx=5, pady=5, sticky=tk.W)
+    app.current_entry = ttk.Entry(param_frame, width=15)
+    app.current_entry.grid(row=0, column=3, padx=5, pady=5)
+
+    ttk.Label(param_frame, text="Resistenza (Ω):").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
+    app.resistance_entry = ttk.Entry(param_frame, width=15)
+    app.resistance_entry.grid(row=1, column=1, padx=5, pady=5)
+    app.resistance_entry.insert(0, "500")
+
+    ttk.Label(param_frame, text="Temp. Ambiente (°C):").grid(row=1, column=2, padx=5, pady=5, sticky=tk.W)
+    app.ambient_temp_entry = ttk.Entry(param_frame, width=15)
+    app.ambient_temp_entry.grid(row=1, column=3, padx=5, pady=5)
+    app.ambient_temp_entry.insert(0, "25")
+
+    package_frame = ttk.LabelFrame(app.main_container, text="2. Scegli il Package del Resistore")
+    package_frame.pack(fill=tk.X, padx=10, pady=10)
+
+    ttk.Label(package_frame, text="Package:").pack(side=tk.LEFT, padx=5)
+    app.package_var = tk.StringVar(value="0805")
+    app.package_combo = ttk.Combobox(package_frame, textvariable=app.package_var, values=list(app.package_power.keys()), width=15)
+    app.package_combo.pack(side=tk.LEFT, padx=5, pady=5)
+
+    calc_btn = ttk.Button(app.main_container, text="Calcola Potenza e Analizza Package", command=lambda: calculate_power(app))
+    calc_btn.pack(pady=10)
+
+    result_frame = ttk.LabelFrame(app.main_container, text="Analisi della Potenza e Raccomandazioni")
+    result_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    app.power_result_text = ScrolledText(result_frame, height=15, width=60, wrap=tk.WORD)
+    app.power_result_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+def calculate_power(app):
+    try:
+        voltage = float(app.voltage_entry.get()) if app.voltage_entry.get() else 0
+        current = float(app.current_entry.get()) if app.current_entry.get() else 0
+        resistance = float(app.resistance_entry.get()) if app.resistance_entry.get() else 0
+        ambient_temp = float(app.ambient_temp_entry.get()) if app.ambient_temp_entry.get() else 25
+        package_name = app.package_var.get()
+        package_power_val = app.package_power[package_name]
+
+        result, error = calculate_power_logic(voltage, current, resistance, package_power_val, package_name, ambient_temp)
+
+        if error:
+            messagebox.showwarning("Attenzione", error)
+        else:
+            app.power_result_text.delete(1.0, tk.END)
+            app.power_result_text.insert(1.0, render_report(result))
+
+    except Exception as e:
+        messagebox.showerror("Errore", f"Errore nel calcolo: {str(e)}")
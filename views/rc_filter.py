@@ -0,0 +1,55 @@
+
+# Vista Filtri RC passa-basso.
+import tkinter as tk
+from tkinter import ttk, messagebox
+from tkinter.scrolledtext import ScrolledText
+from reports import render_report
+from logic import design_rc_filter_logic
+
+def build(app):
+    filter_frame = ttk.LabelFrame(app.main_container, text="Progettazione Filtro RC Passa-Basso")
+    filter_frame.pack(fill=tk.X, padx=10, pady=10)
+    filter_params_frame = ttk.Frame(filter_frame)
+    filter_params_frame.pack(fill=tk.X, padx=5, pady=5)
+    ttk.Label(filter_params_frame, text="Frequenza di Taglio (Hz):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+    app.filter_fc_entry = ttk.Entry(filter_params_frame, width=15)
+    app.filter_fc_entry.grid(row=0, column=1, padx=5, pady=5)
+    app.filter_fc_entry.insert(0, "1000")
+    ttk.Label(filter_params_frame, text="Serie E (Resistori):").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
+    app.filter_r_series_var = tk.StringVar(value="E24")
+    app.filter_r_series_combo = ttk.Combobox(filter_params_frame, textvariable=app.filter_r_series_var, values=list(app.e_series.keys()), width=12)
+    app.filter_r_series_combo.grid(row=1, column=1, padx=5, pady=5)
+    ttk.Label(filter_params_frame, text="Serie E (Condensatori):").grid(row=2, column=0, padx=5, pady=5, sticky=tk.W)
+    app.filter_c_series_var = tk.StringVar(value="E12")
+    app.filter_c_series_combo = ttk.Combobox(filter_params_frame, textvariable=app.filter_c_series_var, values=list(app.capacitor_e_series.keys()), width=12)
+    app.filter_c_series_combo.grid(row=2, column=1, padx=5, pady=5)
+
+    filter_calc_btn = ttk.Button(filter_frame, text="Trova Combinazioni R/C", command=lambda: design_rc_filter(app))
+    filter_calc_btn.pack(pady=10)
+
+    filter_result_frame = ttk.LabelFrame(app.main_container, text="Combinazioni R/C Suggerite")
+    filter_result_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    app.filter_result_text = ScrolledText(filter_result_frame, height=15, width=80, wrap=tk.WORD, font=("Courier New", 9))
+    app.filter_result_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+def design_rc_filter(app):
+    try:
+        f_c_target = float(app.filter_fc_entry.get())
+        r_series_name = app.filter_r_series_var.get()
+        c_series_name = app.filter_c_series_var.get()
+
+        r_series_values = app.e_series[r_series_name]
+        c_series_values = app.capacitor_e_series[c_series_name]
+        custom = app.bom_design_values()
+        result, error = design_rc_filter_logic(f_c_target, r_series_values, c_series_values, custom_values=custom)
+
+        if error:
+            messagebox.showerror("Errore di Progettazione", error)
+        else:
+            app.filter_result_text.delete(1.0, tk.END)
+            app.filter_result_text.insert(1.0, render_report(result))
+
+    except ValueError:
+        messagebox.showerror("Errore", "Assicurati che la frequenza sia un valore numerico valido.")
+    except Exception as e:
+        messagebox.showerror("Errore Inaspettato", f"Si è verificato un errore: {str(e)}")
@@ -0,0 +1,46 @@
+
+# Vista Regolatori (LM317 e simili).
+import tkinter as tk
+from tkinter import ttk, messagebox
+from tkinter.scrolledtext import ScrolledText
+from reports import render_report
+from logic import calculate_regulator_logic
+from resistor_lib import regulator_specs
+
+def build(app):
+    input_frame = ttk.LabelFrame(app.main_container, text="Progettazione Regolatore di Tensione")
+    input_frame.pack(fill=tk.X, padx=10, pady=10)
+
+    ttk.Label(input_frame, text="Regolatore:").grid(row=0, column=0, padx=5, pady=5)
+    app.reg_name_var = tk.StringVar(value="LM317")
+    app.reg_combo = ttk.Combobox(input_frame, textvariable=app.reg_name_var, values=list(regulator_specs.keys()), width=15)
+    app.reg_combo.grid(row=0, column=1, padx=5, pady=5)
+
+    ttk.Label(input_frame, text="Vout Desiderata (V):").grid(row=0, column=2, padx=5, pady=5)
+    app.reg_vout_entry = ttk.Entry(input_frame, width=10)
+    app.reg_vout_entry.grid(row=0, column=3, padx=5, pady=5)
+    app.reg_vout_entry.insert(0, "5.0")
+
+    ttk.Label(input_frame, text="Serie E:").grid(row=0, column=4, padx=5, pady=5)
+    app.reg_series_var = tk.StringVar(value="E24")
+    app.reg_series_combo = ttk.Combobox(input_frame, textvariable=app.reg_series_var, values=list(app.e_series.keys()), width=8)
+    app.reg_series_combo.grid(row=0, column=5, padx=5, pady=5)
+
+    calc_btn = ttk.Button(input_frame, text="Calcola R1/R2", command=lambda: calculate_regulator(app))
+    calc_btn.grid(row=0, column=6, padx=10, pady=5)
+
+    result_frame = ttk.LabelFrame(app.main_container, text="Risultati")
+    result_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    app.reg_result_text = ScrolledText(result_frame, height=15, width=80, font=("Courier New", 9))
+    app.reg_result_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+def calculate_regulator(app):
+    try:
+        vout = float(app.reg_vout_entry.get())
+        custom = app.bom_design_values()
+        result, error = calculate_regulator_logic(0, vout, app.reg_name_var.get(), app.e_series[app.reg_series_var.get()], custom_values=custom)
+        if error: messagebox.showerror("Errore", error)
+        else:
+            app.reg_result_text.delete(1.0, tk.END)
+            app.reg_result_text.insert(1.0, render_report(result))
+    except ValueError: messagebox.showerror("Errore", "Inserisci un numero valido.")
@@ -0,0 +1,156 @@
+
+# Vista Serie/Parallelo: equivalente teorico, ottimizzazione, Monte Carlo su rete e sintesi.
+import tkinter as tk
+from tkinter import ttk, messagebox
+from tkinter.scrolledtext import ScrolledText
+from reports import render_report
+from logic import calculate_series_parallel_logic, optimize_with_commercial_logic, synthesize_resistance_logic, run_circuit_monte_carlo_logic, circuit_from_rows, MC_CHUNK_SIZE
+# Il modulo si carica solo all'apertura della vista (o nel prewarm): matplotlib arriva qui
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+def build(app):
+    input_frame = ttk.LabelFrame(app.main_container, text="1. Inserisci i Componenti Teorici")
+    input_frame.pack(fill=tk.X, padx=10, pady=10)
+    conn_frame = ttk.Frame(input_frame)
+    conn_frame.pack(fill=tk.X, padx=5, pady=5)
+    ttk.Label(conn_frame, text="Tipo connessione:").pack(side=tk.LEFT, padx=5)
+    app.conn_type = tk.StringVar(value="serie")
+    ttk.Radiobutton(conn_frame, text="Serie", variable=app.conn_type, value="serie").pack(side=tk.LEFT, padx=10)
+    ttk.Radiobutton(conn_frame, text="Parallelo", variable=app.conn_type, value="parallelo").pack(side=tk.LEFT)
+    list_frame = ttk.Frame(input_frame)
+    list_frame.pack(fill=tk.X, padx=5, pady=5)
+    ttk.Label(list_frame, text="Valore (Ω)    Tolleranza (%)").grid(row=0, column=0, columnspan=3, sticky=tk.W)
+    app.res_rows = []
+    def add_res_row(value='1000', tol='5'):
+        row = {}
+        r = len(app.res_rows) + 1
+        row['val'] = ttk.Entry(list_frame, width=20)
+        row['val'].grid(row=r, column=0, padx=5, pady=2)
+        row['val'].insert(0, str(value))
+        row['tol'] = ttk.Entry(list_frame, width=10)
+        row['tol'].grid(row=r, column=1, padx=5, pady=2)
+        row['tol'].insert(0, str(tol))
+        btn = ttk.Button(list_frame, text='Rimuovi', command=lambda rw=row: remove_res_row(rw))
+        btn.grid(row=r, column=2, padx=5, pady=2)
+        row['btn'] = btn
+        app.res_rows.append(row)
+    def remove_res_row(row):
+        try:
+            row['val'].destroy(); row['tol'].destroy(); row['btn'].destroy()
+            app.res_rows.remove(row)
+            for idx, rw in enumerate(app.res_rows, start=1):
+                rw['val'].grid(row=idx, column=0)
+                rw['tol'].grid(row=idx, column=1)
+                rw['btn'].grid(row=idx, column=2)
+        except Exception: pass
+    add_res_row('1000', '5')
+    add_res_row('2200', '5')
+    add_btn = ttk.Button(list_frame, text='Aggiungi Resistenza', command=lambda: add_res_row('1000', '5'))
+    add_btn.grid(row=99, column=0, pady=6, sticky=tk.W)
+    series_frame = ttk.LabelFrame(app.main_container, text="2. Scegli una Serie Commerciale (IEC 60063)")
+    series_frame.pack(fill=tk.X, padx=10, pady=10)
+    ttk.Label(series_frame, text="Serie E:").pack(side=tk.LEFT, padx=5)
+    app.series_var = tk.StringVar(value="E24")
+    app.series_combo = ttk.Combobox(series_frame, textvariable=app.series_var, values=list(app.e_series.keys()), width=10)
+    app.series_combo.pack(side=tk.LEFT, padx=5, pady=5)
+    btn_frame = ttk.LabelFrame(app.main_container, text="3. Esegui Calcolo")
+    btn_frame.pack(fill=tk.X, padx=10, pady=10)
+    calc_btn = ttk.Button(btn_frame, text="Calcola Equivalente Teorico", command=lambda: calculate_series_parallel(app))
+    calc_btn.pack(side=tk.LEFT, padx=5)
+    optimize_btn = ttk.Button(btn_frame, text="Ottimizza con Valori Commerciali", command=lambda: optimize_with_commercial(app))
+    optimize_btn.pack(side=tk.LEFT, padx=5)
+    network_frame = ttk.LabelFrame(app.main_container, text="4. Monte Carlo su Rete Generica (R1, R2, ... sono le righe sopra)")
+    network_frame.pack(fill=tk.X, padx=10, pady=10)
+    ttk.Label(network_frame, text="Rete (es. R1 + (R2 || R3), vuoto = connessione scelta):").pack(side=tk.LEFT, padx=5)
+    app.network_expr_entry = ttk.Entry(network_frame, width=30)
+    app.network_expr_entry.pack(side=tk.LEFT, padx=5, pady=5)
+    ttk.Label(network_frame, text="Iterazioni:").pack(side=tk.LEFT, padx=5)
+    app.network_iter_entry = ttk.Entry(network_frame, width=10)
+    app.network_iter_entry.pack(side=tk.LEFT, padx=5)
+    app.network_iter_entry.insert(0, "100000")
+    ttk.Button(network_frame, text="Simula Rete", command=lambda: run_circuit_monte_carlo(app)).pack(side=tk.LEFT, padx=5)
+    synth_frame = ttk.LabelFrame(app.main_container, text="5. Ottieni un Valore Combinando 2-3 Resistori Commerciali")
+    synth_frame.pack(fill=tk.X, padx=10, pady=10)
+    ttk.Label(synth_frame, text="Valore desiderato (Ω):").pack(side=tk.LEFT, padx=5)
+    app.synth_target_entry = ttk.Entry(synth_frame, width=15)
+    app.synth_target_entry.pack(side=tk.LEFT, padx=5, pady=5)
+    app.synth_target_entry.insert(0, "1234")
+    ttk.Label(synth_frame, text="Max componenti:").pack(side=tk.LEFT, padx=5)
+    app.synth_parts_var = tk.IntVar(value=3)
+    ttk.Combobox(synth_frame, textvariable=app.synth_parts_var, values=[1, 2, 3], width=4).pack(side=tk.LEFT, padx=5)
+    ttk.Button(synth_frame, text="Trova Combinazioni", command=lambda: synthesize_resistance(app)).pack(side=tk.LEFT, padx=5)
+    result_frame = ttk.LabelFrame(app.main_container, text="Analisi e Risultati")
+    result_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    app.series_result_text = ScrolledText(result_frame, height=12, width=60, wrap=tk.WORD)
+    app.series_result_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+    app.series_graph_frame = ttk.Frame(app.main_container)
+    app.series_graph_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+def calculate_series_parallel(app):
+    try:
+        resistances = [float(rw['val'].get()) for rw in app.res_rows]
+        tolerances = [float(rw['tol'].get()) for rw in app.res_rows]
+        result, error = calculate_series_parallel_logic(resistances, tolerances, app.conn_type.get())
+        if error: messagebox.showerror("Errore", error)
+        else:
+            app.series_result_text.delete(1.0, tk.END)
+            app.series_result_text.insert(1.0, render_report(result))
+            create_series_graph(app, resistances, result.total)
+    except Exception as e: messagebox.showerror("Errore", f"Errore nel calcolo: {str(e)}")
+
+def optimize_with_commercial(app):
+    try:
+        ress = [float(row['val'].get()) for row in app.res_rows if row['val'].get()]
+        conn = app.conn_type.get()
+        series = app.series_var.get()
+        custom = app.bom_design_values()
+        result, error = optimize_with_commercial_logic(ress, conn, series, app.e_series, custom_values=custom)
+        if error: messagebox.showwarning('Ottimizza', error)
+        else: 
+            app.series_result_text.delete(1.0, tk.END)
+            app.series_result_text.insert(1.0, render_report(result))
+    except Exception as e: messagebox.showerror("Errore", f"Errore nell'ottimizzazione: {str(e)}")
+
+def run_circuit_monte_carlo(app):
+    try:
+        resistances = [float(rw['val'].get()) for rw in app.res_rows]
+        tolerances = [float(rw['tol'].get()) for rw in app.res_rows]
+        expression, components = circuit_from_rows(resistances, tolerances, app.conn_type.get())
+        if app.network_expr_entry.get().strip():
+            expression = app.network_expr_entry.get()
+        iterations = int(app.network_iter_entry.get())
+        chunk_size = MC_CHUNK_SIZE if iterations > MC_CHUNK_SIZE else None
+        result, error = run_circuit_monte_carlo_logic(expression, components, iterations, chunk_size=chunk_size)
+        if error: messagebox.showerror("Errore", error)
+        else:
+            app.series_result_text.delete(1.0, tk.END)
+            app.series_result_text.insert(1.0, render_report(result))
+    except Exception as e: messagebox.showerror("Errore", f"Errore nella simulazione: {str(e)}")
+
+def synthesize_resistance(app):
+    try:
+        target = float(app.synth_target_entry.get())
+        custom = app.bom_design_values()
+        result, error = synthesize_resistance_logic(target, app.e_series[app.series_var.get()], custom_values=custom, max_parts=app.synth_parts_var.get())
+        if error: messagebox.showwarning("Sintesi", error)
+        else:
+            app.series_result_text.delete(1.0, tk.END)
+            app.series_result_text.insert(1.0, render_report(result))
+    except ValueError: messagebox.showerror("Errore", "Inserisci un valore numerico valido")
+
+def create_series_graph(app, resistances, total_resistance):
+    for widget in app.series_graph_frame.winfo_children(): widget.destroy()
+    fig = Figure(figsize=(8, 4), dpi=100)
+    ax = fig.add_subplot(111)
+    x_pos = range(len(resistances))
+    values = [r / total_resistance * 100 for r in resistances]
+    colors = ['#c44e52', '#4c72b0', '#55a868', '#ffb347', '#7f5acd']
+    bars = ax.bar(x_pos, values, color=colors[:len(resistances)])
+    ax.set_xlabel('Resistenze')
+    ax.set_ylabel('Contributo Percentuale al Totale (%)')
+    ax.set_title('Composizione della Resistenza Equivalente')
+    for i, (bar, value) in enumerate(zip(bars, values)): ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 1, f'{value:.1f}%', ha='center', va='bottom')
+    canvas = FigureCanvasTkAgg(fig, app.series_graph_frame)
+    canvas.draw()
+    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
@@ -0,0 +1,38 @@
+
+# Vista Codici SMD: decodifica dei codici standard ed EIA-96.
+import tkinter as tk
+from tkinter import ttk, messagebox
+from tkinter.scrolledtext import ScrolledText
+from reports import render_report
+from logic import decode_smd_code_logic
+
+def build(app):
+    input_frame = ttk.LabelFrame(app.main_container, text="1. Inserisci Codice Resistore SMD")
+    input_frame.pack(fill=tk.X, padx=10, pady=10)
+
+    ttk.Label(input_frame, text="Codice:").pack(side=tk.LEFT, padx=5, pady=5)
+    app.smd_code_entry = ttk.Entry(input_frame, width=15)
+    app.smd_code_entry.pack(side=tk.LEFT, padx=5, pady=5)
+    app.smd_code_entry.insert(0, "103")
+
+    app.smd_code_type = tk.StringVar(value="standard")
+    ttk.Radiobutton(input_frame, text="Standard (3/4 cifre, R)", variable=app.smd_code_type, value="standard").pack(side=tk.LEFT, padx=10)
+    ttk.Radiobutton(input_frame, text="EIA-96 (1%)", variable=app.smd_code_type, value="eia96").pack(side=tk.LEFT, padx=10)
+
+    calc_btn = ttk.Button(app.main_container, text="Decodifica e Spiega", command=lambda: decode_smd_code(app))
+    calc_btn.pack(pady=10)
+
+    result_frame = ttk.LabelFrame(app.main_container, text="Analisi e Spiegazione")
+    result_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    app.smd_result_text = ScrolledText(result_frame, height=15, width=60, wrap=tk.WORD)
+    app.smd_result_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+def decode_smd_code(app):
+    code = app.smd_code_entry.get()
+    code_type = app.smd_code_type.get()
+    result, error = decode_smd_code_logic(code, code_type)
+    if error:
+        messagebox.showerror("Errore di Decodifica", error)
+    else:
+        app.smd_result_text.delete(1.0, tk.END)
+        app.smd_result_text.insert(1.0, render_report(result))